@@ -0,0 +1,98 @@
+"""Connected-component labelling of an ink mask, all in array operations.
+
+The mask is run-length encoded row by row; runs on neighbouring rows that touch
+(8-connectivity by default) are joined by union-find over the runs, solved as
+vectorized min-label propagation with pointer jumping. Per-component bounding
+box, pixel count and centroid come out in bulk from the runs, so nothing here
+loops over pixels in Python. Used by step4 (--segment components)."""
+from typing import NamedTuple
+
+import numpy as np
+
+
+def runs(on):
+    """1-D bool array -> (starts, ends) of its True runs, half-open."""
+    d = np.diff(np.concatenate(([0], np.asarray(on, dtype=np.int8), [0])))
+    return np.flatnonzero(d == 1), np.flatnonzero(d == -1)
+
+
+class Components(NamedTuple):
+    """Per-component arrays, index = label - 1; bbox half-open [y0, y1) x [x0, x1)."""
+    y0: np.ndarray
+    x0: np.ndarray
+    y1: np.ndarray
+    x1: np.ndarray
+    area: np.ndarray
+    cy: np.ndarray
+    cx: np.ndarray
+
+
+def _row_runs(mask):
+    """(row, start, end) of every horizontal run, sorted by row then start."""
+    h, w = mask.shape
+    pad = np.zeros((h, w + 2), dtype=np.int8)
+    pad[:, 1:-1] = mask
+    d = np.diff(pad, axis=1)
+    r0, s = np.nonzero(d == 1)
+    r1, e = np.nonzero(d == -1)   # same row-major order, so ends pair with starts
+    assert (r0 == r1).all()
+    return r0, s, e
+
+
+def _links(row, s, e, w, connectivity):
+    """(a, b) index pairs of runs on adjacent rows that touch."""
+    reach = 1 if connectivity == 8 else 0
+    skey = row * (w + 1) + s
+    ekey = row * (w + 1) + e
+    up = (row - 1) * (w + 1)      # the same columns, one row up
+    # runs on a row are disjoint and sorted, so the ones touching [s, e) on the
+    # row above form a contiguous range: end > s - reach and start < e + reach
+    lo = np.searchsorted(ekey, up + s - reach, side="right")
+    hi = np.searchsorted(skey, up + e + reach, side="left")
+    cnt = np.maximum(hi - lo, 0)
+    b = np.repeat(np.arange(len(row)), cnt)
+    a = np.repeat(lo, cnt) + (np.arange(cnt.sum()) - np.repeat(np.cumsum(cnt) - cnt, cnt))
+    return a, b
+
+
+def label(mask, connectivity=8):
+    """-> (labels, n, Components). labels: int32 image, 0 = background, 1..n
+    numbered in raster order of each component's first pixel."""
+    mask = np.asarray(mask, dtype=bool)
+    h, w = mask.shape
+    row, s, e = _row_runs(mask)
+    a, b = _links(row, s, e, w, connectivity)
+    root = np.arange(len(row))
+    while True:  # propagate the smallest run index through every link
+        m = np.minimum(root[a], root[b])
+        new = root.copy()
+        np.minimum.at(new, a, m)
+        np.minimum.at(new, b, m)
+        new = new[new]
+        while True:  # pointer jumping: follow the chains to their roots
+            nxt = new[new]
+            if (nxt == new).all():
+                break
+            new = nxt
+        if (new == root).all():
+            break
+        root = new
+    # roots are the first run of their component in raster order
+    first, comp = np.unique(root, return_inverse=True)
+    n = len(first)
+    n_px = e - s
+    labels = np.zeros(h * w, dtype=np.int32)
+    off = np.arange(n_px.sum()) - np.repeat(np.cumsum(n_px) - n_px, n_px)
+    labels[np.repeat(row * w + s, n_px) + off] = np.repeat(comp + 1, n_px)
+    area = np.bincount(comp, weights=n_px, minlength=n)
+    y0 = np.full(n, h)
+    x0 = np.full(n, w)
+    y1 = np.zeros(n, dtype=np.intp)
+    x1 = np.zeros(n, dtype=np.intp)
+    np.minimum.at(y0, comp, row)
+    np.minimum.at(x0, comp, s)
+    np.maximum.at(y1, comp, row + 1)
+    np.maximum.at(x1, comp, e)
+    cy = np.bincount(comp, weights=n_px * row, minlength=n) / area
+    cx = np.bincount(comp, weights=n_px * (s + e - 1) / 2.0, minlength=n) / area
+    return labels.reshape(h, w), n, Components(y0, x0, y1, x1, area.astype(np.intp), cy, cx)
@@ -0,0 +1,175 @@
+"""Glyph template bank shared by step4 (extraction) and raster2ascii.py
+(conversion): the fonts, the artwork's charsets, and the rendered templates —
+bbox-normalized shapes (large), baseline-anchored canvases (small) and
+cell-anchored rasters for tiling an image into grid cells."""
+import functools
+import os
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+MENLO = "/System/Library/Fonts/Menlo.ttc"
+FONTS = [
+    ("menlo", "regular", MENLO, 0),
+    ("menlo", "bold", MENLO, 1),
+    ("menlo", "italic", MENLO, 2),
+    ("menlo", "bold-italic", MENLO, 3),
+    ("courier", "regular", "/System/Library/Fonts/Supplemental/Courier New.ttf", 0),
+    ("courier", "bold", "/System/Library/Fonts/Supplemental/Courier New Bold.ttf", 0),
+    ("courier", "italic", "/System/Library/Fonts/Supplemental/Courier New Italic.ttf", 0),
+    ("courier", "bold-italic", "/System/Library/Fonts/Supplemental/Courier New Bold Italic.ttf", 0),
+]
+SCODE = {"regular": "r", "bold": "b", "italic": "i", "bold-italic": "x"}
+LARGE_CHARS = "NnMmWwИиVvUuIli:@#%*+=±‡"
+SMALL_CHARS = ".·:,'-=+*~"
+BLUE_ALLOWED = set("NnMmWwИиVvUuIli:.·-',~")
+YELLOW_ALLOWED = set("@#%*+=±‡-:.·',")
+# step4 --charset full: box drawing, block elements, Latin, Cyrillic
+EXTRA_CHARS = "".join(chr(c) for c in [*range(0x2500, 0x25A0), *range(0x21, 0x7F),
+                                       *range(0xC0, 0x100), *range(0x410, 0x450)]
+                      if chr(c) not in LARGE_CHARS and chr(c) not in "×÷")
+BOX = 26          # large-path canvas
+GS = 22           # large-path glyph max dimension after resize
+SCANVAS, SBASE = 24, 18   # small-path canvas / baseline row
+PX, PY = 17.62, 23.347    # art grid cell in source pixels (step6's PNG geometry)
+SOFT = (0.30, 0.35)       # soft(): ink ramp start and width (step4 --set SOFT=lo,width)
+SCALE = 1                 # source decoded at 1/SCALE size (step4 --preview); see set_scale()
+
+
+def set_scale(s):
+    """Template geometry for a source decoded at 1/s size: BOX/GS/SCANVAS/SBASE
+    and the template font sizes shrink with the glyphs, so every match is a
+    dot product over ~1/s^2 as many pixels. s=1 restores the defaults."""
+    global SCALE, BOX, GS, SCANVAS, SBASE
+    SCALE = s
+    GS = int(round(22 / s))
+    BOX = GS + max(1, int(round(4 / s)))
+    SCANVAS, SBASE = int(round(24 / s)), int(round(18 / s))
+
+
+def blur(x):
+    k = np.array([1.0, 2.0, 1.0]) / 4.0
+    for _ in range(2):
+        x = np.apply_along_axis(lambda r: np.convolve(r, k, mode="same"), 1, x)
+        x = np.apply_along_axis(lambda c: np.convolve(c, k, mode="same"), 0, x)
+    return x
+
+
+def soft(x):
+    lo, width = SOFT
+    return np.clip((x - lo) / width, 0.0, 1.0)
+
+
+def norm_box(arr):
+    """ink array (float, any size) -> BOX x BOX normalized shape canvas"""
+    ys, xs = np.nonzero(arr > 0.12 * arr.max())
+    if len(ys) == 0:
+        return None
+    sub = arr[ys.min():ys.max() + 1, xs.min():xs.max() + 1]
+    h, w = sub.shape
+    s = GS / max(h, w)
+    tw, th = max(1, int(round(w * s))), max(1, int(round(h * s)))
+    im = Image.fromarray(np.clip(sub / sub.max() * 255, 0, 255).astype(np.uint8))
+    im = im.resize((tw, th), Image.BILINEAR)
+    a = np.zeros((BOX, BOX))
+    oy, ox = (BOX - th) // 2, (BOX - tw) // 2
+    a[oy:oy + th, ox:ox + tw] = np.asarray(im).astype(np.float64) / 255.0
+    return blur(soft(a))
+
+
+def large_templates(chars, skip_missing=False):
+    """[(ch, family, style, BOX x BOX unit-norm shape)] in FONTS x chars order.
+    Rendered at ~the image's native glyph scale (font 21 => cap ~15px) so the
+    raster acquires the same blur profile the JPEG glyphs get when norm_box
+    upscales them; a crisp 44px render matches poorly against JPEG mush.
+    skip_missing drops glyphs a font lacks (drawn as its missing-glyph box).
+    Cached per (chars, skip_missing, SOFT, SCALE) for repeated runs in one
+    process (tune.py); callers must not modify the result."""
+    return _large_templates(chars, skip_missing, SOFT, SCALE)
+
+
+@functools.lru_cache(maxsize=None)
+def _large_templates(chars, skip_missing, soft_key, scale):  # soft_key: cache key only, soft() reads SOFT
+    tpl = []
+    side, at = 48 // scale, (12 // scale, 6 // scale)
+    for fam, style, path, idx in FONTS:
+        font = ImageFont.truetype(path, int(round(21 / scale)), index=idx)
+        tofu = None  # what the font draws for a missing glyph (private-use char)
+        if skip_missing:
+            im = Image.new("L", (side, side), 0)
+            ImageDraw.Draw(im).text(at, "\ue000", font=font, fill=255)
+            tofu = np.asarray(im)
+        for ch in chars:
+            im = Image.new("L", (side, side), 0)
+            ImageDraw.Draw(im).text(at, ch, font=font, fill=255)
+            arr = np.asarray(im).astype(np.float64)
+            if arr.max() <= 0 or (tofu is not None and (arr == tofu).all()):
+                continue
+            nb = norm_box(arr)
+            if nb is None:
+                continue
+            n = np.linalg.norm(nb)
+            tpl.append((ch, fam, style, nb / n))
+    return tpl
+
+
+def small_templates(chars):
+    """[(ch, family, style, SCANVAS x SCANVAS unit-norm canvas)], baseline at
+    SBASE and ink centered horizontally. Cached like large_templates."""
+    return _small_templates(chars, SOFT, SCALE)
+
+
+@functools.lru_cache(maxsize=None)
+def _small_templates(chars, soft_key, scale):  # soft_key: cache key only
+    tpl = []
+    for fam, style, path, idx in FONTS:
+        font = ImageFont.truetype(path, int(round(22 / scale)), index=idx)
+        asc, desc = font.getmetrics()
+        for ch in chars:
+            im = Image.new("L", (SCANVAS * 2, SCANVAS * 2), 0)
+            ImageDraw.Draw(im).text((SCANVAS // 2, SBASE - asc), ch, font=font, fill=255)
+            arr = np.asarray(im).astype(np.float64)
+            if arr.max() == 0:
+                continue
+            ys, xs = np.nonzero(arr > 40)
+            w = arr[arr > 40]
+            cx = (xs * w).sum() / w.sum()
+            arr = np.roll(arr, int(round(SCANVAS / 2 - cx)), axis=1)[:SCANVAS, :SCANVAS]
+            a = blur(soft(arr / arr.max()))
+            n = np.linalg.norm(a)
+            if n == 0:
+                continue
+            tpl.append((ch, fam, style, a / n))
+    return tpl
+
+
+def cell_templates(chars, cw, ch_, family="menlo", scale=4):
+    """[(ch, style, cw x ch_ coverage raster)] of every char in the four
+    styles of `family`, drawn where the art renderers put it in a PX x PY
+    cell (centered, baseline at 0.78 PY) and box-filtered down to cw x ch_."""
+    tpl = []
+    W, H = int(round(PX * scale)), int(round(PY * scale))
+    for fam, style, path, idx in FONTS:
+        if fam != family:
+            continue
+        font = ImageFont.truetype(path, 19 * scale, index=idx)
+        for c in chars:
+            im = Image.new("L", (W, H), 0)
+            ImageDraw.Draw(im).text((W / 2, 0.78 * H), c, font=font, fill=255, anchor="ms")
+            a = np.asarray(im.resize((cw, ch_), Image.BOX)).astype(np.float64) / 255.0
+            if a.max() > 0:
+                tpl.append((c, style, a))
+    return tpl
+
+
+def frames(path):
+    """RGB frames of an (animated) image, or of a directory's images in name order."""
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            if name.lower().endswith((".png", ".gif", ".jpg", ".jpeg", ".bmp")):
+                yield Image.open(os.path.join(path, name)).convert("RGB")
+        return
+    im = Image.open(path)
+    for i in range(getattr(im, "n_frames", 1)):
+        im.seek(i)
+        yield im.convert("RGB")
@@ -0,0 +1,145 @@
+"""Character grid as typed arrays, shared by steps 5-7.
+
+A Grid is four rows x cols planes:
+  ch   uint32  codepoint (32 = blank)
+  sty  uint8   style code byte (r/b/i/x, 32 = none)
+  rgb  uint32  packed 0xRRGGBB colour
+  ink  bool    the cell has a colour (a doc's "" / " " entries are False)
+and, for palette-coded grids (step5's moon_waves.json), `code` (uint8 colour
+code byte) with `palette` {code: [r, g, b]}; rgb then follows the palette.
+That is 10-11 bytes a cell against a pointer per cell per plane plus a str per
+colour for the list-of-lists form. Slicing gives views; pad/vstack/hstack and
+the JSON schema round-trip (from_doc / planes / to_doc) are array operations.
+"""
+import numpy as np
+
+BLANK = ord(" ")
+
+
+class Grid:
+    def __init__(self, ch, sty, rgb, ink, code=None, palette=None):
+        self.ch, self.sty, self.rgb, self.ink = ch, sty, rgb, ink
+        self.code, self.palette = code, palette
+
+    @classmethod
+    def blank(cls, rows, cols, palette=None):
+        return cls(np.full((rows, cols), BLANK, np.uint32), np.full((rows, cols), BLANK, np.uint8),
+                   np.zeros((rows, cols), np.uint32), np.zeros((rows, cols), bool),
+                   None if palette is None else np.full((rows, cols), BLANK, np.uint8), palette)
+
+    @classmethod
+    def from_cells(cls, chars, colors, styles, cols=None, palette=None):
+        """Rows of chars (str or list of 1-char str), colours (hex-or-"" lists, or
+        colour-code strings when palette is given) and style strings; short
+        rows are padded blank to `cols` (default: the widest)."""
+        cols = cols or max([len(r) for r in chars] + [0])
+        g = cls.blank(len(chars), cols, palette)
+        for r, row in enumerate(chars):
+            row = "".join(row)
+            g.ch[r, :len(row)] = np.frombuffer(row.encode("utf-32-le"), np.uint32)
+        for r, row in enumerate(styles):
+            row = "".join(row)
+            g.sty[r, :len(row)] = np.frombuffer(row.encode("latin-1"), np.uint8)
+        if palette is None:
+            for r, row in enumerate(colors):
+                for c, hexc in enumerate(row):
+                    if hexc:
+                        g.rgb[r, c] = int(hexc[1:], 16)
+                        g.ink[r, c] = True
+        else:
+            for r, row in enumerate(colors):
+                row = "".join(row)
+                g.code[r, :len(row)] = np.frombuffer(row.encode("latin-1"), np.uint8)
+            lut = np.zeros(256, np.uint32)
+            for k, (rr, gg, bb) in palette.items():
+                lut[ord(k)] = rr << 16 | gg << 8 | bb
+            g.rgb = lut[g.code]
+            g.ink = g.code != BLANK
+        return g
+
+    @classmethod
+    def from_doc(cls, doc):
+        """A grid document (moon_waves.json / moon-waves.json schema)."""
+        return cls.from_cells(doc["chars"], doc["colors"], doc["styles"], doc["cols"], doc.get("palette"))
+
+    @property
+    def shape(self):
+        return self.ch.shape
+
+    def __getitem__(self, key):
+        """2-D slice -> a Grid viewing the same planes."""
+        return Grid(self.ch[key], self.sty[key], self.rgb[key], self.ink[key],
+                    None if self.code is None else self.code[key], self.palette)
+
+    def copy(self):
+        return Grid(self.ch.copy(), self.sty.copy(), self.rgb.copy(), self.ink.copy(),
+                    None if self.code is None else self.code.copy(), self.palette)
+
+    def pad(self, top=0, bottom=0, left=0, right=0):
+        """New grid with blank rows/columns added around this one."""
+        rows, cols = self.shape
+        g = Grid.blank(rows + top + bottom, cols + left + right, self.palette)
+        g[top:top + rows, left:left + cols].assign(self)
+        return g
+
+    def assign(self, other):
+        """Copy other's cells into this grid (or view) in place."""
+        self.ch[...], self.sty[...], self.rgb[...], self.ink[...] = other.ch, other.sty, other.rgb, other.ink
+        if self.code is not None:
+            self.code[...] = other.code
+        return self
+
+    def text_rows(self, strip=False):
+        out = [r.tobytes().decode("utf-32-le") for r in self.ch.astype("<u4")]
+        return [r.rstrip() for r in out] if strip else out
+
+    def style_rows(self, strip=False):
+        out = [r.tobytes().decode("latin-1") for r in self.sty]
+        return [r.rstrip() for r in out] if strip else out
+
+    def hex_rows(self):
+        """Colours as per-cell '#rrggbb' (or '') lists."""
+        return [["#%06x" % v if k else "" for v, k in zip(rv.tolist(), kv.tolist())]
+                for rv, kv in zip(self.rgb, self.ink)]
+
+    def code_rows(self):
+        return [r.tobytes().decode("latin-1") for r in self.code]
+
+    def occupied(self):
+        """(row, col) of every non-blank cell, row-major."""
+        return np.argwhere(self.ch != BLANK)
+
+    def planes(self, strip=True):
+        """The document's cell fields: chars, styles (rstripped if strip) and colors."""
+        return dict(chars=self.text_rows(strip), styles=self.style_rows(strip),
+                    colors=self.hex_rows() if self.code is None else self.code_rows())
+
+    def to_doc(self, strip=False):
+        """rows, cols, palette (if coded) and the planes: step5's moon_waves.json."""
+        rows, cols = self.shape
+        doc = dict(rows=rows, cols=cols)
+        if self.palette is not None:
+            doc["palette"] = self.palette
+        p = self.planes(strip)
+        doc.update(chars=p["chars"], colors=p["colors"], styles=p["styles"])
+        return doc
+
+
+def vstack(grids):
+    """Grids top to bottom; narrower ones are padded blank on the right."""
+    cols = max(g.shape[1] for g in grids)
+    grids = [g.pad(right=cols - g.shape[1]) for g in grids]
+    return _concat(grids, 0)
+
+
+def hstack(grids):
+    """Grids left to right; shorter ones are padded blank at the bottom."""
+    rows = max(g.shape[0] for g in grids)
+    grids = [g.pad(bottom=rows - g.shape[0]) for g in grids]
+    return _concat(grids, 1)
+
+
+def _concat(grids, axis):
+    code = None if grids[0].code is None else np.concatenate([g.code for g in grids], axis)
+    return Grid(*(np.concatenate([getattr(g, p) for g in grids], axis) for p in ("ch", "sty", "rgb", "ink")),
+                code, grids[0].palette)
@@ -0,0 +1,138 @@
+"""Poster-size PNG of a grid document (moon-waves.json, monodreams-logo.json,
+step7 lockups), rendered in horizontal strips on a process pool.
+
+Same look as steps 6/7 (Menlo, 4 styles, GaussianBlur(4) glow screened on
+top), with every length multiplied by --scale: 8 gives an 8192px-wide
+moon-waves poster. The canvas is split into strips of whole grid rows; each
+worker draws its strip plus a margin above and below (glow reach + one row,
+so glyphs from neighbouring rows and their glow are accounted for), blurs
+it, and crops the margins away. Strips come back in order and go straight
+into a streaming PNG encoder (Sub-filtered rows through one zlib stream), so
+memory is bounded by a strip per worker plus a window of finished strips,
+whatever the poster size. At --scale 1 the pixels equal the step's own PNG.
+    python3 poster.py ../moon-waves.json --scale 8 [--jobs N] [--strip-rows 4]
+"""
+import os
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)          # Icon/ascii — deliverables live here
+BUILD = os.path.join(HERE, "build")   # intermediates (gitignored)
+os.makedirs(BUILD, exist_ok=True)
+import argparse
+import json
+import math
+import struct
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont, ImageFilter, ImageChops
+
+PX, PY, X0, YB0 = 17.62, 23.347, 7.01, 60.03   # steps 6/7 cell geometry at scale 1
+GLOW = 4                                       # GaussianBlur radius at scale 1
+BASE_COLS = 58                                 # the art's width: 1024px at scale 1
+
+ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+ap.add_argument("doc", nargs="?", default=os.path.join(ROOT, "moon-waves.json"), help="grid document")
+ap.add_argument("--scale", type=int, default=8, help="pixels per scale-1 pixel")
+ap.add_argument("--strip-rows", type=int, default=4, help="grid rows per strip")
+ap.add_argument("--jobs", type=int, default=os.cpu_count(), help="worker processes")
+ap.add_argument("--out", metavar="PATH", help="default: build/<doc>-poster-<scale>x.png")
+
+
+def canvas_size(rows, cols, s):
+    """Steps 6/7's PNG size (1024 square for the art, taller with a wordmark,
+    wider for wide lockups), times s."""
+    w = 1024 + max(0, int(math.ceil((cols - BASE_COLS) * PX)))
+    h = max(1024, int(math.ceil(YB0 + (rows - 1) * PY + 66)))
+    return w * s, h * s
+
+
+_doc = _fonts = None  # per worker
+
+
+def _init(path, s):
+    global _doc, _fonts
+    _doc = json.load(open(path))
+    _fonts = {k: ImageFont.truetype("/System/Library/Fonts/Menlo.ttc", 19 * s, index=i)
+              for k, i in {"r": 0, "b": 1, "i": 2, "x": 3}.items()}
+
+
+def render_strip(job):
+    """Pixel rows [y0, y1) of the final image as an (h, w, 3) uint8 array."""
+    y0, y1, w, h, s, margin = job
+    top, bottom = max(0, y0 - margin), min(h, y1 + margin)
+    im = Image.new("RGB", (w, bottom - top), (0, 0, 0))
+    d = ImageDraw.Draw(im)
+    px, py, x0, yb0 = PX * s, PY * s, X0 * s, YB0 * s
+    chars, colors, styles = _doc["chars"], _doc["colors"], _doc["styles"]
+    # rows whose glyphs can reach the canvas: baseline within a row of it
+    r0 = max(0, int(math.floor((top - py - yb0) / py)))
+    r1 = min(len(chars), int(math.ceil((bottom + 2 * py - yb0) / py)) + 1)
+    for r in range(r0, r1):
+        row, sty = chars[r], styles[r] if r < len(styles) else ""
+        for c, ch in enumerate(row):
+            if ch == " ":
+                continue
+            hexc = colors[r][c] if c < len(colors[r]) and colors[r][c] else "#888888"
+            rgb = tuple(int(hexc[i:i + 2], 16) for i in (1, 3, 5))
+            f = _fonts.get(sty[c] if c < len(sty) else "r", _fonts["r"])
+            d.text((x0 + c * px + px / 2, yb0 + r * py - top), ch, font=f, fill=rgb, anchor="ms")
+    g = im.filter(ImageFilter.GaussianBlur(GLOW * s)).point(lambda v: int(v * 0.9))
+    out = ImageChops.screen(im, g).crop((0, y0 - top, w, y1 - top))
+    return np.asarray(out)
+
+
+def _chunk(f, kind, data):
+    f.write(struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data)))
+
+
+class PNGWriter:
+    """Streaming 8-bit RGB PNG: strips of rows in, IDAT chunks out."""
+
+    def __init__(self, path, w, h, level=6):
+        self.f = open(path, "wb")
+        self.f.write(b"\x89PNG\r\n\x1a\n")
+        _chunk(self.f, b"IHDR", struct.pack(">IIBBBBB", w, h, 8, 2, 0, 0, 0))
+        self.z = zlib.compressobj(level)
+
+    def write(self, rows):
+        """rows: (n, w, 3) uint8. Each row is Sub-filtered (type 1): byte minus
+        the same channel one pixel to the left, which flattens the glow."""
+        flat = rows.reshape(len(rows), -1)
+        sub = flat.copy()
+        sub[:, 3:] -= flat[:, :-3]
+        data = np.hstack([np.ones((len(rows), 1), np.uint8), sub]).tobytes()
+        out = self.z.compress(data)
+        if out:
+            _chunk(self.f, b"IDAT", out)
+
+    def close(self):
+        _chunk(self.f, b"IDAT", self.z.flush())
+        _chunk(self.f, b"IEND", b"")
+        self.f.close()
+
+
+if __name__ == "__main__":
+    args = ap.parse_args()
+    s = args.scale
+    doc = json.load(open(args.doc))
+    w, h = canvas_size(doc["rows"], doc["cols"], s)
+    out = args.out or os.path.join(BUILD, f"{os.path.splitext(os.path.basename(args.doc))[0]}-poster-{s}x.png")
+    # the blur reads up to ~4 radii away; drawn glyphs reach a row past their band
+    margin = 4 * GLOW * s + int(math.ceil(PY * s)) + 2
+    step = int(round(args.strip_rows * PY * s))
+    strips = [(y, min(h, y + step), w, h, s, margin) for y in range(0, h, step)]
+    print(f"{w}x{h} px in {len(strips)} strips of {step} px (+{margin} px margins) on {args.jobs} workers")
+    t0 = time.perf_counter()
+    png = PNGWriter(out, w, h)
+    with ProcessPoolExecutor(args.jobs, initializer=_init, initargs=(args.doc, s)) as pool:
+        todo, pending = iter(strips), deque()
+        for job in todo:  # keep a bounded window of strips in flight
+            pending.append(pool.submit(render_strip, job))
+            if len(pending) >= 2 * args.jobs:
+                png.write(pending.popleft().result())
+        while pending:
+            png.write(pending.popleft().result())
+    png.close()
+    print(f"saved {out} ({os.path.getsize(out) / 1e6:.1f} MB) in {time.perf_counter() - t0:.1f}s")
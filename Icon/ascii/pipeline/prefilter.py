@@ -0,0 +1,47 @@
+"""Approximate candidate search over a template bank, for large charsets.
+
+Templates (unit-norm rows of T) are projected onto their top `dim` principal
+directions (uncentered SVD, so dot products survive the projection) and
+clustered into ~sqrt(N) cells with k-means. A query scores the cell
+centroids, opens the `nprobe` best cells and ranks only their members in the
+reduced space, so the cost grows like sqrt(N) rather than N. The caller
+re-ranks the returned candidates with the exact correlation (step4
+--matcher pca)."""
+import numpy as np
+
+
+class CoarseIndex:
+    def __init__(self, T, dim=32, cells=None, iters=12):
+        T = np.asarray(T, dtype=np.float64)
+        n = len(T)
+        dim = min(dim, *T.shape)
+        self.basis = np.linalg.svd(T, full_matrices=False)[2][:dim].T   # (D, dim)
+        P = T @ self.basis
+        cells = max(1, min(n, cells or int(np.ceil(np.sqrt(n)))))
+        # deterministic k-means: seeds spread evenly over the bank order
+        cent = P[np.linspace(0, n - 1, cells).astype(int)].copy()
+        for _ in range(iters):
+            assign = np.argmax(P @ cent.T - 0.5 * (cent * cent).sum(axis=1), axis=1)  # nearest
+            for c in range(cells):
+                sel = assign == c
+                if sel.any():
+                    cent[c] = P[sel].mean(axis=0)
+        self.P, self.cent = P, cent
+        self.members = [np.flatnonzero(assign == c) for c in range(cells)]
+
+    def candidates(self, Q, k=8, nprobe=3, among=None):
+        """Bank indices (ascending) of the k best templates per query row of
+        Q in the probed cells, plus the k best within `among` (a bool mask
+        over the bank) if given."""
+        R = np.atleast_2d(Q) @ self.basis
+        near = R @ self.cent.T - 0.5 * (self.cent * self.cent).sum(axis=1)
+        probe = np.argsort(-near, axis=1)[:, :nprobe]
+        out = set()
+        for r, cells in zip(R, probe):
+            idx = np.concatenate([self.members[c] for c in cells])
+            sc = self.P[idx] @ r
+            out.update(idx[np.argsort(-sc, kind="stable")[:k]].tolist())
+            if among is not None:
+                sub = idx[among[idx]]
+                out.update(sub[np.argsort(-(self.P[sub] @ r), kind="stable")[:k]].tolist())
+        return np.array(sorted(out), dtype=np.intp)
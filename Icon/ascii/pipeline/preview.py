@@ -0,0 +1,84 @@
+"""Draft preview: steps 4-6 on the draft decoded at 1/2 or 1/4 size, and how
+far the result diverges from the full extraction.
+    python3 preview.py [--scale 2 4]
+Per scale, step4 --preview S streams its glyph records (in full-size pixels)
+to step5 and step6 with --out build/preview/<S>/, so every deliverable of the
+preview lands there (moon-waves.png is the visual check). The reference is
+the full run's build/moon_waves.json, extracted first if missing. Reported:
+per-step time, the grid shape, and cell agreement with the reference —
+occupancy, then characters, hue, brightness tier and style over the cells
+both grids ink."""
+import os
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)          # Icon/ascii — deliverables live here
+BUILD = os.path.join(HERE, "build")   # intermediates (gitignored)
+os.makedirs(BUILD, exist_ok=True)
+import argparse
+import contextlib
+import io
+import json
+import runpy
+import sys
+import time
+import numpy as np
+from grid import BLANK, Grid
+
+ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+ap.add_argument("--scale", type=int, nargs="+", choices=(2, 4), default=[2],
+                help="decode scale(s): 2 = half size, 4 = quarter size")
+ap.add_argument("--ref", metavar="PATH", default=f"{BUILD}/moon_waves.json",
+                help="full-extraction grid to compare against")
+
+
+def run(script, *argv):
+    """Run a pipeline step in this process (quietly) -> seconds taken."""
+    saved = sys.argv
+    t0 = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            sys.argv = [script, *argv]
+            runpy.run_path(os.path.join(HERE, script), run_name="__main__")
+    except SystemExit as e:  # step6 ends its normal run with a bare SystemExit
+        if e.code:
+            raise
+    finally:
+        sys.argv = saved
+    return time.perf_counter() - t0
+
+
+def divergence(ref, got):
+    """Agreement of grid `got` with `ref`, over their common rows x cols."""
+    rows, cols = min(ref.shape[0], got.shape[0]), min(ref.shape[1], got.shape[1])
+    a, b = ref[:rows, :cols], got[:rows, :cols]
+    ia, ib = a.ch != BLANK, b.ch != BLANK
+    both = ia & ib
+    n = max(1, int(both.sum()))
+    hue = lambda g: np.isin(g.code, list(b"yYG"))
+    return dict(
+        shape=f"{got.shape[0]}x{got.shape[1]} (full {ref.shape[0]}x{ref.shape[1]})",
+        occupied=f"{int(ib.sum())} cells (full {int(ia.sum())}), IoU {both.sum() / max(1, (ia | ib).sum()):.3f}",
+        chars=f"{(a.ch == b.ch)[both].sum() / n:.1%}",
+        hue=f"{(hue(a) == hue(b))[both].sum() / n:.1%}",
+        tier=f"{(a.code == b.code)[both].sum() / n:.1%}",
+        style=f"{(a.sty == b.sty)[both].sum() / n:.1%}",
+    )
+
+
+if __name__ == "__main__":
+    args = ap.parse_args()
+    if not os.path.exists(args.ref):
+        print("no full extraction yet; running step4 + step5 at full size")
+        run("step4_extract.py")
+        run("step5_layout.py")
+    ref = Grid.from_doc(json.load(open(args.ref)))
+    for s in args.scale:
+        out = os.path.join(BUILD, "preview", str(s))
+        os.makedirs(out, exist_ok=True)
+        stream = os.path.join(out, "glyphs.ndjson")
+        t4 = run("step4_extract.py", "--preview", str(s), "--stream", stream)
+        t5 = run("step5_layout.py", "--stream", stream, "--out", out)
+        t6 = run("step6_art.py", "--out", out)
+        print(f"1/{s} preview: step4 {t4:.2f}s, step5 {t5:.2f}s, step6 {t6:.2f}s -> {out}/")
+        got = Grid.from_doc(json.load(open(os.path.join(out, "moon_waves.json"))))
+        for k, v in divergence(ref, got).items():
+            print(f"  {k:<9}{v}")
@@ -0,0 +1,115 @@
+"""Real-time raster -> ASCII: tile any image into grid cells and pick, per cell,
+the glyph (artwork charset x Menlo's four styles, from glyphbank.py) whose
+cell-anchored raster best explains the cell's ink; colour = the cell's
+ink-weighted mean RGB. One batched matmul per frame, no per-cell Python.
+    python3 raster2ascii.py [IMAGE|GIF|DIR] [--cols 58] [--out PATH] [--bench N]
+Writes the moon-waves.json schema (render_terminal.py renders it); a GIF or a
+directory of frames gives one document per line (NDJSON) with a "frame" index."""
+import os
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)          # Icon/ascii — deliverables live here
+BUILD = os.path.join(HERE, "build")   # intermediates (gitignored)
+os.makedirs(BUILD, exist_ok=True)
+import argparse
+import itertools
+import json
+import time
+import numpy as np
+from PIL import Image
+from glyphbank import (BLUE_ALLOWED, LARGE_CHARS, SCODE, SMALL_CHARS, YELLOW_ALLOWED,
+                       cell_templates, frames)
+
+SRC = os.path.join(ROOT, "monodreams-ascii-draft.jpeg")
+AS = 0.7546  # cell aspect (width/height) of the art grid
+
+ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+ap.add_argument("image", nargs="?", default=SRC, help="image, animated GIF or directory of frames")
+ap.add_argument("--cols", type=int, default=58, help="grid width in cells (58 = the art grid)")
+ap.add_argument("--res", type=int, default=8, help="template width in pixels (height = res / aspect)")
+ap.add_argument("--out", metavar="PATH", help="default: build/raster.json (.ndjson for frames)")
+ap.add_argument("--bench", type=int, metavar="N", help="convert the first frame N times; report fps")
+args = ap.parse_args()
+
+CW, CH = args.res, int(round(args.res / AS))
+CHARS = "".join(dict.fromkeys(LARGE_CHARS + SMALL_CHARS))
+tpl = cell_templates(CHARS, CW, CH)
+T = np.stack([t[2].ravel() for t in tpl]).astype(np.float32)   # (n, CW*CH) coverage
+BIAS = -0.5 * (T * T).sum(axis=1)    # argmax q.t - |t|^2/2 = nearest t
+# blank (score 0) always competes; per hue, disallowed glyphs never win
+ALLOWED = np.array([[t[0] in YELLOW_ALLOWED for t in tpl],
+                    [t[0] in BLUE_ALLOWED for t in tpl]])
+GLYPH = np.array([t[0] for t in tpl] + [" "])
+STYLE = np.array([SCODE[t[1]] for t in tpl] + [" "])
+print(f"{len(tpl)} cell templates at {CW}x{CH}")
+
+
+def convert(im):
+    """PIL RGB image -> (chars, styles, colors) per grid row."""
+    w, h = im.size
+    cols = args.cols
+    rows = max(1, int(h / (w / cols / AS)))
+    px = np.asarray(im.resize((cols * CW, rows * CH), Image.BOX))
+    # max channel (elementwise on the bytes), scaled so the brightest ink = full coverage
+    lum = np.maximum(np.maximum(px[..., 0], px[..., 1]), px[..., 2]).astype(np.float32)
+    lum = np.minimum(lum / max(np.percentile(lum[::3, ::3], 99.5), 1.0), 1.0)
+    # (rows, CH, cols, CW) -> one row of CH*CW per cell
+    Q = lum.reshape(rows, CH, cols, CW).transpose(0, 2, 1, 3).reshape(rows * cols, CH * CW)
+    wsum = Q.sum(axis=1, keepdims=True)
+    # ink-weighted cell sums per channel: over each cell's CW columns, then its CH rows
+    rgb = np.stack([(px[..., c] * lum).reshape(rows * CH, cols, CW).sum(axis=2)
+                    .reshape(rows, CH, cols).sum(axis=1).ravel() for c in range(3)], axis=1)
+    rgb /= np.maximum(wsum, 1e-6)
+    blue = rgb[:, 2] >= rgb[:, 0]
+    S = np.where(ALLOWED[blue.astype(int)], Q @ T.T + BIAS, -np.inf)
+    best = np.argmax(np.concatenate([S, np.zeros((len(S), 1))], axis=1), axis=1)
+    ch = GLYPH[best].reshape(rows, cols)
+    sty = STYLE[best].reshape(rows, cols)
+    code = np.rint(np.clip(rgb, 0, 255)).astype(int) @ [1 << 16, 1 << 8, 1]
+    code[best == len(tpl)] = -1
+    colors = [["#%06x" % v if v >= 0 else "" for v in r] for r in code.reshape(rows, cols).tolist()]
+    return ["".join(r) for r in ch], ["".join(r) for r in sty], colors
+
+
+def document(im, **extra):
+    chars, styles, colors = convert(im)
+    return dict(
+        title=f"{os.path.basename(args.image)} (ASCII, raster2ascii)",
+        generator="raster2ascii.py (step4 glyph bank)",
+        rows=len(chars), cols=args.cols,
+        cell_aspect=AS,
+        background="#000000",
+        chars=[r.rstrip() for r in chars],
+        styles=[r.rstrip() for r in styles],
+        style_key={"r": "regular", "b": "bold", "i": "italic", "x": "bold-italic", " ": "empty"},
+        colors=colors,
+        **extra,
+    )
+
+
+it = frames(args.image)
+first = next(it)
+if args.bench:
+    convert(first)  # warm-up
+    t0 = time.perf_counter()
+    for _ in range(args.bench):
+        convert(first)
+    dt = (time.perf_counter() - t0) / args.bench
+    print(f"{args.cols} cols: {dt * 1000:.2f} ms/frame = {1 / dt:.0f} fps")
+    raise SystemExit
+
+second = next(it, None)
+if second is None:
+    doc = document(first)
+    out = args.out or f"{BUILD}/raster.json"
+    json.dump(doc, open(out, "w"), ensure_ascii=False)
+    print("\n".join(doc["chars"]))
+    print("saved", out)
+else:
+    out = args.out or f"{BUILD}/raster.ndjson"
+    t0 = time.perf_counter()
+    n = 0
+    with open(out, "w") as f:
+        for n, im in enumerate(itertools.chain([first, second], it), start=1):
+            f.write(json.dumps(document(im, frame=n - 1), ensure_ascii=False) + "\n")
+    dt = time.perf_counter() - t0
+    print(f"{n} frames in {dt:.2f}s ({n / dt:.0f} fps incl. decode + JSON) -> {out}")
@@ -0,0 +1,376 @@
+"""Local render service: ANSI / HTML / SVG / PNG of grid documents over HTTP,
+so tools and the web demo hosts don't spawn a step script per render.
+    python3 serve.py [--port 8765] [--jobs N] [--cache-mb 64]
+
+  GET  /render/<name>.<fmt>?...   a document in Icon/ascii or pipeline/build
+                                  (moon-waves, monodreams-logo, lockups/<stem>)
+  POST /render.<fmt>?...          the document as the request body
+  GET  /stats                     cache and render counters (JSON)
+
+fmt: ansi (depth=24|256|16), html (font=4..64 px), svg, png (scale=1..4),
+txt. Rendering runs on a process pool, so the event loop only parses
+requests and copies bytes. Results go into an LRU bounded by total bytes,
+keyed by sha256 of the document bytes plus the normalized parameters;
+concurrent requests for the same key share one render. The key is also the
+ETag, so a matching If-None-Match gets a 304 before the cache is consulted.
+Named documents are re-hashed only when their size or mtime changes.
+"""
+import os
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)          # Icon/ascii — deliverables live here
+BUILD = os.path.join(HERE, "build")   # intermediates (gitignored)
+os.makedirs(BUILD, exist_ok=True)
+import argparse
+import asyncio
+import hashlib
+import io
+import json
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import parse_qs, unquote, urlsplit
+
+ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+ap.add_argument("--host", default="127.0.0.1")
+ap.add_argument("--port", type=int, default=8765)
+ap.add_argument("--jobs", type=int, default=os.cpu_count(), help="render worker processes")
+ap.add_argument("--cache-mb", type=float, default=64, help="LRU budget for rendered bytes")
+ap.add_argument("--max-body-mb", type=float, default=8, help="largest POSTed document")
+
+TYPES = {"ansi": "text/plain; charset=utf-8", "txt": "text/plain; charset=utf-8",
+         "html": "text/html; charset=utf-8", "svg": "image/svg+xml", "png": "image/png"}
+# format -> {param: (default, allowed values)}
+PARAMS = {"ansi": {"depth": (24, (24, 256, 16))}, "txt": {}, "svg": {},
+          "html": {"font": (15, range(4, 65))}, "png": {"scale": (1, range(1, 5))}}
+SEARCH = (ROOT, BUILD)                # where GET /render/<name> looks
+
+
+# ---------- renderers (worker processes) ----------
+SGR = {"b": "1;", "i": "3;", "x": "1;3;"}
+CUBE = (0, 95, 135, 175, 215, 255)
+BASIC = ((0, 0, 0), (205, 0, 0), (0, 205, 0), (205, 205, 0), (0, 0, 238), (205, 0, 205), (0, 205, 205),
+         (229, 229, 229), (127, 127, 127), (255, 0, 0), (0, 255, 0), (255, 255, 0), (92, 92, 255),
+         (255, 0, 255), (0, 255, 255), (255, 255, 255))
+
+
+def _near(v, levels):
+    return min(range(len(levels)), key=lambda i: abs(levels[i] - v))
+
+
+def sgr_colour(rgb, depth):
+    """Foreground SGR parameters for rgb at 24-bit, 256- or 16-colour depth."""
+    r, g, b = rgb
+    if depth == 24:
+        return f"38;2;{r};{g};{b}"
+    if depth == 256:
+        ci = [_near(v, CUBE) for v in rgb]
+        cube = tuple(CUBE[i] for i in ci)
+        k = min(23, max(0, (sum(rgb) // 3 - 8 + 5) // 10))
+        grey = 8 + 10 * k
+        if sum((a - c) ** 2 for a, c in zip(rgb, (grey,) * 3)) < sum((a - c) ** 2 for a, c in zip(rgb, cube)):
+            return f"38;5;{232 + k}"
+        return f"38;5;{16 + 36 * ci[0] + 6 * ci[1] + ci[2]}"
+    i = min(range(16), key=lambda i: sum((a - c) ** 2 for a, c in zip(rgb, BASIC[i])))
+    return str(30 + i if i < 8 else 90 + i - 8)
+
+
+def _cells(doc):
+    """(row, [(ch, hex or None, style)]) per row."""
+    for r, row in enumerate(doc["chars"]):
+        sty = doc["styles"][r] if r < len(doc["styles"]) else ""
+        cols = doc["colors"][r]
+        yield r, [(ch, None if ch == " " else (cols[c] if c < len(cols) and cols[c] else "#888888"),
+                   sty[c] if c < len(sty) else "r") for c, ch in enumerate(row)]
+
+
+def render_ansi(doc, depth):
+    lines = []
+    for _, cells in _cells(doc):
+        out, cur = [], None
+        for ch, hexc, sty in cells:
+            if hexc is None:
+                if cur is not None:
+                    out.append("\x1b[0m"); cur = None
+                out.append(" ")
+                continue
+            if (hexc, sty) != cur:
+                rgb = tuple(int(hexc[i:i + 2], 16) for i in (1, 3, 5))
+                out.append(f"\x1b[0;{SGR.get(sty, '')}{sgr_colour(rgb, depth)}m")
+                cur = (hexc, sty)
+            out.append(ch)
+        out.append("\x1b[0m")
+        lines.append("".join(out).rstrip())
+    return "\n".join(lines) + "\n"
+
+
+def render_html(doc, font):
+    esc = {"&": "&amp;", "<": "&lt;", ">": "&gt;"}
+    rows = []
+    for _, cells in _cells(doc):
+        spans, cur, buf = [], None, []
+        for ch, hexc, sty in cells + [(None, "", "")]:
+            key = None if hexc is None else (hexc, sty)
+            if key != cur or ch is None:
+                if buf and cur is None:
+                    spans.append("".join(buf))
+                elif buf:
+                    st = f"color:{cur[0]}"
+                    if cur[1] in ("b", "x"):
+                        st += ";font-weight:700"
+                    if cur[1] in ("i", "x"):
+                        st += ";font-style:italic"
+                    spans.append(f'<span style="{st}">' + "".join(buf) + "</span>")
+                buf, cur = [], key
+            if ch is not None:
+                buf.append(esc.get(ch, ch))
+        rows.append("".join(spans).rstrip())
+    title = "".join(esc.get(c, c) for c in doc.get("title", ""))
+    return f"""<!doctype html>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+  html,body {{ margin:0; background:{doc.get("background", "#000000")}; min-height:100vh;
+               display:flex; align-items:center; justify-content:center; }}
+  pre {{ font-family: Menlo, Consolas, 'DejaVu Sans Mono', monospace;
+        font-size: {font}px;
+        line-height: 1.0;
+        letter-spacing: 0.155em;
+        text-shadow: 0 0 14px rgba(120,140,255,.18), 0 0 3px rgba(255,220,120,.10);
+        margin: 4vh 2vw; }}
+</style>
+<pre>{chr(10).join(rows)}</pre>
+"""
+
+
+_fonts = {}  # scale -> poster's font table, per worker
+
+
+def render_png(doc, scale):
+    import poster
+    from PIL import Image, ImageFont
+    if scale not in _fonts:
+        _fonts[scale] = {k: ImageFont.truetype("/System/Library/Fonts/Menlo.ttc", 19 * scale, index=i)
+                         for k, i in {"r": 0, "b": 1, "i": 2, "x": 3}.items()}
+    w, h = poster.canvas_size(doc["rows"], doc["cols"], scale)
+    poster._doc, poster._fonts = doc, _fonts[scale]  # render_strip reads the worker globals
+    buf = io.BytesIO()
+    Image.fromarray(poster.render_strip((0, h, w, h, scale, 0))).save(buf, "PNG")
+    return buf.getvalue()
+
+
+def render(data, fmt, params):
+    """Worker entry: document bytes -> rendered bytes."""
+    doc = json.loads(data)
+    if fmt == "png":
+        return render_png(doc, params["scale"])
+    if fmt == "svg":
+        from svgexport import to_svg
+        out = to_svg(doc)
+    elif fmt == "ansi":
+        out = render_ansi(doc, params["depth"])
+    elif fmt == "html":
+        out = render_html(doc, params["font"])
+    else:
+        out = "\n".join(r.rstrip() for r in doc["chars"]) + "\n"
+    return out.encode("utf-8")
+
+
+# ---------- cache + service (event loop) ----------
+class LRU:
+    """Rendered bytes by key, evicting least recently used past max_bytes."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes, self.size, self.items = max_bytes, 0, OrderedDict()
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key):
+        v = self.items.get(key)
+        if v is None:
+            self.misses += 1
+            return None
+        self.items.move_to_end(key)
+        self.hits += 1
+        return v
+
+    def put(self, key, value):
+        if len(value) > self.max_bytes or key in self.items:
+            return
+        self.items[key] = value
+        self.size += len(value)
+        while self.size > self.max_bytes:
+            _, old = self.items.popitem(last=False)
+            self.size -= len(old)
+            self.evictions += 1
+
+
+class HTTPError(Exception):
+    def __init__(self, status, msg):
+        super().__init__(msg)
+        self.status = status
+
+
+REASONS = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class Service:
+    def __init__(self, pool, cache_bytes, max_body):
+        self.pool, self.cache, self.max_body = pool, LRU(cache_bytes), max_body
+        self.inflight = {}  # key -> future of a render in progress
+        self.named = {}     # path -> ((size, mtime_ns), sha256, bytes)
+        self.renders = self.not_modified = 0
+        self.render_s = 0.0
+
+    def load(self, name):
+        """A named document's (digest, bytes), re-read only when it changed."""
+        name = unquote(name)
+        if name.startswith("/") or "\\" in name or "\0" in name or ".." in name.split("/"):
+            raise HTTPError(404, f"no document {name!r}")
+        for d in SEARCH:
+            root = os.path.realpath(d)
+            path = os.path.realpath(os.path.join(root, name + ".json"))
+            if not path.startswith(root + os.sep):  # a symlink out of the doc root
+                continue
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            sig = (st.st_size, st.st_mtime_ns)
+            hit = self.named.get(path)
+            if hit is None or hit[0] != sig:
+                data = open(path, "rb").read()
+                hit = self.named[path] = (sig, hashlib.sha256(data).hexdigest(), data)
+            return hit[1], hit[2]
+        raise HTTPError(404, f"no document {name!r}")
+
+    @staticmethod
+    def params(fmt, query):
+        if fmt not in PARAMS:
+            raise HTTPError(404, f"unknown format {fmt!r} (one of {', '.join(PARAMS)})")
+        q = parse_qs(query)
+        out = {}
+        for k, (default, allowed) in PARAMS[fmt].items():
+            try:
+                v = int(q[k][-1]) if k in q else default
+            except ValueError:
+                raise HTTPError(400, f"{k} must be an integer")
+            if v not in allowed:
+                raise HTTPError(400, f"{k}={v} out of range")
+            out[k] = v
+        return out
+
+    async def rendered(self, key, data, fmt, params):
+        body = self.cache.get(key)
+        if body is not None:
+            return body
+        fut = self.inflight.get(key)
+        if fut is None:  # first request for this key renders; the rest await it
+            fut = self.inflight[key] = asyncio.ensure_future(self._render(key, data, fmt, params))
+            fut.add_done_callback(lambda _: self.inflight.pop(key, None))
+        return await asyncio.shield(fut)
+
+    async def _render(self, key, data, fmt, params):
+        t0 = time.perf_counter()
+        try:
+            body = await asyncio.get_running_loop().run_in_executor(self.pool, render, data, fmt, params)
+        except (ValueError, KeyError, TypeError, IndexError) as e:
+            raise HTTPError(400, f"not a grid document: {e!r}")
+        self.renders += 1
+        self.render_s += time.perf_counter() - t0
+        self.cache.put(key, body)
+        return body
+
+    async def handle(self, method, target, headers, body):
+        """-> (status, extra headers, body)"""
+        url = urlsplit(target)
+        if url.path == "/stats" and method == "GET":
+            c = self.cache
+            stats = dict(hits=c.hits, misses=c.misses, evictions=c.evictions, entries=len(c.items),
+                         bytes=c.size, max_bytes=c.max_bytes, renders=self.renders,
+                         not_modified=self.not_modified, render_ms=round(1e3 * self.render_s, 1))
+            return 200, {"Content-Type": "application/json"}, json.dumps(stats).encode()
+        if url.path.startswith("/render/") and method == "GET":
+            name, _, fmt = url.path[len("/render/"):].rpartition(".")
+            params = self.params(fmt, url.query)
+            digest, data = self.load(name)
+        elif url.path.startswith("/render.") and method == "POST":
+            fmt = url.path[len("/render."):]
+            params = self.params(fmt, url.query)
+            digest, data = hashlib.sha256(body).hexdigest(), body
+        elif url.path.startswith("/render"):
+            raise HTTPError(405, "GET /render/<name>.<fmt> or POST /render.<fmt>")
+        else:
+            raise HTTPError(404, url.path)
+        key = hashlib.sha256(f"{digest} {fmt} {sorted(params.items())}".encode()).hexdigest()[:32]
+        etag = f'"{key}"'
+        hdrs = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag in [t.strip() for t in headers.get("if-none-match", "").split(",")]:
+            self.not_modified += 1
+            return 304, hdrs, b""
+        out = await self.rendered(key, data, fmt, params)
+        hdrs["Content-Type"] = TYPES[fmt]
+        return 200, hdrs, out
+
+    async def connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    return
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ")
+                except ValueError:
+                    return
+                headers = {}
+                for line in lines[1:]:
+                    k, _, v = line.partition(":")
+                    if k:
+                        headers[k.strip().lower()] = v.strip()
+                keep = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                try:
+                    try:
+                        n = int(headers.get("content-length", 0))
+                    except ValueError:
+                        n = -1
+                    if n < 0:  # the body's end is unknown: answer, then drop the connection
+                        keep = False
+                        raise HTTPError(400, "bad Content-Length")
+                    if n > self.max_body:
+                        keep = False
+                        raise HTTPError(413, f"document over {self.max_body} bytes")
+                    body = await reader.readexactly(n) if n else b""
+                    status, hdrs, out = await self.handle(method, target, headers, body)
+                except HTTPError as e:
+                    status, hdrs, out = e.status, {"Content-Type": "text/plain"}, (str(e) + "\n").encode()
+                except asyncio.IncompleteReadError:
+                    return
+                except Exception as e:  # a worker crash must not take the service down
+                    status, hdrs, out = 500, {"Content-Type": "text/plain"}, (repr(e) + "\n").encode()
+                hdrs["Content-Length"] = str(len(out))
+                hdrs["Connection"] = "keep-alive" if keep else "close"
+                writer.write(f"HTTP/1.1 {status} {REASONS[status]}\r\n".encode()
+                             + "".join(f"{k}: {v}\r\n" for k, v in hdrs.items()).encode() + b"\r\n"
+                             + out)
+                await writer.drain()
+                if not keep:
+                    return
+        finally:
+            writer.close()
+
+
+async def main(args):
+    with ProcessPoolExecutor(args.jobs) as pool:
+        svc = Service(pool, int(args.cache_mb * 1e6), int(args.max_body_mb * 1e6))
+        server = await asyncio.start_server(svc.connection, args.host, args.port)
+        print(f"serving on http://{args.host}:{args.port}/ ({args.jobs} workers, {args.cache_mb:g} MB cache)")
+        async with server:
+            await server.serve_forever()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main(ap.parse_args()))
+    except KeyboardInterrupt:
+        pass
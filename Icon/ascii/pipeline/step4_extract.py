@@ -2,140 +2,176 @@
   - LARGE (ink height >= 10px): bbox-normalized shape match, then case
     (upper/lower) decided by ink height — captures the AI's height nuance.
   - SMALL: baseline-anchored match (distinguishes '.' vs '·' vs '-' vs ':').
-Outputs glyphs.json."""
+Matching: exact normalized correlation over the glyph's hue sub-bank
+(default), or --matcher pca: a reduced-dimension prefilter picks top-k
+candidates that are re-ranked exactly (for --charset full, thousands of
+templates). Segmentation: one connected-component labelling of the whole ink
+mask, the components grouped into glyphs per row band (default), or
+--segment projection: the older column-projection runs per band (same glyphs
+on the committed draft).
+Outputs glyphs.json, or with --stream PATH ('-' = stdout) newline-delimited
+records as it goes: a header (rows, bands, baseline, and `ink`: every glyph's
+[cx, r, g, b], measured before matching), then one record per row band as
+soon as it is classified (step5_layout.py --stream reads them).
+--preview 2|4: quick draft check. The JPEG is decoded at 1/2 or 1/4 size
+(DCT-domain scaling, Image.draft) and every length — band and span limits,
+ink-height cuts, BOX/SCANVAS and the template font sizes — is scaled to
+match. Only the pixel-proportional stages (decode, segmentation, the
+per-glyph pixel work) shrink with the area. Start-up, template rendering and
+the per-glyph overhead are a fixed floor, so a run takes ~1.6 s at full
+size, ~1.2 s at 1/2 and ~1.1 s at 1/4.
+Records stay in full-size pixels, so step5 onwards run unchanged (preview.py
+drives it and reports the divergence from the full extraction).
+--frames GIF|DIR: animated draft. Bands come from the first frame; each later
+frame is diffed against the previous one and only glyphs whose pixels changed
+are re-classified; the stream then carries only the changed bands per frame,
+each frame closed by {"frame": i, "done": true}."""
 import os
 HERE = os.path.dirname(os.path.abspath(__file__))
 ROOT = os.path.dirname(HERE)          # Icon/ascii — deliverables live here
 BUILD = os.path.join(HERE, "build")   # intermediates (gitignored)
 os.makedirs(BUILD, exist_ok=True)
+import argparse
+import functools
+import itertools
 import json
+import sys
+import time
 import numpy as np
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image
 from collections import Counter
+import glyphbank
+from components import label, runs
+from glyphbank import (BLUE_ALLOWED, EXTRA_CHARS, LARGE_CHARS, SMALL_CHARS, YELLOW_ALLOWED,
+                       BOX, SBASE, SCANVAS, blur, frames, large_templates, norm_box, small_templates,
+                       soft)
+from prefilter import CoarseIndex
+
+ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+ap.add_argument("--segment", choices=("components", "projection"), default="components",
+                help="glyph segmentation (default: components)")
+ap.add_argument("--check-index", action="store_true",
+                help="also run the brute-force matcher and assert the same result")
+ap.add_argument("--charset", choices=("draft", "full"), default="draft",
+                help="full: + box drawing, block elements, Latin and Cyrillic letters")
+ap.add_argument("--matcher", choices=("exact", "pca"), default="exact")
+ap.add_argument("--pca-dim", type=int, default=32, help="pca: reduced dimension")
+ap.add_argument("--topk", type=int, default=16, help="pca: candidates re-ranked per shift")
+ap.add_argument("--nprobe", type=int, default=6, help="pca: cells searched per shift")
+ap.add_argument("--accuracy", action="store_true",
+                help="pca: also run the exact matcher and report agreement")
+ap.add_argument("--stream", metavar="PATH",
+                help="write glyph records per row band to PATH ('-' = stdout) instead of glyphs.json")
+ap.add_argument("--frames", metavar="GIF|DIR",
+                help="animated draft: a GIF or a directory of frames (name order); needs --stream")
+ap.add_argument("--preview", type=int, choices=(1, 2, 4), default=1, metavar="S",
+                help="decode the draft at 1/S size (2 or 4) with every size scaled to match")
+ap.add_argument("--set", metavar="NAME=VALUE", action="append", default=[],
+                help="override a tunable (INK_T, CASE_H, ITALIC_MARGIN, MERGE_W, MIRROR_T, SOFT); "
+                     "tune.py sweeps these")
+args = ap.parse_args()
+if args.frames and not args.stream:
+    ap.error("--frames needs --stream")
+if args.stream == "-":  # records own stdout; diagnostics go to stderr
+    records, sys.stdout = sys.stdout, sys.stderr
+elif args.stream:
+    records = open(args.stream, "w")
 
 SRC = os.path.join(ROOT, "monodreams-ascii-draft.jpeg")
 OUT = BUILD
 
-FONTS = [
-    ("menlo", "regular", "/System/Library/Fonts/Menlo.ttc", 0),
-    ("menlo", "bold", "/System/Library/Fonts/Menlo.ttc", 1),
-    ("menlo", "italic", "/System/Library/Fonts/Menlo.ttc", 2),
-    ("menlo", "bold-italic", "/System/Library/Fonts/Menlo.ttc", 3),
-    ("courier", "regular", "/System/Library/Fonts/Supplemental/Courier New.ttf", 0),
-    ("courier", "bold", "/System/Library/Fonts/Supplemental/Courier New Bold.ttf", 0),
-    ("courier", "italic", "/System/Library/Fonts/Supplemental/Courier New Italic.ttf", 0),
-    ("courier", "bold-italic", "/System/Library/Fonts/Supplemental/Courier New Bold Italic.ttf", 0),
-]
-LARGE_CHARS = "NnMmWwИиVvUuIli:@#%*+=±‡"
-SMALL_CHARS = ".·:,'-=+*~"
-BLUE_ALLOWED = set("NnMmWwИиVvUuIli:.·-',~")
-YELLOW_ALLOWED = set("@#%*+=±‡-:.·',")
-BOX = 26          # large-path canvas
-GS = 22           # large-path glyph max dimension after resize
-SCANVAS, SBASE = 24, 18   # small-path canvas / baseline row
+if args.charset == "full":  # art drawn with any of these, in either hue
+    LARGE_CHARS += EXTRA_CHARS
+    BLUE_ALLOWED = BLUE_ALLOWED | set(EXTRA_CHARS)
+    YELLOW_ALLOWED = YELLOW_ALLOWED | set(EXTRA_CHARS)
+INK_T = 45.0      # max-channel luminance above this is ink
 CASE_H = 12.6     # ink height >= this => uppercase (same-shape pairs only)
-# Only pairs whose upper/lower forms share the same letterform get their case
-# decided by ink height; N/n, M/m etc. differ in shape, so the template wins.
-HEIGHT_PAIRS = {"w": "W", "W": "w", "и": "И", "И": "и", "v": "V", "V": "v",
-                "u": "U", "U": "u"}
-UPPER = set("NMWИVUI")
+ITALIC_MARGIN = 0.02
+MERGE_W = 15      # split pieces merge only while the joined span stays this narrow
+MIRROR_T = 0.10   # |mirror_feature| beyond this overrides the N/И template
+for item in args.set:
+    name, _, value = item.partition("=")
+    if name == "SOFT":  # lives in glyphbank: soft() also builds the templates
+        glyphbank.SOFT = tuple(float(v) for v in value.split(","))
+    elif name in ("INK_T", "CASE_H", "ITALIC_MARGIN", "MERGE_W", "MIRROR_T"):
+        globals()[name] = type(globals()[name])(value)
+    else:
+        ap.error(f"--set: unknown tunable {name!r}")
+S = args.preview
+glyphbank.set_scale(S)
+BOX, SCANVAS, SBASE = glyphbank.BOX, glyphbank.SCANVAS, glyphbank.SBASE
 
 
-def blur(x):
-    k = np.array([1.0, 2.0, 1.0]) / 4.0
-    for _ in range(2):
-        x = np.apply_along_axis(lambda r: np.convolve(r, k, mode="same"), 1, x)
-        x = np.apply_along_axis(lambda c: np.convolve(c, k, mode="same"), 0, x)
-    return x
+def px(v):
+    """A length in full-size source pixels, at the decoded scale."""
+    return v / S
 
 
-def soft(x):
-    return np.clip((x - 0.30) / 0.35, 0.0, 1.0)
+def ipx(v):
+    """px(v) as a whole number of pixels, at least 1."""
+    return max(1, int(round(v / S)))
 
 
-def norm_box(arr):
-    """ink array (float, any size) -> BOX x BOX normalized shape canvas"""
-    ys, xs = np.nonzero(arr > 0.12 * arr.max())
-    if len(ys) == 0:
-        return None
-    sub = arr[ys.min():ys.max() + 1, xs.min():xs.max() + 1]
-    h, w = sub.shape
-    s = GS / max(h, w)
-    tw, th = max(1, int(round(w * s))), max(1, int(round(h * s)))
-    im = Image.fromarray(np.clip(sub / sub.max() * 255, 0, 255).astype(np.uint8))
-    im = im.resize((tw, th), Image.BILINEAR)
-    a = np.zeros((BOX, BOX))
-    oy, ox = (BOX - th) // 2, (BOX - tw) // 2
-    a[oy:oy + th, ox:ox + tw] = np.asarray(im).astype(np.float64) / 255.0
-    return blur(soft(a))
-
-
-# ---------- LARGE templates (shape space) ----------
-# Rendered at ~the image's native glyph scale (font 21 => cap ~15px) so the
-# raster acquires the same blur profile the JPEG glyphs get when norm_box
-# upscales them; a crisp 44px render matches poorly against JPEG mush.
-large_tpl = []
-for fam, style, path, idx in FONTS:
-    font = ImageFont.truetype(path, 21, index=idx)
-    for ch in LARGE_CHARS:
-        im = Image.new("L", (48, 48), 0)
-        ImageDraw.Draw(im).text((12, 6), ch, font=font, fill=255)
-        arr = np.asarray(im).astype(np.float64)
-        if arr.max() <= 0:
-            continue
-        nb = norm_box(arr)
-        if nb is None:
-            continue
-        n = np.linalg.norm(nb)
-        large_tpl.append((ch, fam, style, nb / n))
-TL = np.stack([t[3].ravel() for t in large_tpl])
+def area(v):
+    """An area (pixel count) in full-size source pixels, at the decoded scale:
+    it shrinks by S on both axes, unlike px()."""
+    return v / (S * S)
 
-# ---------- SMALL templates (baseline space) ----------
-small_tpl = []
-for fam, style, path, idx in FONTS:
-    font = ImageFont.truetype(path, 22, index=idx)
-    asc, desc = font.getmetrics()
-    for ch in SMALL_CHARS:
-        im = Image.new("L", (SCANVAS * 2, SCANVAS * 2), 0)
-        ImageDraw.Draw(im).text((SCANVAS // 2, SBASE - asc), ch, font=font, fill=255)
-        arr = np.asarray(im).astype(np.float64)
-        if arr.max() == 0:
-            continue
-        ys, xs = np.nonzero(arr > 40)
-        w = arr[arr > 40]
-        cx = (xs * w).sum() / w.sum()
-        arr = np.roll(arr, int(round(SCANVAS / 2 - cx)), axis=1)[:SCANVAS, :SCANVAS]
-        a = blur(soft(arr / arr.max()))
-        n = np.linalg.norm(a)
-        if n == 0:
-            continue
-        small_tpl.append((ch, fam, style, a / n))
+
+# Only pairs whose upper/lower forms share the same letterform get their case
+# decided by ink height; N/n, M/m etc. differ in shape, so the template wins.
+HEIGHT_PAIRS = {"w": "W", "W": "w", "и": "И", "И": "и", "v": "V", "V": "v",
+                "u": "U", "U": "u"}
+UPPER = set("NMWИVUI")
+
+# ---------- templates (glyphbank.py) ----------
+large_tpl = large_templates(LARGE_CHARS, skip_missing=args.charset == "full")
+TL = np.stack([t[3].ravel() for t in large_tpl])
+small_tpl = small_templates(SMALL_CHARS)
 TS = np.stack([t[3].ravel() for t in small_tpl])
 print(f"{len(large_tpl)} large + {len(small_tpl)} small templates")
 
 # ---------- image / rows ----------
-img = Image.open(SRC).convert("RGB")
-rgb = np.asarray(img).astype(np.float64)
-lum = rgb.max(axis=2)
-mask = lum > 45.0
+def set_frame(im):
+    global rgb, lum, mask
+    px = np.asarray(im)
+    rgb = px.astype(np.float64)
+    # max channel: catches dim blue and dim yellow alike (elementwise on the
+    # bytes is many times faster than a max over the short last axis)
+    lum = np.maximum(np.maximum(px[..., 0], px[..., 1]), px[..., 2]).astype(np.float64)
+    mask = lum > INK_T
+
+
+def decode(im):
+    """The source at 1/S size: a JPEG is decoded straight to it (DCT scaling,
+    so most of the work is skipped), anything else is box-reduced."""
+    if S > 1:
+        size = (im.width // S, im.height // S)
+        im.draft("RGB", size)
+        if im.size != size:
+            im = im.reduce(S)
+    return im.convert("RGB")
+
+
+frame_iter = (decode(f) for f in frames(args.frames)) if args.frames else None
+if frame_iter:
+    img = next(frame_iter)
+elif S == 1 and globals().get("SOURCE") is not None:
+    img = SOURCE  # the draft, already decoded: tune.py's workers pass it via run_path(init_globals)
+else:
+    img = decode(Image.open(SRC))
+set_frame(img)
 
 rowsum = mask.sum(axis=1)
-inrow = rowsum > 2
-bands, start = [], None
-for y in range(len(inrow)):
-    if inrow[y] and start is None:
-        start = y
-    elif not inrow[y] and start is not None:
-        bands.append([start, y]); start = None
-if start is not None:
-    bands.append([start, len(inrow)])
+inrow = rowsum > px(2)
+bands = [[int(a), int(b)] for a, b in zip(*runs(inrow))]
 merged = []
 for b in bands:
-    if merged and b[0] - merged[-1][1] <= 2:
+    if merged and b[0] - merged[-1][1] <= px(2):
         merged[-1][1] = b[1]
     else:
         merged.append(list(b))
-full = [(i, b) for i, b in enumerate(merged) if b[1] - b[0] >= 12]
+full = [(i, b) for i, b in enumerate(merged) if b[1] - b[0] >= px(12)]
 idxs = np.array([i for i, _ in full], dtype=float)
 bottoms = np.array([b[1] for _, b in full], dtype=float)
 A = np.vstack([idxs, np.ones_like(idxs)]).T
@@ -144,59 +180,83 @@ A = np.vstack([idxs, np.ones_like(idxs)]).T
 
 def baseline_of(k):
     b0, b1 = merged[k]
-    return float(b1) if b1 - b0 >= 12 else float(y0 + py * k)
+    return float(b1) if b1 - b0 >= px(12) else float(y0 + py * k)
 
 
-def segment_row(k):
+def split_wide(k, x0r, x1r, prof):
+    """A run too wide for one glyph (JPEG-fused ink): cut it at the projection
+    minima nearest the expected pitch (moon vs wave letters, by color)."""
     b0, b1 = merged[k]
-    prof = mask[b0:b1, :].sum(axis=0).astype(float)
-    on = prof > 0
-    runs, s = [], None
-    for x in range(len(on)):
-        if on[x] and s is None:
-            s = x
-        elif not on[x] and s is not None:
-            runs.append([s, x]); s = None
-    if s is not None:
-        runs.append([s, len(on)])
+    w = x1r - x0r
+    m = mask[b0:b1, x0r:x1r]
+    c = rgb[b0:b1, x0r:x1r][m].mean(axis=0)
+    pitch = px(17.6) if c[0] > c[2] else px(13.0)
+    n = max(2, int(round(w / pitch)))
+    sm = blur(np.vstack([prof[x0r:x1r]] * 3))[1]
+    cuts = [0]
+    for i in range(1, n):
+        tgt = int(round(i * w / n))
+        lo, hi = max(cuts[-1] + ipx(4), tgt - ipx(5)), min(w - ipx(4), tgt + ipx(6))
+        if lo >= hi:
+            continue
+        cuts.append(lo + int(np.argmin(sm[lo:hi])))
+    cuts.append(w)
+    return [(x0r + a_, x0r + b_) for a_, b_ in zip(cuts, cuts[1:]) if b_ - a_ >= ipx(3)]
+
+
+def merge_spans(spans):
+    """Join x-spans that overlap, or that are split pieces of one glyph."""
     mg = []
-    for r in runs:
+    for x0, x1 in spans:
         # cap 15: an M(13) + thin I(3) must NOT merge; a split glyph still does
-        if mg and r[0] - mg[-1][1] <= 2 and (r[1] - mg[-1][0]) <= 15:
-            mg[-1][1] = r[1]
+        if mg and (x0 < mg[-1][1] or (x0 - mg[-1][1] <= px(2) and (x1 - mg[-1][0]) <= px(MERGE_W))):
+            mg[-1][1] = max(mg[-1][1], x1)
         else:
-            mg.append(list(r))
+            mg.append([x0, x1])
+    return mg
+
+
+def segment_row(k):
+    b0, b1 = merged[k]
+    prof = mask[b0:b1, :].sum(axis=0).astype(float)
     out = []
-    for x0r, x1r in mg:
-        w = x1r - x0r
-        if w <= 21:
-            out.append((x0r, x1r))
-            continue
-        m = mask[b0:b1, x0r:x1r]
-        c = rgb[b0:b1, x0r:x1r][m].mean(axis=0)
-        pitch = 17.6 if c[0] > c[2] else 13.0
-        n = max(2, int(round(w / pitch)))
-        sm = blur(np.vstack([prof[x0r:x1r]] * 3))[1]
-        cuts = [0]
-        for i in range(1, n):
-            tgt = int(round(i * w / n))
-            lo, hi = max(cuts[-1] + 4, tgt - 5), min(w - 4, tgt + 6)
-            if lo >= hi:
-                continue
-            cuts.append(lo + int(np.argmin(sm[lo:hi])))
-        cuts.append(w)
-        for a_, b_ in zip(cuts, cuts[1:]):
-            if b_ - a_ >= 3:
-                out.append((x0r + a_, x0r + b_))
+    for x0r, x1r in merge_spans(zip(*runs(prof > 0))):
+        if x1r - x0r <= px(21):
+            out.append((int(x0r), int(x1r)))
+        else:
+            out.extend(split_wide(k, int(x0r), int(x1r), prof))
     return out
 
 
-ITALIC_MARGIN = 0.02
+def segment_components(only=None):
+    """All bands at once from one labelling: each component goes to the band
+    holding its centroid (so descenders and stray glow from a neighbouring row
+    no longer spawn glyphs), then per band the component spans are merged like
+    projection runs, and only a single fused blob is cut by pitch. `only`:
+    the bands to return (all by default)."""
+    labels, n, cc = label(mask)
+    band_of = np.searchsorted([b[1] for b in merged], cc.cy, side="right")
+    inside = (band_of < len(merged))
+    inside[inside] = cc.cy[inside] >= np.array([merged[j][0] for j in band_of[inside]])
+    out = {k: [] for k in (range(len(merged)) if only is None else only)}
+    order = np.lexsort((cc.x0, band_of))
+    for k in out:
+        sel = order[(band_of[order] == k) & inside[order]]
+        b0, b1 = merged[k]
+        for x0r, x1r in merge_spans(zip(cc.x0[sel].tolist(), cc.x1[sel].tolist())):
+            if x1r - x0r <= px(21):
+                out[k].append((x0r, x1r))
+                continue
+            ids = sel[(cc.x0[sel] >= x0r) & (cc.x1[sel] <= x1r)] + 1
+            prof = np.isin(labels[b0:b1], ids).sum(axis=0).astype(float)
+            out[k].extend(split_wide(k, x0r, x1r, prof))
+    return out
+
 
 # diagonal-band masks over the BOX canvas, for N <-> И mirror discrimination
 _rr, _cc = np.mgrid[0:BOX, 0:BOX]
-D_MAIN = (np.abs(_rr - _cc) <= 3).astype(float)          # TL->BR ('N')
-D_ANTI = (np.abs(_rr + _cc - (BOX - 1)) <= 3).astype(float)  # BL->TR ('И')
+D_MAIN = (np.abs(_rr - _cc) <= ipx(3)).astype(float)          # TL->BR ('N')
+D_ANTI = (np.abs(_rr + _cc - (BOX - 1)) <= ipx(3)).astype(float)  # BL->TR ('И')
 
 
 def mirror_feature(q):
@@ -229,14 +289,102 @@ def bar_family(ch, m, w_box, h_box):
         return "‡"
     if peaks >= 2 and center < 0.75 and w_box >= 1.05 * h_box:
         return "="
-    if peaks == 1 and center >= 0.75 and (rp_s > 0.6 * rp_s.max()).sum() <= 4:
+    if peaks == 1 and center >= 0.75 and (rp_s > 0.6 * rp_s.max()).sum() <= px(4):
         return "+"
     return ch
 
 
-def match(T, tpl_list, q, allowed, shifts=(-1, 0, 1)):
-    """Best template among `allowed` chars; italic styles must beat the best
-    upright candidate by ITALIC_MARGIN to win (JPEG wobble fakes slant)."""
+def index_bank(T, tpl_list):
+    """Per-hue sub-banks of one size class (large or small templates): for
+    each hue, the contiguous sub-matrix of the templates its glyphs may match,
+    their indices in the full bank and which of them are upright. Original
+    order is kept, so argmax ties resolve exactly as in the full bank."""
+    index = {}
+    for hue, allowed in (("Y", YELLOW_ALLOWED), ("B", BLUE_ALLOWED)):
+        rows = np.array([j for j, t in enumerate(tpl_list) if t[0] in allowed])
+        up = np.flatnonzero(["italic" not in tpl_list[j][2] for j in rows])
+        index[hue] = (np.ascontiguousarray(T[rows]), rows, up)
+    return index
+
+
+LARGE_INDEX = index_bank(TL, large_tpl)
+SMALL_INDEX = index_bank(TS, small_tpl)
+for name, T, index in (("large", TL, LARGE_INDEX), ("small", TS, SMALL_INDEX)):
+    print(f"{name} index: " + ", ".join(f"{hue} {len(sub[1])}/{len(T)}" for hue, sub in index.items()))
+
+
+@functools.lru_cache(maxsize=None)
+def roll_index(shape, shifts, order):
+    """(shifts^2, h*w) gather indices into q.ravel(): row s is q rolled by the
+    s-th (dy, dx), flattened in C or F order."""
+    i = np.arange(shape[0] * shape[1]).reshape(shape)
+    return np.stack([np.roll(np.roll(i, dy, axis=0), dx, axis=1).ravel(order)
+                     for dy in shifts for dx in shifts])
+
+
+def shifted(q, shifts):
+    """The query canvas under every (dy, dx) shift, flattened and normalized.
+    One gather instead of two np.rolls per shift. Each norm is summed in q's
+    memory order (blur() leaves it Fortran-ordered), as the norm of a rolled
+    copy is, so the scores match the per-shift rolls bit for bit."""
+    shifts = tuple(shifts)
+    flat = q.ravel()
+    mem = "F" if q.flags.f_contiguous and not q.flags.c_contiguous else "C"
+    norms = [np.linalg.norm(x) for x in flat[roll_index(q.shape, shifts, mem)]]
+    return [qq / n for qq, n in zip(flat[roll_index(q.shape, shifts, "C")], norms) if n >= 1e-9]
+
+
+def match(sub, Q):
+    """Best template of a hue sub-bank (see index_bank) over the shifted
+    queries Q; italic styles must beat the best upright candidate by
+    ITALIC_MARGIN to win (JPEG wobble fakes slant). Returns (score, index in
+    the full bank). Scoring only the sub-bank is exact: match_brute gives
+    every other template -2, and a normalized correlation of ink images never
+    goes below 0."""
+    T, rows, up = sub
+    best = (-1.0, None)
+    best_up = (-1.0, None)
+    for v in Q:
+        sc = T @ v
+        j = int(np.argmax(sc))
+        if sc[j] > best[0]:
+            best = (float(sc[j]), j)
+        if len(up):
+            ju = int(up[np.argmax(sc[up])])
+            if sc[ju] > best_up[0]:
+                best_up = (float(sc[ju]), ju)
+    if best[1] is not None and best[1] not in up:
+        if best_up[1] is not None and best[0] - best_up[0] < ITALIC_MARGIN:
+            best = best_up
+    return best[0], (None if best[1] is None else int(rows[best[1]]))
+
+
+PCA_INDEX = {}  # (size class, hue) -> (CoarseIndex, upright mask), built on first use
+pca_stats = Counter()
+
+
+def match_pca(sub, key, Q):
+    """match() restricted to the prefilter's candidates: the top-k templates
+    per shifted query in the reduced space (plus the top-k upright ones, so
+    the italic-margin rule still has its reference), re-ranked exactly."""
+    T, rows, up = sub
+    if key not in PCA_INDEX:
+        upright = np.zeros(len(rows), dtype=bool)
+        upright[up] = True
+        PCA_INDEX[key] = CoarseIndex(T, dim=args.pca_dim), upright
+    pf, upright = PCA_INDEX[key]
+    if not Q:
+        return -1.0, None
+    cand = pf.candidates(np.array(Q), args.topk, args.nprobe, among=upright)
+    pca_stats["glyphs"] += 1
+    pca_stats["candidates"] += len(cand)
+    pca_stats["bank"] += len(rows)
+    score, j = match((T[cand], cand, np.flatnonzero(upright[cand])), Q)
+    return score, (None if j is None else int(rows[j]))
+
+
+def match_brute(T, tpl_list, q, allowed, shifts=(-1, 0, 1)):
+    """Reference matcher over the whole bank (--check-index)."""
     ok = np.array([t[0] in allowed for t in tpl_list])
     upright = np.array([("italic" not in t[2]) for t in tpl_list])
     best = (-1.0, None)
@@ -263,78 +411,229 @@ def match(T, tpl_list, q, allowed, shifts=(-1, 0, 1)):
     return best
 
 
-glyphs = []
-for k in range(len(merged)):
+classify_s = 0.0
+
+
+def classify(index, key, q, shifts=(-1, 0, 1)):
+    """(score, template index) with the selected matcher."""
+    global classify_s
+    t0 = time.perf_counter()
+    sub = index[key[1]]
+    Q = shifted(q, shifts)
+    if args.matcher == "exact":
+        got = match(sub, Q)
+    else:
+        got = match_pca(sub, key, Q)
+        if args.accuracy:  # same template as the exact matcher (scores may differ by an ulp)
+            pca_stats["same"] += got[1] == match(sub, Q)[1]
+    classify_s += time.perf_counter() - t0
+    return got
+
+
+def measure(k, x0r, x1r):
+    """What the span x0r..x1r of band k shows before any matching:
+    (ink mask, pixel count, ink colour, ink center, ink height, small-path
+    patch or None), or None if it holds no glyph."""
     b0, b1 = merged[k]
-    bl = baseline_of(k)
-    for (x0r, x1r) in segment_row(k):
-        m = mask[b0:b1, x0r:x1r]
-        npix = int(m.sum())
-        if npix < 4:
-            continue
-        col = np.percentile(rgb[b0:b1, x0r:x1r][m], 88, axis=0)  # vivid ink color
-        allowed = YELLOW_ALLOWED if col[0] > col[2] else BLUE_ALLOWED
-        prof = m.sum(axis=0).astype(float)
-        cx = x0r + (prof * np.arange(x1r - x0r)).sum() / prof.sum()
-        ys = np.nonzero(m.any(axis=1))[0]
-        h_ink = int(ys.max() - ys.min() + 1)
-        glyph_lum = lum[b0:b1, max(0, x0r - 1):x1r + 1].copy()
-        gm = mask[b0:b1, max(0, x0r - 1):x1r + 1]
-        glyph_lum[~gm] *= 0.35  # damp JPEG glow outside the mask
-        if h_ink >= 10:
-            q = norm_box(glyph_lum)
-            score, j = match(TL, large_tpl, q, allowed)
-            ch, fam, style, _ = large_tpl[j]
-            if ch in "NnИи":  # mirror check: diagonal orientation is decisive
-                f = mirror_feature(q)
-                if f > 0.10 and ch in "Nn":
-                    ch = "И" if h_ink >= CASE_H else "и"
-                elif f < -0.10 and ch in "Ии":
-                    ch = "N"
-            if ch in HEIGHT_PAIRS:  # same-shape pairs: case by ink height
-                want_upper = h_ink >= CASE_H
-                if (ch in UPPER) != want_upper:
-                    ch = HEIGHT_PAIRS[ch]
-            if col[0] > col[2] and ch in "*+=±‡" and h_ink <= 13:
-                ch = bar_family(ch, m, x1r - x0r, h_ink)
-            path = "L"
+    m = mask[b0:b1, x0r:x1r]
+    npix = int(m.sum())
+    if npix < area(4):
+        return None
+    col = np.percentile(rgb[b0:b1, x0r:x1r][m], 88, axis=0)  # vivid ink color
+    prof = m.sum(axis=0).astype(float)
+    cx = x0r + (prof * np.arange(x1r - x0r)).sum() / prof.sum()
+    ys = np.nonzero(m.any(axis=1))[0]
+    h_ink = int(ys.max() - ys.min() + 1)
+    patch = None
+    if h_ink < px(10):
+        top = int(round(baseline_of(k))) - SBASE
+        left = int(round(cx)) - SCANVAS // 2
+        patch = np.zeros((SCANVAS, SCANVAS))
+        ys0, ys1 = max(0, top), min(lum.shape[0], top + SCANVAS)
+        xs0, xs1 = max(0, left), min(lum.shape[1], left + SCANVAS)
+        patch[ys0 - top:ys1 - top, xs0 - left:xs1 - left] = lum[ys0:ys1, xs0:xs1]
+        gx0 = max(0, x0r - ipx(2) - left)
+        gx1 = min(SCANVAS, x1r + ipx(2) - left)
+        patch[:, :gx0] = 0
+        patch[:, gx1:] = 0
+        if patch.max() <= 0:
+            return None
+    return m, npix, col, cx, h_ink, patch
+
+
+def classify_glyph(k, x0r, x1r):
+    """Glyph dict for the span x0r..x1r of band k, or None if it holds no glyph."""
+    got = measure(k, x0r, x1r)
+    if got is None:
+        return None
+    m, npix, col, cx, h_ink, patch = got
+    b0, b1 = merged[k]
+    hue = "Y" if col[0] > col[2] else "B"
+    allowed = YELLOW_ALLOWED if hue == "Y" else BLUE_ALLOWED
+    glyph_lum = lum[b0:b1, max(0, x0r - 1):x1r + 1].copy()
+    gm = mask[b0:b1, max(0, x0r - 1):x1r + 1]
+    glyph_lum[~gm] *= 0.35  # damp JPEG glow outside the mask
+    if patch is None:
+        q = norm_box(glyph_lum)
+        score, j = classify(LARGE_INDEX, ("L", hue), q)
+        if args.check_index:
+            assert (score, j) == match_brute(TL, large_tpl, q, allowed), (k, x0r)
+        ch, fam, style, _ = large_tpl[j]
+        if ch in "NnИи":  # mirror check: diagonal orientation is decisive
+            f = mirror_feature(q)
+            if f > MIRROR_T and ch in "Nn":
+                ch = "И" if h_ink >= px(CASE_H) else "и"
+            elif f < -MIRROR_T and ch in "Ии":
+                ch = "N"
+        if ch in HEIGHT_PAIRS:  # same-shape pairs: case by ink height
+            want_upper = h_ink >= px(CASE_H)
+            if (ch in UPPER) != want_upper:
+                ch = HEIGHT_PAIRS[ch]
+        if col[0] > col[2] and ch in "*+=±‡" and h_ink <= px(13):
+            ch = bar_family(ch, m, x1r - x0r, h_ink)
+        path = "L"
+    else:
+        q = blur(soft(patch / patch.max()))
+        score, j = classify(SMALL_INDEX, ("S", hue), q, shifts=(-2, -1, 0, 1, 2))
+        if args.check_index:
+            assert (score, j) == match_brute(TS, small_tpl, q, allowed, shifts=(-2, -1, 0, 1, 2)), (k, x0r)
+        ch, fam, style, _ = small_tpl[j]
+        if col[0] > col[2] and ch in "*+=":
+            ch = bar_family(ch, m, x1r - x0r, h_ink)
+        path = "S"
+    return dict(row=k, cx=float(cx), x0=int(x0r), x1=int(x1r),
+                npix=npix, h=h_ink, path=path,
+                rgb=[round(float(v), 1) for v in col],
+                ch=ch, family=fam, style=style,
+                score=round(score, 4))
+
+
+def reads(k, x0r, x1r, cx=None):
+    """(rows, cols) of every pixel classify_glyph reads for this span: the band
+    plus the small path's baseline patch, the span plus its glow margin and
+    the patch around the ink center `cx` (anywhere in the span if unknown)."""
+    b0, b1 = merged[k]
+    top = int(round(baseline_of(k))) - SBASE
+    lo, hi = (x0r, x1r) if cx is None else (int(round(cx)), int(round(cx)))
+    return (slice(max(0, min(b0, top)), max(b1, top + SCANVAS)),
+            slice(max(0, min(x0r - ipx(2), lo - SCANVAS // 2)), max(x1r + ipx(2), hi + SCANVAS // 2)))
+
+
+def full_size(g):
+    """A glyph record in full-size source pixels (--preview works at 1/S)."""
+    if S == 1 or g is None:
+        return g
+    return dict(g, cx=g["cx"] * S, x0=g["x0"] * S, x1=g["x1"] * S, npix=g["npix"] * S * S, h=g["h"] * S)
+
+
+def emit(rec):
+    records.write(json.dumps(rec) + "\n")
+    records.flush()
+
+
+# running summary, so streaming never needs the whole glyph list
+n_glyphs, scores = 0, []
+hb, by_ch, by_style, by_col = Counter(), Counter(), Counter(), Counter()
+
+
+def tally(g):
+    global n_glyphs
+    n_glyphs += 1
+    scores.append(g["score"])
+    if g["rgb"][2] > g["rgb"][0] and g["h"] >= 9:
+        hb[g["h"]] += 1
+    by_ch[g["ch"]] += 1
+    by_style[(g["family"], g["style"])] += 1
+    by_col[("Y" if g["rgb"][0] > g["rgb"][2] else "B", g["ch"])] += 1
+
+
+def band_spans(only=None):
+    """Per band (of `only`, default all), the glyph spans of the current frame."""
+    if args.segment == "components":
+        return segment_components(only)
+    return {k: segment_row(k) for k in (range(len(merged)) if only is None else only)}
+
+
+header = dict(rows=len(merged), bands=[[b0 * S, b1 * S] for b0, b1 in merged],
+              baseline=[baseline_of(k) * S for k in range(len(merged))])
+glyphs = []
+if args.frames:
+    emit(dict(header, frames=True))
+    prev = {}        # band -> {(x0, x1): glyph or None}, as of the previous frame
+    prev_rgb = None
+    n_frames = n_classified = n_spans = 0
+    for i, frame in enumerate(itertools.chain([img], frame_iter)):
+        if i:
+            set_frame(frame)
+        n_frames += 1
+        if prev_rgb is None:
+            changed, touched = None, range(len(merged))
         else:
-            top = int(round(bl)) - SBASE
-            left = int(round(cx)) - SCANVAS // 2
-            patch = np.zeros((SCANVAS, SCANVAS))
-            ys0, ys1 = max(0, top), min(1024, top + SCANVAS)
-            xs0, xs1 = max(0, left), min(1024, left + SCANVAS)
-            patch[ys0 - top:ys1 - top, xs0 - left:xs1 - left] = lum[ys0:ys1, xs0:xs1]
-            gx0 = max(0, x0r - 2 - left)
-            gx1 = min(SCANVAS, x1r + 2 - left)
-            patch[:, :gx0] = 0
-            patch[:, gx1:] = 0
-            if patch.max() <= 0:
-                continue
-            q = blur(soft(patch / patch.max()))
-            score, j = match(TS, small_tpl, q, allowed, shifts=(-2, -1, 0, 1, 2))
-            ch, fam, style, _ = small_tpl[j]
-            if col[0] > col[2] and ch in "*+=":
-                ch = bar_family(ch, m, x1r - x0r, h_ink)
-            path = "S"
-        glyphs.append(dict(row=k, cx=float(cx), x0=int(x0r), x1=int(x1r),
-                           npix=npix, h=h_ink, path=path,
-                           rgb=[round(float(v), 1) for v in col],
-                           ch=ch, family=fam, style=style,
-                           score=round(score, 4)))
-
-print(f"{len(glyphs)} glyphs classified")
-hb = Counter(g["h"] for g in glyphs if g["rgb"][2] > g["rgb"][0] and g["h"] >= 9)
-print("blue tall-glyph ink-height histogram:", sorted(hb.items()))
-print("char histogram:", Counter(g["ch"] for g in glyphs).most_common())
-print("style histogram:", Counter((g["family"], g["style"]) for g in glyphs).most_common())
-by_col = Counter(("Y" if g["rgb"][0] > g["rgb"][2] else "B", g["ch"]) for g in glyphs)
-print("yellow chars:", [(c, n) for (col, c), n in by_col.most_common() if col == "Y"][:15])
-print("blue chars:  ", [(c, n) for (col, c), n in by_col.most_common() if col == "B"][:15])
-print("mean score:", round(float(np.mean([g["score"] for g in glyphs])), 4),
-      "| lowest 10:", sorted(round(g["score"], 3) for g in glyphs)[:10])
-with open(f"{OUT}/glyphs.json", "w") as f:
-    json.dump(dict(rows=len(merged), bands=merged,
-                   baseline=[baseline_of(k) for k in range(len(merged))],
-                   glyphs=glyphs), f)
-print("saved glyphs.json")
+            # every channel, not just lum: the ink colour picks the hue, and
+            # the hue the template set, so a recolour must re-classify
+            changed = (rgb != prev_rgb).any(axis=2)
+            hit_rows = np.concatenate(([0], np.cumsum(changed.any(axis=1))))
+            touched = [k for k in range(len(merged))
+                       if hit_rows[reads(k, 0, 0)[0].stop] > hit_rows[reads(k, 0, 0)[0].start]]
+        prev_rgb = rgb
+        spans = band_spans(touched) if len(touched) else {}
+        for k in touched:
+            old, cur, dirty = prev.get(k, {}), {}, False
+            if changed is not None:  # every span of a band reads the same rows
+                hit = np.concatenate(([0], np.cumsum(changed[reads(k, 0, 0)[0]].any(axis=0))))
+            for (x0r, x1r) in spans[k]:
+                if (x0r, x1r) in old:
+                    g = old[(x0r, x1r)]
+                    xs = reads(k, x0r, x1r, g and g["cx"])[1]
+                    if hit[min(xs.stop, len(hit) - 1)] == hit[xs.start]:
+                        cur[(x0r, x1r)] = g
+                        continue
+                cur[(x0r, x1r)] = classify_glyph(k, x0r, x1r)
+                n_classified += 1
+                dirty = True
+            prev[k] = cur
+            if dirty or cur.keys() != old.keys():
+                emit(dict(frame=i, row=k, glyphs=[full_size(g) for g in cur.values() if g is not None]))
+        n_spans += sum(len(v) for v in prev.values())
+        emit(dict(frame=i, done=True))
+    print(f"{n_frames} frames: classified {n_classified} of {n_spans} glyph spans "
+          f"({100 * n_classified / max(1, n_spans):.1f}%), the rest reused")
+else:
+    spans = band_spans()
+    if args.stream:
+        # every glyph's ink center and colour are known before any matching, so
+        # step5 can fit its grid and palette up front and lay out bands on arrival
+        ink = [[float(g[3]) * S] + [round(float(v), 1) for v in g[2]]
+               for k in range(len(merged)) for g in (measure(k, *sp) for sp in spans[k]) if g is not None]
+        emit(dict(header, ink=ink))
+    for k in range(len(merged)):
+        band = [full_size(g) for g in (classify_glyph(k, x0r, x1r) for (x0r, x1r) in spans[k]) if g is not None]
+        for g in band:
+            tally(g)
+        if args.stream:
+            emit(dict(row=k, glyphs=band))
+        else:
+            glyphs.extend(band)
+
+    print(f"{n_glyphs} glyphs classified")
+    if args.matcher == "pca":
+        print(f"pca matcher: {pca_stats['candidates'] / pca_stats['glyphs']:.1f} of "
+              f"{pca_stats['bank'] / pca_stats['glyphs']:.1f} templates re-ranked exactly per glyph")
+        if args.accuracy:
+            print(f"pca matcher: {pca_stats['same']}/{pca_stats['glyphs']} glyphs match the exact matcher "
+                  f"({100 * pca_stats['same'] / pca_stats['glyphs']:.2f}%)")
+    print("blue tall-glyph ink-height histogram:", sorted(hb.items()))
+    print("char histogram:", by_ch.most_common())
+    print("style histogram:", by_style.most_common())
+    print("yellow chars:", [(c, n) for (col, c), n in by_col.most_common() if col == "Y"][:15])
+    print("blue chars:  ", [(c, n) for (col, c), n in by_col.most_common() if col == "B"][:15])
+    print("mean score:", round(float(np.mean(scores)), 4),
+          "| lowest 10:", sorted(round(s, 3) for s in scores)[:10])
+print(f"classify: {classify_s:.2f}s")
+if args.stream:
+    if args.stream != "-":
+        records.close()
+else:
+    with open(f"{OUT}/glyphs.json", "w") as f:
+        json.dump(dict(header, glyphs=glyphs), f)
+    print("saved glyphs.json")
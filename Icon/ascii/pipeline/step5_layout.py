@@ -1,76 +1,102 @@
 """Step 5: re-typeset glyphs onto a true monospace grid; quantize colors;
-render reconstruction next to the original for visual verification."""
+render reconstruction next to the original for visual verification.
+Reads glyphs.json, or with --stream PATH ('-' = stdin) step4's per-band
+records as they arrive:
+    python3 step4_extract.py --stream - | python3 step5_layout.py --stream -
+The grid fit and palette need every glyph's ink center and colour, which
+step4's header carries (measured before matching), so they are fitted
+before the first band and each band is laid out as it arrives; only the
+laid-out rows are kept. --rows-out writes each row as soon as it is laid out."""
 import os
 HERE = os.path.dirname(os.path.abspath(__file__))
 ROOT = os.path.dirname(HERE)          # Icon/ascii — deliverables live here
 BUILD = os.path.join(HERE, "build")   # intermediates (gitignored)
 os.makedirs(BUILD, exist_ok=True)
+import argparse
 import json
+import sys
 import numpy as np
 from PIL import Image, ImageDraw, ImageFont
+from grid import Grid
 
 OUT = BUILD
 SRC = os.path.join(ROOT, "monodreams-ascii-draft.jpeg")
 
-data = json.load(open(f"{OUT}/glyphs.json"))
-glyphs = data["glyphs"]
-NROWS = data["rows"]
-
-# ---- grid: pitch/phase from yellow glyph centers (the well-gridded moon) ----
-yc = np.array([g["cx"] for g in glyphs if g["rgb"][0] > g["rgb"][2]])
-best = (0, None, None)
-for px in np.arange(17.3, 18.01, 0.005):
-    ang = np.mod(yc, px) / px * 2 * np.pi
-    mx, my = np.cos(ang).mean(), np.sin(ang).mean()
-    R = np.hypot(mx, my)
-    if R > best[0]:
-        ph = np.arctan2(my, mx) % (2 * np.pi) / (2 * np.pi) * px
-        best = (R, px, ph)
-R, PX, PHASE = best
-print(f"moon grid: pitch={PX:.3f} phase={PHASE:.2f} R={R:.3f}")
-X0 = PHASE
-while X0 - PX > 0:
-    X0 -= PX
-cols_needed = int(np.ceil((1024 - X0) / PX))
-print("X0:", round(X0, 2), "cols:", cols_needed)
-NCOLS = cols_needed
-
-# ---- color quantization: brightness tiers per hue family ----
-for g in glyphs:
-    g["hue"] = "Y" if g["rgb"][0] > g["rgb"][2] else "B"
-    g["bri"] = max(g["rgb"])
-palette = {}   # code -> rgb
-codes = {}
-for hue in ("Y", "B"):
-    gs = [g for g in glyphs if g["hue"] == hue]
-    bri = np.array([g["bri"] for g in gs])
-    t1, t2 = np.percentile(bri, 33), np.percentile(bri, 66)
-    for g in gs:
-        tier = 0 if g["bri"] < t1 else (1 if g["bri"] < t2 else 2)
-        g["tier"] = tier
-    for tier in (0, 1, 2):
-        sel = np.array([g["rgb"] for g in gs if g["tier"] == tier])
-        # single-char codes: y/Y/G = dim/mid/bright gold, b/B/A = dim/mid/bright azure
-        code = {0: hue.lower(), 1: hue, 2: ("G" if hue == "Y" else "A")}[tier]
-        palette[code] = [int(v) for v in np.median(sel, axis=0)]
-        for g in gs:
-            if g["tier"] == tier:
-                g["colcode"] = code
-print("palette:", palette)
+ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+ap.add_argument("--stream", metavar="PATH",
+                help="read step4 --stream records from PATH ('-' = stdin) instead of glyphs.json")
+ap.add_argument("--rows-out", metavar="PATH",
+                help="--stream: write each laid-out row to PATH ('-' = stdout) as its band arrives")
+ap.add_argument("--frames-out", metavar="PATH", default=f"{OUT}/frames.ndjson",
+                help="animated (step4 --frames) input: per-frame grid documents go here")
+ap.add_argument("--out", metavar="DIR", default=OUT,
+                help="directory for glyphs.json input and all outputs (default: build/)")
+args = ap.parse_args()
+OUT = args.out
+rows_out = None
+if args.rows_out == "-":  # rows own stdout; diagnostics go to stderr
+    rows_out, sys.stdout = sys.stdout, sys.stderr
+elif args.rows_out:
+    rows_out = open(args.rows_out, "w")
 
 STYLES = ["regular", "bold", "italic", "bold-italic"]
 SCODE = {"regular": "r", "bold": "b", "italic": "i", "bold-italic": "x"}
+# single-char codes: y/Y/G = dim/mid/bright gold, b/B/A = dim/mid/bright azure
+TIER_CODES = {"Y": "yYG", "B": "bBA"}
 
-# ---- per-row layout with duplicate-preferred drops ----
-grid_ch = [[" "] * NCOLS for _ in range(NROWS)]
-grid_col = [[" "] * NCOLS for _ in range(NROWS)]
-grid_sty = [[" "] * NCOLS for _ in range(NROWS)]
-dropped = []
-for k in range(NROWS):
-    row = sorted((g for g in glyphs if g["row"] == k), key=lambda g: g["cx"])
+
+def fit_grid(glyphs):
+    """Pitch/phase from yellow glyph centers (the well-gridded moon) -> (PX, X0, NCOLS)."""
+    yc = np.array([g["cx"] for g in glyphs if g["rgb"][0] > g["rgb"][2]])
+    best = (0, None, None)
+    for px in np.arange(17.3, 18.01, 0.005):
+        ang = np.mod(yc, px) / px * 2 * np.pi
+        mx, my = np.cos(ang).mean(), np.sin(ang).mean()
+        R = np.hypot(mx, my)
+        if R > best[0]:
+            ph = np.arctan2(my, mx) % (2 * np.pi) / (2 * np.pi) * px
+            best = (R, px, ph)
+    R, PX, PHASE = best
+    print(f"moon grid: pitch={PX:.3f} phase={PHASE:.2f} R={R:.3f}")
+    X0 = PHASE
+    while X0 - PX > 0:
+        X0 -= PX
+    cols_needed = int(np.ceil((1024 - X0) / PX))
+    print("X0:", round(X0, 2), "cols:", cols_needed)
+    return PX, X0, cols_needed
+
+
+def colcode(g, cuts):
+    """Brightness tier of a glyph within its hue family, as a palette code."""
+    hue = "Y" if g["rgb"][0] > g["rgb"][2] else "B"
+    t1, t2 = cuts[hue]
+    bri = max(g["rgb"])
+    return TIER_CODES[hue][0 if bri < t1 else (1 if bri < t2 else 2)]
+
+
+def fit_palette(glyphs):
+    """Color quantization: brightness tiers per hue family (tercile cuts), each
+    tier's median color. Sets g["colcode"]; returns (palette, cuts)."""
+    cuts = {}
+    for hue in ("Y", "B"):
+        bri = np.array([max(g["rgb"]) for g in glyphs if (g["rgb"][0] > g["rgb"][2]) == (hue == "Y")])
+        cuts[hue] = (np.percentile(bri, 33), np.percentile(bri, 66))
+    for g in glyphs:
+        g["colcode"] = colcode(g, cuts)
+    palette = {}   # code -> rgb
+    for hue in ("Y", "B"):
+        for code in TIER_CODES[hue]:
+            sel = np.array([g["rgb"] for g in glyphs if g["colcode"] == code])
+            palette[code] = [int(v) for v in np.median(sel, axis=0)]
+    return palette, cuts
+
+
+def layout_row(k, row_glyphs):
+    """Per-row layout with duplicate-preferred drops -> (chars, colors, styles, dropped)."""
+    chs, cols, stys, dropped = [" "] * NCOLS, [" "] * NCOLS, [" "] * NCOLS, []
     last = -1
     last_ch = None
-    for g in row:
+    for g in sorted(row_glyphs, key=lambda g: g["cx"]):
         exact = (g["cx"] - X0) / PX
         target = int(round(exact))
         col = max(target, last + 1)
@@ -79,20 +105,96 @@ for k in range(NROWS):
             if g["ch"] == last_ch or err > 2.4 or col >= NCOLS:
                 dropped.append((k, g["ch"], round(err, 2)))
                 continue
-        grid_ch[k][col] = g["ch"]
-        grid_col[k][col] = g["colcode"]
-        grid_sty[k][col] = SCODE[g["style"]]
+        chs[col] = g["ch"]
+        cols[col] = g["colcode"]
+        stys[col] = SCODE[g["style"]]
         last, last_ch = col, g["ch"]
-print(f"dropped {len(dropped)} of {len(glyphs)} glyphs:",
+    return chs, cols, stys, dropped
+
+
+def emit(rec):
+    rows_out.write(json.dumps(rec, ensure_ascii=False) + "\n")
+    rows_out.flush()
+
+
+if args.stream:
+    src = sys.stdin if args.stream == "-" else open(args.stream)
+    data = json.loads(src.readline())  # header: rows, bands, baseline, ink
+    NROWS = data["rows"]
+    if data.get("frames"):
+        by_row = [[] for _ in range(NROWS)]
+        # animated: grid and palette fitted on frame 0, then only the bands
+        # step4 re-sent are re-laid out; one grid document per frame
+        out = open(args.frames_out, "w")
+        grid = cuts = None
+        changed = set()
+        n_frames = 0
+        for line in src:
+            rec = json.loads(line)
+            if "row" in rec:
+                by_row[rec["row"]] = rec["glyphs"]
+                changed.add(rec["row"])
+                continue
+            if grid is None:  # end of frame 0
+                PX, X0, NCOLS = fit_grid([g for row in by_row for g in row])
+                palette, cuts = fit_palette([g for row in by_row for g in row])
+                # bands step4 never sent (no spans in frame 0) start blank
+                grid = [["".join(r) for r in layout_row(k, [])[:3]] for k in range(NROWS)]
+            for k in sorted(changed):
+                for g in by_row[k]:
+                    g["colcode"] = colcode(g, cuts)
+                grid[k] = ["".join(r) for r in layout_row(k, by_row[k])[:3]]
+            out.write(json.dumps(dict(frame=rec["frame"], rows=NROWS, cols=NCOLS, palette=palette,
+                                      chars=[r[0] for r in grid], colors=[r[1] for r in grid],
+                                      styles=[r[2] for r in grid], changed=sorted(changed)),
+                                 ensure_ascii=False) + "\n")
+            changed = set()
+            n_frames += 1
+        out.close()
+        print(f"{n_frames} frame grids written to {args.frames_out}")
+        raise SystemExit
+    ink = [dict(cx=cx, rgb=rgb) for cx, *rgb in data["ink"]]
+    PX, X0, NCOLS = fit_grid(ink)
+    palette, cuts = fit_palette(ink)
+    print("palette:", palette)
+    n_glyphs = len(ink)
+    # bands step4 sends no record for (no glyphs) stay blank
+    laid, dropped = [layout_row(k, [])[:3] for k in range(NROWS)], []
+    if rows_out:
+        emit(dict(rows=NROWS, cols=NCOLS, palette=palette))
+    for line in src:  # one record per band, in row order, as step4 finishes it
+        rec = json.loads(line)
+        k = rec["row"]
+        for g in rec["glyphs"]:
+            g["colcode"] = colcode(g, cuts)
+        chs, cols, stys, drop = layout_row(k, rec["glyphs"])
+        laid[k] = chs, cols, stys
+        dropped += drop
+        if rows_out:
+            emit(dict(row=k, chars="".join(chs), colors="".join(cols), styles="".join(stys)))
+else:
+    data = json.load(open(f"{OUT}/glyphs.json"))
+    NROWS = data["rows"]
+    glyphs = data["glyphs"]
+    by_row = [[] for _ in range(NROWS)]
+    for g in glyphs:
+        by_row[g["row"]].append(g)
+    PX, X0, NCOLS = fit_grid(glyphs)
+    palette, cuts = fit_palette(glyphs)
+    print("palette:", palette)
+    n_glyphs = len(glyphs)
+    laid, dropped = [], []
+    for k in range(NROWS):
+        chs, cols, stys, drop = layout_row(k, by_row[k])
+        laid.append((chs, cols, stys))
+        dropped += drop
+grid = Grid.from_cells(*zip(*laid), cols=NCOLS, palette=palette)
+print(f"dropped {len(dropped)} of {n_glyphs} glyphs:",
       dropped[:20], "..." if len(dropped) > 20 else "")
 
-txt = "\n".join("".join(r).rstrip() for r in grid_ch)
+txt = "\n".join(grid.text_rows(strip=True))
 open(f"{OUT}/moon_waves.txt", "w").write(txt + "\n")
-json.dump(dict(rows=NROWS, cols=NCOLS, palette=palette,
-               chars=["".join(r) for r in grid_ch],
-               colors=["".join(r) for r in grid_col],
-               styles=["".join(r) for r in grid_sty]),
-          open(f"{OUT}/moon_waves.json", "w"), ensure_ascii=False, indent=1)
+json.dump(grid.to_doc(), open(f"{OUT}/moon_waves.json", "w"), ensure_ascii=False, indent=1)
 print("saved moon_waves.txt / .json")
 print(txt)
 
@@ -107,16 +209,12 @@ for code, (path, idx) in {"r": ("/System/Library/Fonts/Menlo.ttc", 0),
                           "x": ("/System/Library/Fonts/Menlo.ttc", 3)}.items():
     fonts[code] = ImageFont.truetype(path, 19, index=idx)
 baselines = data["baseline"]
-for k in range(NROWS):
-    for c in range(NCOLS):
-        ch = grid_ch[k][c]
-        if ch == " ":
-            continue
-        colr = tuple(palette[grid_col[k][c]])
-        f = fonts[grid_sty[k][c]]
-        x = X0 + c * PX + PX / 2
-        y = baselines[k]
-        d.text((x, y), ch, font=f, fill=colr, anchor="ms")
+for k, c in grid.occupied().tolist():
+    colr = tuple(palette[chr(grid.code[k, c])])
+    f = fonts[chr(grid.sty[k, c])]
+    x = X0 + c * PX + PX / 2
+    y = baselines[k]
+    d.text((x, y), chr(grid.ch[k, c]), font=f, fill=colr, anchor="ms")
 img.save(f"{OUT}/reconstruction.png")
 
 orig = Image.open(SRC).convert("RGB")
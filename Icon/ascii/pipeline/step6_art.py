@@ -3,26 +3,49 @@
 Waves get a flowing water treatment (sinusoidal ripple, depth falloff, crest
 highlights); the moon gets a radial glow with soft gaussian 'craters' (color
 only, plus a handful of @->% swaps in crater cores). No hard lines anywhere.
+
+--watch: after the full run, keep the graded grid and the PNG layers in memory
+and poll this file; edits to the tunables (craters, WATER, MOON, CRATER_TINT,
+HALO, TIER_L, RIPPLE) regrade only the cells they affect, rewrite only the
+output files whose contents changed and redraw only the dirty cell rectangles
+of the PNG
+(preview: build/art_render.png; ../moon-waves.png is written on Ctrl-C).
+Code edits need a restart.
 """
 import os
 HERE = os.path.dirname(os.path.abspath(__file__))
 ROOT = os.path.dirname(HERE)          # Icon/ascii — deliverables live here
 BUILD = os.path.join(HERE, "build")   # intermediates (gitignored)
 os.makedirs(BUILD, exist_ok=True)
+import argparse
+import ast
 import json
 import math
 import os
+import time
+import numpy as np
 from PIL import Image, ImageDraw, ImageFont, ImageFilter, ImageChops
+from grid import Grid
+from svgexport import to_svg
 
 SCRATCH = BUILD
 OUTDIR = ROOT
 
-
-data = json.load(open(f"{SCRATCH}/moon_waves.json"))
-NROWS, NCOLS = data["rows"], data["cols"]
-chars = [list(r.ljust(NCOLS)) for r in data["chars"]]
-colcodes = [list(r.ljust(NCOLS)) for r in data["colors"]]
-stycodes = [list(r.ljust(NCOLS)) for r in data["styles"]]
+ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+ap.add_argument("--watch", action="store_true",
+                help="stay running; regrade/re-render incrementally when the tunables change")
+ap.add_argument("--out", metavar="DIR",
+                help="read moon_waves.json from and write every output to DIR (default: build/ in, ../ out)")
+args = ap.parse_args()
+if args.out:
+    SCRATCH = OUTDIR = args.out
+
+src = Grid.from_doc(json.load(open(f"{SCRATCH}/moon_waves.json")))
+NROWS, NCOLS = src.shape
+base = [list(r) for r in src.text_rows()]   # extracted chars, before crater swaps
+chars = [row[:] for row in base]
+colcodes = [list(r) for r in src.code_rows()]
+stycodes = [list(r) for r in src.style_rows()]
 
 def lerp(a, b, t):
     return tuple(int(round(a[i] + (b[i] - a[i]) * t)) for i in range(3))
@@ -40,11 +63,13 @@ WATER = [(10, 28, 64), (24, 66, 132), (52, 116, 196), (98, 172, 238), (150, 214,
 MOON = [(146, 98, 22), (196, 146, 40), (230, 186, 62), (248, 216, 100)]
 CRATER_TINT = (198, 142, 54)
 HALO = [(96, 74, 26), (140, 108, 36), (176, 138, 46)]
+RIPPLE = (0.52, 0.85, 1.6, 0.33, 0.07)  # wave: col freq, row freq, warp amount, warp row/col freq
 
 LETTERS = set("NnMmWwИиVvUuIli")
 
 # ---- moon geometry from '@#%' cells ----
-moon_cells = [(r, c) for r in range(NROWS) for c in range(NCOLS) if chars[r][c] in "@#%"]
+MOON_MASK = np.isin(src.ch, [ord(ch) for ch in "@#%"])
+moon_cells = [tuple(rc) for rc in np.argwhere(MOON_MASK).tolist()]
 rs = [r for r, _ in moon_cells]
 cs = [c for _, c in moon_cells]
 r0m, r1m, c0m, c1m = min(rs), max(rs), min(cs), max(cs)
@@ -67,15 +92,12 @@ def crater_k(r, c):
     return min(1.0, k)
 
 
-def hue_of(r, c):
-    code = colcodes[r][c]
-    if code == " " or chars[r][c] == " ":
-        return None
-    return "Y" if code in "yYG" else "B"
-
-
-hues = [[hue_of(r, c) for c in range(NCOLS)] for r in range(NROWS)]
-brows = [r for r in range(NROWS) if any(h == "B" for h in hues[r])]
+# hue family per cell: gold (Y) by palette code, azure (B) otherwise; None if blank
+HUE_Y = src.ink & (src.ch != ord(" ")) & np.isin(src.code, list(b"yYG"))
+HUE_B = src.ink & (src.ch != ord(" ")) & ~HUE_Y
+hues = np.where(HUE_Y, "Y", np.where(HUE_B, "B", "")).tolist()
+hues = [[h or None for h in row] for row in hues]
+brows = np.flatnonzero(HUE_B.any(axis=1)).tolist()
 br0, br1 = (min(brows), max(brows)) if brows else (0, 1)
 
 moon_center = ((r0m + r1m) / 2, (c0m + c1m) / 2)
@@ -89,128 +111,279 @@ def tier_l(r, c):
     return TIER_L.get(code, 0.62)
 
 
+def grade(r, c):
+    """-> (char, '#rrggbb') of a graded cell under the current tunables."""
+    h = hues[r][c]
+    ch = base[r][c]
+    if h is None:
+        return ch, ""
+    t0 = tier_l(r, c)
+    if h == "B":
+        kc, kr, warp, wr, wc = RIPPLE
+        depth = (r - br0) / max(1, br1 - br0)
+        ripple = 0.5 + 0.5 * math.sin(c * AS * kc + r * kr + warp * math.sin(r * wr + c * wc))
+        L = 0.18 + 0.50 * t0 + 0.16 * ripple - 0.10 * depth
+        above_empty = r == 0 or base[r - 1][c] == " "
+        if above_empty and ch in LETTERS:
+            L += 0.22  # crest highlight
+        if ch not in LETTERS:
+            L += 0.06  # spray/foam dots shimmer a bit
+        rgb = ramp(WATER, L)
+    else:
+        d = math.hypot(r - moon_center[0], (c - moon_center[1]) * AS) / rmax
+        if ch in "@#%":
+            L = (1.0 - 0.38 * d ** 1.5)
+            L *= 0.75 + 0.25 * t0
+            k = crater_k(r, c)
+            mottle = 0.5 + 0.5 * math.sin(0.9 * c * AS + 0.4 * r) * math.sin(0.5 * r - 0.25 * c * AS + 1.3)
+            L *= (1.0 - 0.15 * k) * (0.96 + 0.06 * mottle)
+            rgb = ramp(MOON, L)
+            if k > 0.02:
+                rgb = lerp(rgb, CRATER_TINT, 0.30 * k)
+            if ch == "@" and k > 0.62 and (r + 2 * c) % 3 == 0:
+                ch = "%"
+        else:
+            # halo / gradient edge marks: dim gold by tier + distance
+            L = 0.25 + 0.5 * t0 - 0.15 * max(0.0, d - 1.0)
+            rgb = ramp(HALO, L)
+    return ch, "#%02x%02x%02x" % rgb
+
+
 cellcolor = [["" for _ in range(NCOLS)] for _ in range(NROWS)]
 swaps = 0
 for r in range(NROWS):
     for c in range(NCOLS):
-        h = hues[r][c]
-        if h is None:
-            continue
-        ch = chars[r][c]
-        t0 = tier_l(r, c)
-        if h == "B":
-            depth = (r - br0) / max(1, br1 - br0)
-            ripple = 0.5 + 0.5 * math.sin(c * AS * 0.52 + r * 0.85 + 1.6 * math.sin(r * 0.33 + c * 0.07))
-            L = 0.18 + 0.50 * t0 + 0.16 * ripple - 0.10 * depth
-            above_empty = r == 0 or chars[r - 1][c] == " "
-            if above_empty and ch in LETTERS:
-                L += 0.22  # crest highlight
-            if ch not in LETTERS:
-                L += 0.06  # spray/foam dots shimmer a bit
-            rgb = ramp(WATER, L)
-        else:
-            d = math.hypot(r - moon_center[0], (c - moon_center[1]) * AS) / rmax
-            if ch in "@#%":
-                L = (1.0 - 0.38 * d ** 1.5)
-                L *= 0.75 + 0.25 * t0
-                k = crater_k(r, c)
-                mottle = 0.5 + 0.5 * math.sin(0.9 * c * AS + 0.4 * r) * math.sin(0.5 * r - 0.25 * c * AS + 1.3)
-                L *= (1.0 - 0.15 * k) * (0.96 + 0.06 * mottle)
-                rgb = ramp(MOON, L)
-                if k > 0.02:
-                    rgb = lerp(rgb, CRATER_TINT, 0.30 * k)
-                if ch == "@" and k > 0.62 and (r + 2 * c) % 3 == 0:
-                    chars[r][c] = "%"
-                    swaps += 1
-            else:
-                # halo / gradient edge marks: dim gold by tier + distance
-                L = 0.25 + 0.5 * t0 - 0.15 * max(0.0, d - 1.0)
-                rgb = ramp(HALO, L)
-        cellcolor[r][c] = "#%02x%02x%02x" % rgb
+        chars[r][c], cellcolor[r][c] = grade(r, c)
+        swaps += chars[r][c] != base[r][c]
 print(f"crater @->% swaps: {swaps}")
 
 # ---------- deliverable 1: plain txt ----------
-txt = "\n".join("".join(row).rstrip() for row in chars)
-open(f"{OUTDIR}/moon-waves.txt", "w").write(txt + "\n")
+def txt_row(r):
+    return "".join(chars[r]).rstrip()
 
-# ---------- deliverable 2: json source of truth ----------
-doc = dict(
-    title="MonoDreams — waves & waning moon (ASCII, extracted + art-graded)",
-    generator="claude-code glyph extraction pipeline",
-    rows=NROWS, cols=NCOLS,
-    cell_aspect=AS,
-    background="#000000",
-    chars=["".join(r).rstrip() for r in chars],
-    styles=[("".join(r)).rstrip() for r in (stycodes)],
-    style_key={"r": "regular", "b": "bold", "i": "italic", "x": "bold-italic", " ": "empty"},
-    colors=[[cellcolor[r][c] for c in range(NCOLS)] for r in range(NROWS)],
-)
-json.dump(doc, open(f"{OUTDIR}/moon-waves.json", "w"), ensure_ascii=False)
 
-# ---------- deliverable 3: ANSI file + python renderer ----------
-def ansi_lines():
-    lines = []
-    for r in range(NROWS):
-        out, cur = [], None
-        rowtxt = chars[r]
-        for c in range(NCOLS):
-            ch = rowtxt[c]
-            if ch == " ":
-                if cur is not None:
-                    out.append("\x1b[0m"); cur = None
-                out.append(" ")
-                continue
-            hexc = cellcolor[r][c] or "#888888"
-            sty = stycodes[r][c]
-            key = (hexc, sty)
-            if key != cur:
-                rr, gg, bb = int(hexc[1:3], 16), int(hexc[3:5], 16), int(hexc[5:7], 16)
-                sgr = {"b": "1;", "i": "3;", "x": "1;3;"}.get(sty, "")
-                out.append(f"\x1b[0;{sgr}38;2;{rr};{gg};{bb}m")
-                cur = key
-            out.append(ch)
-        out.append("\x1b[0m")
-        lines.append("".join(out).rstrip())
-    return lines
+written = {}  # path -> text last written by this process
 
 
-open(f"{OUTDIR}/moon-waves.ans", "w").write("\n".join(ansi_lines()) + "\n")
+def save(path, text):
+    """Write `text` to `path` unless this run already wrote exactly that."""
+    if written.get(path) != text:
+        open(path, "w").write(text)
+        written[path] = text
 
-renderer = '''#!/usr/bin/env python3
-"""Render moon-waves.json as truecolor ANSI in a terminal.
 
-Usage: python3 render_terminal.py [path/to/moon-waves.json]
-"""
-import json, os, sys
+# ---------- deliverable 2: json source of truth ----------
+def write_json():
+    cells = Grid.from_cells(chars, cellcolor, stycodes, NCOLS).planes()
+    doc = dict(
+        title="MonoDreams — waves & waning moon (ASCII, extracted + art-graded)",
+        generator="claude-code glyph extraction pipeline",
+        rows=NROWS, cols=NCOLS,
+        cell_aspect=AS,
+        background="#000000",
+        chars=cells["chars"],
+        styles=cells["styles"],
+        style_key={"r": "regular", "b": "bold", "i": "italic", "x": "bold-italic", " ": "empty"},
+        colors=cells["colors"],
+    )
+    save(f"{OUTDIR}/moon-waves.json", json.dumps(doc, ensure_ascii=False))
+    return doc
 
-path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(__file__), "moon-waves.json")
-doc = json.load(open(path))
-SGR = {"b": "1;", "i": "3;", "x": "1;3;"}
-for r, row in enumerate(doc["chars"]):
+
+# ---------- deliverable 3: ANSI file + python renderer ----------
+def ansi_row(r):
     out, cur = [], None
-    styles = doc["styles"][r] if r < len(doc["styles"]) else ""
-    colors = doc["colors"][r]
-    for c, ch in enumerate(row):
+    rowtxt = chars[r]
+    for c in range(NCOLS):
+        ch = rowtxt[c]
         if ch == " ":
             if cur is not None:
-                out.append("\\x1b[0m"); cur = None
+                out.append("\x1b[0m"); cur = None
             out.append(" ")
             continue
-        hexc = colors[c] if c < len(colors) and colors[c] else "#888888"
-        sty = styles[c] if c < len(styles) else "r"
-        if (hexc, sty) != cur:
+        hexc = cellcolor[r][c] or "#888888"
+        sty = stycodes[r][c]
+        key = (hexc, sty)
+        if key != cur:
             rr, gg, bb = int(hexc[1:3], 16), int(hexc[3:5], 16), int(hexc[5:7], 16)
-            out.append("\\x1b[0;%s38;2;%d;%d;%dm" % (SGR.get(sty, ""), rr, gg, bb))
-            cur = (hexc, sty)
+            sgr = {"b": "1;", "i": "3;", "x": "1;3;"}.get(sty, "")
+            out.append(f"\x1b[0;{sgr}38;2;{rr};{gg};{bb}m")
+            cur = key
         out.append(ch)
+    out.append("\x1b[0m")
+    return "".join(out).rstrip()
+
+
+renderer = '''#!/usr/bin/env python3
+"""Render moon-waves.json as truecolor ANSI in a terminal.
+
+Usage: python3 render_terminal.py [path/to/moon-waves.json] [--view]
+
+Printed to a terminal, rows are clipped to its width instead of wrapping.
+--view: interactive viewport for grids larger than the screen. Arrows/hjkl
+scroll and pan (HJKL by 8), PgUp/PgDn/space page, g/G top/bottom, q quits.
+Only visible cells are encoded; vertical scrolls shift the screen and draw
+just the rows scrolled in.
+"""
+import json, os, shutil, sys
+
+args = [a for a in sys.argv[1:] if a != "--view"]
+path = args[0] if args else os.path.join(os.path.dirname(__file__), "moon-waves.json")
+doc = json.load(open(path))
+SGR = {"b": "1;", "i": "3;", "x": "1;3;"}
+rows = doc["chars"]
+ncols = max([len(r) for r in rows] + [1])
+_spans = {}
+
+
+def spans(r):
+    """Row r as runs [(c0, c1, sgr or None for blanks, text)], built on first use."""
+    if r not in _spans:
+        row = rows[r]
+        styles = doc["styles"][r] if r < len(doc["styles"]) else ""
+        colors = doc["colors"][r]
+        out, cur = [], False
+        for c, ch in enumerate(row):
+            if ch == " ":
+                key = None
+            else:
+                hexc = colors[c] if c < len(colors) and colors[c] else "#888888"
+                key = (hexc, styles[c] if c < len(styles) else "r")
+            if out and key == cur:
+                out[-1][1] = c + 1
+                out[-1][3] += ch
+                continue
+            sgr = None
+            if key is not None:
+                hexc, sty = key
+                rr, gg, bb = int(hexc[1:3], 16), int(hexc[3:5], 16), int(hexc[5:7], 16)
+                sgr = "\\x1b[0;%s38;2;%d;%d;%dm" % (SGR.get(sty, ""), rr, gg, bb)
+            out.append([c, c + 1, sgr, ch])
+            cur = key
+        _spans[r] = out
+    return _spans[r]
+
+
+def encode(r, c0=0, width=None):
+    """ANSI for columns [c0, c0 + width) of row r."""
+    c1 = ncols if width is None else c0 + width
+    out, styled = [], False
+    for s0, s1, sgr, text in spans(r):
+        if s1 <= c0 or s0 >= c1:
+            continue
+        text = text[max(0, c0 - s0):min(s1, c1) - s0]
+        if sgr is None:
+            if styled:
+                out.append("\\x1b[0m"); styled = False
+        else:
+            out.append(sgr); styled = True
+        out.append(text)
     out.append("\\x1b[0m")
-    print("".join(out))
+    return "".join(out)
+
+
+def view():
+    import signal, termios, tty
+    top, left = 0, 0
+    size = [0, 0]
+    cache = {}  # (row, left, width) -> encoded line
+
+    def line(r, w):
+        key = (r, left, w)
+        if key not in cache:
+            if len(cache) > 4096:
+                cache.clear()
+            cache[key] = encode(r, left, w) if r < len(rows) else ""
+        return cache[key]
+
+    def status():
+        w, h = size
+        msg = " %s  rows %d-%d/%d  cols %d-%d/%d  (q quits) " % (
+            os.path.basename(path), top + 1, min(len(rows), top + h - 1), len(rows),
+            left + 1, min(ncols, left + w), ncols)
+        return "\\x1b[%d;1H\\x1b[7m%s\\x1b[0m\\x1b[K" % (h, msg[:w])
+
+    def draw(lines):
+        w, h = size
+        out = ["\\x1b[%d;1H%s\\x1b[K" % (i + 1, line(top + i, w)) for i in lines]
+        sys.stdout.write("".join(out) + status())
+        sys.stdout.flush()
+
+    def clamp():
+        nonlocal top, left
+        w, h = size
+        top = max(0, min(top, len(rows) - (h - 1)))
+        left = max(0, min(left, ncols - w))
+
+    def scroll(n):
+        nonlocal top
+        old = top
+        top += n
+        clamp()
+        d = top - old
+        w, h = size
+        if d == 0:
+            return
+        if abs(d) >= h - 1:
+            draw(range(h - 1))
+            return
+        # shift the rows already on screen inside a scroll region; draw the rest
+        sys.stdout.write("\\x1b[1;%dr" % (h - 1) + ("\\x1b[%dS" % d if d > 0 else "\\x1b[%dT" % -d) + "\\x1b[r")
+        draw(range(h - 1 - d, h - 1) if d > 0 else range(-d))
+
+    def pan(n):
+        nonlocal left
+        old = left
+        left += n
+        clamp()
+        if left != old:  # every visible row shifts sideways
+            draw(range(size[1] - 1))
+
+    keys = {"j": lambda: scroll(1), "k": lambda: scroll(-1), "J": lambda: scroll(8), "K": lambda: scroll(-8),
+            "l": lambda: pan(1), "h": lambda: pan(-1), "L": lambda: pan(8), "H": lambda: pan(-8),
+            "\\x1b[B": lambda: scroll(1), "\\x1b[A": lambda: scroll(-1),
+            "\\x1b[C": lambda: pan(1), "\\x1b[D": lambda: pan(-1),
+            " ": lambda: scroll(size[1] - 1), "\\x1b[6~": lambda: scroll(size[1] - 1),
+            "\\x1b[5~": lambda: scroll(1 - size[1]),
+            "g": lambda: scroll(-len(rows)), "G": lambda: scroll(len(rows))}
+    fd = sys.stdin.fileno()
+    saved = termios.tcgetattr(fd)
+
+    def full(*_):  # first draw, and on SIGWINCH
+        size[:] = shutil.get_terminal_size()
+        clamp()
+        sys.stdout.write("\\x1b[r\\x1b[2J")
+        draw(range(size[1] - 1))
+
+    signal.signal(signal.SIGWINCH, full)
+    try:
+        tty.setraw(fd)
+        sys.stdout.write("\\x1b[?1049h\\x1b[?25l")
+        full()
+        while True:
+            k = os.read(fd, 8).decode("utf-8", "ignore")
+            if k in ("q", "\\x03", "\\x1b"):
+                break
+            if k in keys:
+                keys[k]()
+    finally:
+        sys.stdout.write("\\x1b[r\\x1b[?25h\\x1b[?1049l")
+        sys.stdout.flush()
+        termios.tcsetattr(fd, termios.TCSADRAIN, saved)
+
+
+if "--view" in sys.argv:
+    view()
+else:
+    width = shutil.get_terminal_size().columns if sys.stdout.isatty() else None
+    for r in range(len(rows)):
+        print(encode(r, 0, width))
 '''
 open(f"{OUTDIR}/render_terminal.py", "w").write(renderer)
 
+
 # ---------- deliverable 4: standalone HTML ----------
-html_rows = []
-for r in range(NROWS):
+def html_row(r):
     spans, cur, buf = [], None, []
     for c in range(NCOLS):
         ch = chars[r][c]
@@ -245,9 +418,16 @@ for r in range(NROWS):
             if sty_ in ("i", "x"):
                 st += ";font-style:italic"
             spans.append(f'<span style="{st}">' + "".join(buf) + "</span>")
-    html_rows.append("".join(spans).rstrip())
+    return "".join(spans).rstrip()
+
 
-html = f"""<!doctype html>
+def write_text(txt_rows, ansi_rows, html_rows):
+    """txt / json / svg / ans / html deliverables from per-row caches."""
+    txt = "\n".join(txt_rows)
+    save(f"{OUTDIR}/moon-waves.txt", txt + "\n")
+    save(f"{OUTDIR}/moon-waves.svg", to_svg(write_json()))
+    save(f"{OUTDIR}/moon-waves.ans", "\n".join(ansi_rows) + "\n")
+    html = f"""<!doctype html>
 <meta charset="utf-8">
 <title>MonoDreams — waves &amp; waning moon</title>
 <style>
@@ -262,29 +442,164 @@ html = f"""<!doctype html>
 </style>
 <pre>{chr(10).join(html_rows)}</pre>
 """
-open(f"{OUTDIR}/moon-waves.html", "w").write(html)
+    save(f"{OUTDIR}/moon-waves.html", html)
+    return txt
+
+
+txt_rows = [txt_row(r) for r in range(NROWS)]
+ansi_rows = [ansi_row(r) for r in range(NROWS)]
+html_rows = [html_row(r) for r in range(NROWS)]
+txt = write_text(txt_rows, ansi_rows, html_rows)
 
 # ---------- deliverable 5: final PNG (with soft glow) ----------
 PX, PY, X0 = 17.62, 23.347, 7.01
 W = H = 1024
+GLOW_R = 16  # px; reach of the GaussianBlur(4) glow (3 box passes of ~±5 px)
 img = Image.new("RGB", (W, H), (0, 0, 0))
 d = ImageDraw.Draw(img)
 fonts = {k: ImageFont.truetype("/System/Library/Fonts/Menlo.ttc", 19, index=i)
          for k, i in {"r": 0, "b": 1, "i": 2, "x": 3}.items()}
 ybase0 = 60.03
-for r in range(NROWS):
-    for c in range(NCOLS):
-        ch = chars[r][c]
-        if ch == " ":
-            continue
-        hexc = cellcolor[r][c] or "#888888"
-        rgbv = tuple(int(hexc[i:i + 2], 16) for i in (1, 3, 5))
-        f = fonts.get(stycodes[r][c], fonts["r"])
-        d.text((X0 + c * PX + PX / 2, ybase0 + r * PY), ch, font=f, fill=rgbv, anchor="ms")
-glow = img.filter(ImageFilter.GaussianBlur(4))
-glow = glow.point(lambda v: int(v * 0.9))
-final = ImageChops.screen(img, glow)
+
+
+def draw_cells(d, rows, cols, ox=0, oy=0):
+    """Draw the cells in rows x cols, in raster order, shifted by (-ox, -oy)."""
+    for r in rows:
+        for c in cols:
+            ch = chars[r][c]
+            if ch == " ":
+                continue
+            hexc = cellcolor[r][c] or "#888888"
+            rgbv = tuple(int(hexc[i:i + 2], 16) for i in (1, 3, 5))
+            f = fonts.get(stycodes[r][c], fonts["r"])
+            d.text((X0 + c * PX + PX / 2 - ox, ybase0 + r * PY - oy), ch, font=f, fill=rgbv, anchor="ms")
+
+
+def glow(im):
+    g = im.filter(ImageFilter.GaussianBlur(4))
+    g = g.point(lambda v: int(v * 0.9))
+    return ImageChops.screen(im, g)
+
+
+draw_cells(d, range(NROWS), range(NCOLS))
+final = glow(img)
 final.save(f"{OUTDIR}/moon-waves.png")
 final.save(f"{SCRATCH}/art_render.png")
 print("deliverables written to", OUTDIR)
 print(txt[:400])
+
+if not args.watch:
+    raise SystemExit
+
+# ---------- watch mode ----------
+TUNABLES = ("craters", "WATER", "MOON", "CRATER_TINT", "HALO", "TIER_L", "RIPPLE")
+MOON_CH = [tuple(rc) for rc in np.argwhere(HUE_Y & MOON_MASK).tolist()]
+HALO_CH = [tuple(rc) for rc in np.argwhere(HUE_Y & ~MOON_MASK).tolist()]
+WAVE_CH = [tuple(rc) for rc in np.argwhere(HUE_B).tolist()]
+
+
+def read_tunables(path):
+    """Current values of TUNABLES as assigned at the top level of `path`."""
+    tree = ast.parse(open(path).read())
+    body = [n for n in tree.body if isinstance(n, ast.Assign) and len(n.targets) == 1
+            and isinstance(n.targets[0], ast.Name) and n.targets[0].id in TUNABLES]
+    ns = {}
+    exec(compile(ast.Module(body=body, type_ignores=[]), path, "exec"), {"math": math}, ns)
+    return ns
+
+
+def affected(name, old, new):
+    """Cells whose grade can change when tunable `name` goes old -> new."""
+    # craters: a gaussian never reaches zero, and however small its share of
+    # k it can still tip the 0.02 / 0.62 thresholds or a colour rounding, so
+    # every moon cell is regraded (the caller keeps only real changes)
+    if name in ("craters", "MOON", "CRATER_TINT"):
+        return set(MOON_CH)
+    if name == "HALO":
+        return set(HALO_CH)
+    if name in ("WATER", "RIPPLE"):
+        return set(WAVE_CH)
+    if name == "TIER_L":
+        codes = {k for k in set(old) | set(new) if old.get(k) != new.get(k)}
+        return {tuple(rc) for rc in np.argwhere(np.isin(src.code, [ord(k) for k in codes])).tolist()}
+    return {(r, c) for r in range(NROWS) for c in range(NCOLS)}
+
+
+def rerender(cells):
+    """Redraw the PNG layer and its glow over the dirty cells only."""
+    rows = sorted({r for r, _ in cells})
+    blocks = []  # runs of consecutive dirty rows -> [r0, r1, c0, c1]
+    for r in rows:
+        cs = [c for rr, c in cells if rr == r]
+        if blocks and blocks[-1][1] == r - 1:
+            b = blocks[-1]
+            b[1], b[2], b[3] = r, min(b[2], min(cs)), max(b[3], max(cs))
+        else:
+            blocks.append([r, r, min(cs), max(cs)])
+    rects = []
+    for r0, r1, c0, c1 in blocks:
+        # every glyph lies within its row's baseline-to-baseline band and its
+        # column, so the rectangle only needs the neighbouring cells redrawn
+        x0 = max(0, int(X0 + c0 * PX) - 2)
+        x1 = min(W, int(math.ceil(X0 + (c1 + 1) * PX)) + 2)
+        y0 = max(0, int(ybase0 + (r0 - 1) * PY))
+        y1 = min(H, int(math.ceil(ybase0 + (r1 + 1) * PY)))
+        # the tile reaches a cell past the rectangle so no glyph origin in it
+        # is negative (PIL truncates those towards zero, shifting the glyph)
+        tx0, ty0 = max(0, x0 - int(PX) - 1), max(0, y0 - int(PY) - 1)
+        tile = Image.new("RGB", (x1 - tx0, y1 - ty0), (0, 0, 0))
+        draw_cells(ImageDraw.Draw(tile), range(max(0, r0 - 1), min(NROWS, r1 + 2)),
+                   range(max(0, c0 - 1), min(NCOLS, c1 + 2)), tx0, ty0)
+        img.paste(tile.crop((x0 - tx0, y0 - ty0, x1 - tx0, y1 - ty0)), (x0, y0))
+        rects.append((x0, y0, x1, y1))
+    for x0, y0, x1, y1 in rects:
+        # the glow changes up to GLOW_R past the redrawn pixels and depends on
+        # pixels up to GLOW_R past that, so blur a doubly padded crop
+        px0, py0, px1, py1 = max(0, x0 - GLOW_R), max(0, y0 - GLOW_R), min(W, x1 + GLOW_R), min(H, y1 + GLOW_R)
+        gx0, gy0, gx1, gy1 = max(0, px0 - GLOW_R), max(0, py0 - GLOW_R), min(W, px1 + GLOW_R), min(H, py1 + GLOW_R)
+        g = glow(img.crop((gx0, gy0, gx1, gy1)))
+        final.paste(g.crop((px0 - gx0, py0 - gy0, px1 - gx0, py1 - gy0)), (px0, py0))
+
+
+me = os.path.abspath(__file__)
+current = {name: globals()[name] for name in TUNABLES}
+stamp = os.stat(me).st_mtime_ns
+print(f"watching {me} (Ctrl-C writes moon-waves.png and exits)")
+try:
+    while True:
+        time.sleep(0.05)
+        if os.stat(me).st_mtime_ns == stamp:
+            continue
+        stamp = os.stat(me).st_mtime_ns
+        t0 = time.perf_counter()
+        try:
+            new = read_tunables(me)
+        except Exception as e:  # mid-edit syntax errors etc.: wait for the next save
+            print("reload failed:", e)
+            continue
+        dirty = set()
+        for name in TUNABLES:
+            if name in new and new[name] != current[name]:
+                dirty |= affected(name, current[name], new[name])
+                current[name] = new[name]
+                globals()[name] = new[name]
+        changed = set()
+        for r, c in dirty:
+            g = grade(r, c)
+            if g != (chars[r][c], cellcolor[r][c]):
+                chars[r][c], cellcolor[r][c] = g
+                changed.add((r, c))
+        if not changed:
+            print(f"no cell changed ({len(dirty)} regraded)")
+            continue
+        for r in {r for r, _ in changed}:
+            txt_rows[r], ansi_rows[r], html_rows[r] = txt_row(r), ansi_row(r), html_row(r)
+        write_text(txt_rows, ansi_rows, html_rows)
+        rerender(changed)
+        t1 = time.perf_counter()
+        final.save(f"{SCRATCH}/art_render.png", compress_level=0)  # preview: encode speed over size
+        print(f"{len(dirty)} cells regraded, {len(changed)} changed in {len({r for r, _ in changed})} rows: "
+              f"{(t1 - t0) * 1000:.0f} ms (+{(time.perf_counter() - t1) * 1000:.0f} ms preview encode)")
+except KeyboardInterrupt:
+    final.save(f"{OUTDIR}/moon-waves.png")
+    print("\nmoon-waves.png written")
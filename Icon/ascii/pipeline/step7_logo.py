@@ -1,21 +1,44 @@
 """Step 7: logo + wordmark lockup. Art (from moon-waves.json) + 'MONODREAMS'
 in custom 5x6 block letterforms textured with the artwork's own glyphs:
-MONO in wave-matter (blue), DREAMS in moon-matter (gold)."""
+MONO in wave-matter (blue), DREAMS in moon-matter (gold).
+
+--batch SPEC.json: many lockups from one parse of the art, rendered and
+exported concurrently (shared fonts and art raster) into build/lockups/.
+SPEC is a list of {"name", "word", "blue": leading letters in wave-matter
+(default: half), "layout": "horizontal" | "stacked" (one line per word),
+"width": grid columns (default: the art's), "fit": "pad" | "scale"}; see
+lockups.json. Wordmarks wider than "width" widen the grid instead. Variants
+with a character outside the block font are reported and skipped (exit 1).
+"""
 import os
 HERE = os.path.dirname(os.path.abspath(__file__))
 ROOT = os.path.dirname(HERE)          # Icon/ascii — deliverables live here
 BUILD = os.path.join(HERE, "build")   # intermediates (gitignored)
 os.makedirs(BUILD, exist_ok=True)
+import argparse
 import json
 import math
 import os
+import sys
+import threading
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
 from PIL import Image, ImageDraw, ImageFont, ImageFilter, ImageChops
+from grid import Grid, vstack
+from svgexport import to_svg
 
 SCRATCH = BUILD
 OUTDIR = ROOT
 
+ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+ap.add_argument("--batch", metavar="SPEC", help="JSON list of lockup variants")
+ap.add_argument("--out", metavar="DIR", default=f"{BUILD}/lockups", help="batch output directory")
+ap.add_argument("--jobs", type=int, default=os.cpu_count(), help="batch: concurrent renders")
+args = ap.parse_args()
+
 art = json.load(open(f"{OUTDIR}/moon-waves.json"))
-NCOLS = art["cols"]
+ART = Grid.from_doc(art)
+NART, NCOLS = ART.shape
 
 LETTERS = {
     "M": ["X...X", "XX.XX", "X.X.X", "X...X", "X...X", "X...X"],
@@ -26,7 +49,51 @@ LETTERS = {
     "E": ["XXXX", "X...", "XXX.", "X...", "X...", "XXXX"],
     "A": [".XXX.", "X...X", "XXXXX", "X...X", "X...X", "X...X"],
     "S": [".XXXX", "X....", ".XXX.", "....X", "....X", "XXXX."],
+    # the rest of the block font, same 6-row cap height
+    "B": ["XXXX.", "X...X", "XXXX.", "X...X", "X...X", "XXXX."],
+    "C": [".XXXX", "X....", "X....", "X....", "X....", ".XXXX"],
+    "F": ["XXXX", "X...", "XXX.", "X...", "X...", "X..."],
+    "G": [".XXXX", "X....", "X.XXX", "X...X", "X...X", ".XXX."],
+    "H": ["X...X", "X...X", "XXXXX", "X...X", "X...X", "X...X"],
+    "I": ["XXX", ".X.", ".X.", ".X.", ".X.", "XXX"],
+    "J": ["..XXX", "...X.", "...X.", "...X.", "X..X.", ".XX.."],
+    "K": ["X...X", "X..X.", "XXX..", "X.X..", "X..X.", "X...X"],
+    "L": ["X...", "X...", "X...", "X...", "X...", "XXXX"],
+    "P": ["XXXX.", "X...X", "XXXX.", "X....", "X....", "X...."],
+    "Q": [".XXX.", "X...X", "X...X", "X.X.X", "X..X.", ".XX.X"],
+    "T": ["XXXXX", "..X..", "..X..", "..X..", "..X..", "..X.."],
+    "U": ["X...X", "X...X", "X...X", "X...X", "X...X", ".XXX."],
+    "V": ["X...X", "X...X", "X...X", ".X.X.", ".X.X.", "..X.."],
+    "W": ["X...X", "X...X", "X...X", "X.X.X", "XX.XX", "X...X"],
+    "X": ["X...X", ".X.X.", "..X..", "..X..", ".X.X.", "X...X"],
+    "Y": ["X...X", ".X.X.", "..X..", "..X..", "..X..", "..X.."],
+    "Z": ["XXXXX", "...X.", "..X..", ".X...", "X....", "XXXXX"],
+    "И": ["X...X", "X..XX", "X.X.X", "XX..X", "X...X", "X...X"],
+    "П": ["XXXXX", "X...X", "X...X", "X...X", "X...X", "X...X"],
+    "Л": ["..XXX", ".X..X", ".X..X", ".X..X", ".X..X", "X...X"],
+    "Г": ["XXXX", "X...", "X...", "X...", "X...", "X..."],
+    "Д": [".XXX.", ".X.X.", ".X.X.", ".X.X.", "XXXXX", "X...X"],
+    "Б": ["XXXXX", "X....", "XXXX.", "X...X", "X...X", "XXXX."],
+    "0": [".XXX.", "X..XX", "X.X.X", "X.X.X", "XX..X", ".XXX."],
+    "1": [".X.", "XX.", ".X.", ".X.", ".X.", "XXX"],
+    "2": [".XXX.", "X...X", "...X.", "..X..", ".X...", "XXXXX"],
+    "3": ["XXXX.", "....X", ".XXX.", "....X", "....X", "XXXX."],
+    "4": ["X..X.", "X..X.", "XXXXX", "...X.", "...X.", "...X."],
+    "5": ["XXXXX", "X....", "XXXX.", "....X", "....X", "XXXX."],
+    "6": [".XXX.", "X....", "XXXX.", "X...X", "X...X", ".XXX."],
+    "7": ["XXXXX", "....X", "...X.", "..X..", "..X..", "..X.."],
+    "8": [".XXX.", "X...X", ".XXX.", "X...X", "X...X", ".XXX."],
+    "9": [".XXX.", "X...X", "X...X", ".XXXX", "....X", ".XXX."],
+    " ": ["...", "...", "...", "...", "...", "..."],
+    "-": ["...", "...", "XXX", "...", "...", "..."],
+    ".": [".", ".", ".", ".", ".", "X"],
+    ":": [".", "X", ".", ".", "X", "."],
+    "!": ["X", "X", "X", "X", ".", "X"],
+    "'": ["X", "X", ".", ".", ".", "."],
+    "&": [".XX..", "X..X.", ".XX..", "X.X.X", "X..X.", ".XX.X"],
 }
+# Cyrillic capitals drawn like their Latin look-alikes
+HOMOGLYPHS = dict(zip("АВЕКМНОРСТХ", "ABEKMHOPCTX"))
 WORD = "MONODREAMS"
 BLUE_N = 4  # first 4 letters are MONO
 
@@ -45,133 +112,197 @@ def ramp(stops, t):
 
 WATER = [(10, 28, 64), (24, 66, 132), (52, 116, 196), (98, 172, 238), (150, 214, 252)]
 MOON = [(146, 98, 22), (196, 146, 40), (230, 186, 62), (248, 216, 100)]
-
-# compose the 6-row wordmark band
-widths = [len(LETTERS[ch][0]) for ch in WORD]
-total = sum(widths) + (len(WORD) - 1)
-assert total == NCOLS, f"wordmark width {total} != grid {NCOLS}"
-H = 6
-wm_ch = [[" "] * NCOLS for _ in range(H)]
-wm_col = [["" for _ in range(NCOLS)] for _ in range(H)]
-wm_sty = [[" "] * NCOLS for _ in range(H)]
-
 WAVE_CAPS = "MNWИ"
 WAVE_LOW = "mwи"
-x = 0
-for li, letter in enumerate(WORD):
-    shape = LETTERS[letter]
-    lw = len(shape[0])
-    is_blue = li < BLUE_N
-    for r in range(H):
-        for c in range(lw):
-            if shape[r][c] != "X":
+
+
+def letter_key(ch):
+    """The LETTERS key drawing ch: case-folded, accents dropped (É -> E),
+    Cyrillic look-alikes mapped; None if there is no block letterform."""
+    ch = ch.upper()
+    ch = HOMOGLYPHS.get(ch, ch)
+    if ch not in LETTERS:
+        ch = unicodedata.normalize("NFD", ch)[0]
+    return ch if ch in LETTERS else None
+
+
+def letterform(ch):
+    """Block bitmap of ch (see letter_key)."""
+    key = letter_key(ch)
+    if key is None:
+        raise SystemExit(f"no block letterform for {ch!r}")
+    return LETTERS[key]
+
+
+def wordmark(lines, blue_n, width, k=1):
+    """Lay out lines of text (one row band each, centered in `width` columns),
+    each bitmap pixel a k x k block of cells; letters [0, blue_n) counted over
+    all lines (spaces excluded) are wave-matter, the rest moon-matter. -> a Grid per line."""
+    H = 6 * k
+    out = []
+    li = 0  # letter index across lines
+    for text in lines:
+        shapes = [letterform(ch) for ch in text]
+        widths = [len(s[0]) * k for s in shapes]
+        line_w = sum(widths) + (len(shapes) - 1) * k
+        x = (width - line_w) // 2
+        wm = Grid.blank(H, width)
+        # moon-matter: bright bell around the center of this line's gold block
+        letter_i = [li + sum(ch != " " for ch in text[:i]) for i in range(len(text))]
+        nb = sum(i < blue_n for i in letter_i)
+        block_c0 = x + sum(widths[:nb]) + nb * k
+        block_w = x + line_w - block_c0
+        for ch0, shape, lw in zip(text, shapes, widths):
+            is_blue = li < blue_n
+            for r in range(H):
+                for c in range(lw):
+                    if shape[r // k][c // k] != "X":
+                        continue
+                    gc = x + c
+                    hsh = (r * 7 + gc * 13 + li * 5) % 10
+                    if is_blue:
+                        # wave-matter, but stroke continuity first: M/N dominant,
+                        # W and и as rare texture accents
+                        ch = ("M" if hsh < 5 else "N" if hsh < 8 else "W" if hsh == 8 else "и")
+                        ripple = 0.5 + 0.5 * math.sin(gc * 0.55 + r * 0.9)
+                        L = 0.58 + 0.08 * ripple + 0.20 * (1 - r / (H - 1))
+                        rgb = ramp(WATER, L)
+                    else:
+                        ch = "@" if hsh >= 2 else "#"
+                        u = (gc - block_c0) / max(1, block_w)
+                        bell = math.exp(-((u - 0.5) ** 2) / 0.18)
+                        mottle = 0.5 + 0.5 * math.sin(0.8 * gc + 0.6 * r)
+                        L = 0.55 + 0.33 * bell + 0.08 * mottle - 0.06 * (r / (H - 1))
+                        if ch == "#":
+                            L -= 0.10
+                        rgb = ramp(MOON, L)
+                    wm.ch[r, gc] = ord(ch)
+                    wm.rgb[r, gc] = rgb[0] << 16 | rgb[1] << 8 | rgb[2]
+                    wm.ink[r, gc] = True
+                    wm.sty[r, gc] = ord("b")
+            x += lw + k
+            li += ch0 != " "
+        out.append(wm)
+    return out
+
+
+def lockup(word, blue_n=None, layout="horizontal", width=NCOLS, fit="pad"):
+    """-> (Grid, art padding): the art (centered), 2 blank rows, the wordmark."""
+    lines = word.split() if layout == "stacked" else [word]
+    blue_n = len(word.replace(" ", "")) // 2 if blue_n is None else blue_n
+    nat = max(sum(len(letterform(ch)[0]) for ch in t) + len(t) - 1 for t in lines)
+    k = max(1, width // nat) if fit == "scale" else 1
+    W = max(width, NCOLS, nat * k)
+    pad = (W - NCOLS) // 2
+    parts = [ART.pad(left=pad, right=W - pad - NCOLS)]
+    for i, wm in enumerate(wordmark(lines, blue_n, W, k)):
+        parts += [Grid.blank(2 if i == 0 else k, W), wm]
+    return vstack(parts), pad
+
+
+# ---- PNG geometry; the art layer is shared by every lockup with the same padding ----
+PX, PY, X0, YB0 = 17.62, 23.347, 7.01, 60.03
+fonts = {k: ImageFont.truetype("/System/Library/Fonts/Menlo.ttc", 19, index=i)
+         for k, i in {"r": 0, "b": 1, "i": 2, "x": 3}.items()}
+_art_layers = {}
+_art_lock = threading.Lock()
+
+
+def draw_cells(d, chars, colors, styles, rows):
+    for r in rows:
+        for c in range(len(chars[r])):
+            ch = chars[r][c]
+            if ch == " ":
                 continue
-            gc = x + c
-            hsh = (r * 7 + gc * 13 + li * 5) % 10
-            if is_blue:
-                # wave-matter, but stroke continuity first: M/N dominant,
-                # W and и as rare texture accents
-                ch = ("M" if hsh < 5 else "N" if hsh < 8 else "W" if hsh == 8 else "и")
-                ripple = 0.5 + 0.5 * math.sin(gc * 0.55 + r * 0.9)
-                L = 0.58 + 0.08 * ripple + 0.20 * (1 - r / (H - 1))
-                rgb = ramp(WATER, L)
-            else:
-                ch = "@" if hsh >= 2 else "#"
-                # moon-matter: bright bell around the DREAMS block center
-                block_c0 = sum(widths[:BLUE_N]) + BLUE_N
-                block_w = NCOLS - block_c0
-                u = (gc - block_c0) / max(1, block_w)
-                bell = math.exp(-((u - 0.5) ** 2) / 0.18)
-                mottle = 0.5 + 0.5 * math.sin(0.8 * gc + 0.6 * r)
-                L = 0.55 + 0.33 * bell + 0.08 * mottle - 0.06 * (r / (H - 1))
-                if ch == "#":
-                    L -= 0.10
-                rgb = ramp(MOON, L)
-            wm_ch[r][gc] = ch
-            wm_col[r][gc] = "#%02x%02x%02x" % rgb
-            wm_sty[r][gc] = "b"
-    x += lw + 1
+            hexc = colors[r][c] or "#888888"
+            rgbv = tuple(int(hexc[i:i + 2], 16) for i in (1, 3, 5))
+            f = fonts.get(styles[r][c], fonts["r"])
+            d.text((X0 + c * PX + PX / 2, YB0 + r * PY), ch, font=f, fill=rgbv, anchor="ms")
 
-# ---- combined document: art rows + 2 blank rows + wordmark ----
-chars = [list(r.ljust(NCOLS)) for r in art["chars"]]
-colors = [list(r) + [""] * (NCOLS - len(r)) for r in art["colors"]]
-styles = [list(r.ljust(NCOLS)) for r in art["styles"]]
-blank_ch = [" "] * NCOLS
-for _ in range(2):
-    chars.append(list(blank_ch))
-    colors.append([""] * NCOLS)
-    styles.append(list(blank_ch))
-chars.extend(wm_ch)
-colors.extend(wm_col)
-styles.extend(wm_sty)
-NROWS = len(chars)
-print(f"combined grid: {NROWS} x {NCOLS}")
 
-doc = dict(
-    title="MonoDreams — logo lockup (waves & moon + MONODREAMS wordmark)",
-    generator="claude-code glyph extraction pipeline",
-    rows=NROWS, cols=NCOLS,
-    cell_aspect=art["cell_aspect"],
-    background=art["background"],
-    chars=["".join(r).rstrip() for r in chars],
-    styles=["".join(r).rstrip() for r in styles],
-    style_key=art["style_key"],
-    colors=colors,
-)
-json.dump(doc, open(f"{OUTDIR}/monodreams-logo.json", "w"), ensure_ascii=False)
-open(f"{OUTDIR}/monodreams-logo.txt", "w").write(
-    "\n".join("".join(r).rstrip() for r in chars) + "\n")
-
-# ---- ANSI ----
-SGR = {"b": "1;", "i": "3;", "x": "1;3;"}
-lines = []
-for r in range(NROWS):
-    out, cur = [], None
-    for c in range(NCOLS):
-        ch = chars[r][c]
-        if ch == " ":
-            if cur is not None:
-                out.append("\x1b[0m"); cur = None
-            out.append(" ")
-            continue
-        hexc = colors[r][c] or "#888888"
-        sty = styles[r][c]
-        if (hexc, sty) != cur:
-            rr, gg, bb = int(hexc[1:3], 16), int(hexc[3:5], 16), int(hexc[5:7], 16)
-            out.append(f"\x1b[0;{SGR.get(sty, '')}38;2;{rr};{gg};{bb}m")
-            cur = (hexc, sty)
-        out.append(ch)
-    out.append("\x1b[0m")
-    lines.append("".join(out).rstrip())
-open(f"{OUTDIR}/monodreams-logo.ans", "w").write("\n".join(lines) + "\n")
-
-# ---- HTML ----
-def row_html(r):
-    spans, cur, buf = [], None, []
-    def flush():
-        if not buf:
-            return
-        if cur is None:
-            spans.append("".join(buf))
-        else:
-            col_, sty_ = cur
-            st = f"color:{col_}"
-            if sty_ in ("b", "x"):
-                st += ";font-weight:700"
-            if sty_ in ("i", "x"):
-                st += ";font-style:italic"
-            spans.append(f'<span style="{st}">' + "".join(buf) + "</span>")
-    for c in range(NCOLS):
-        ch = chars[r][c]
-        key = None if ch == " " else (colors[r][c], styles[r][c])
-        if key != cur:
-            flush(); buf = []; cur = key
-        buf.append({"&": "&amp;", "<": "&lt;", ">": "&gt;"}.get(ch, ch))
-    flush()
-    return "".join(spans).rstrip()
-
-
-html = f"""<!doctype html>
+def art_layer(chars, colors, styles, pad, Wpx):
+    """Glyph raster of the art rows (they end a row above the wordmark, so no
+    glyph overlaps it), rendered once per (pad, width) and pasted after."""
+    with _art_lock:
+        if (pad, Wpx) not in _art_layers:
+            layer = Image.new("RGB", (Wpx, int(math.ceil(YB0 + NART * PY))), (0, 0, 0))
+            draw_cells(ImageDraw.Draw(layer), chars, colors, styles, range(NART))
+            _art_layers[pad, Wpx] = layer
+        return _art_layers[pad, Wpx]
+
+
+def export(stem, title, grid, pad):
+    """Write stem.{json,txt,svg,ans,html,png} for one lockup."""
+    NROWS, W = grid.shape
+    cells = grid.planes()
+    chars = grid.text_rows()
+    colors = cells["colors"]
+    styles = grid.style_rows()
+    doc = dict(
+        title=title,
+        generator="claude-code glyph extraction pipeline",
+        rows=NROWS, cols=W,
+        cell_aspect=art["cell_aspect"],
+        background=art["background"],
+        chars=cells["chars"],
+        styles=cells["styles"],
+        style_key=art["style_key"],
+        colors=colors,
+    )
+    json.dump(doc, open(f"{stem}.json", "w"), ensure_ascii=False)
+    open(f"{stem}.txt", "w").write(
+        "\n".join(cells["chars"]) + "\n")
+    open(f"{stem}.svg", "w").write(to_svg(doc))
+
+    # ---- ANSI ----
+    SGR = {"b": "1;", "i": "3;", "x": "1;3;"}
+    lines = []
+    for r in range(NROWS):
+        out, cur = [], None
+        for c in range(W):
+            ch = chars[r][c]
+            if ch == " ":
+                if cur is not None:
+                    out.append("\x1b[0m"); cur = None
+                out.append(" ")
+                continue
+            hexc = colors[r][c] or "#888888"
+            sty = styles[r][c]
+            if (hexc, sty) != cur:
+                rr, gg, bb = int(hexc[1:3], 16), int(hexc[3:5], 16), int(hexc[5:7], 16)
+                out.append(f"\x1b[0;{SGR.get(sty, '')}38;2;{rr};{gg};{bb}m")
+                cur = (hexc, sty)
+            out.append(ch)
+        out.append("\x1b[0m")
+        lines.append("".join(out).rstrip())
+    open(f"{stem}.ans", "w").write("\n".join(lines) + "\n")
+
+    # ---- HTML ----
+    def row_html(r):
+        spans, cur, buf = [], None, []
+        def flush():
+            if not buf:
+                return
+            if cur is None:
+                spans.append("".join(buf))
+            else:
+                col_, sty_ = cur
+                st = f"color:{col_}"
+                if sty_ in ("b", "x"):
+                    st += ";font-weight:700"
+                if sty_ in ("i", "x"):
+                    st += ";font-style:italic"
+                spans.append(f'<span style="{st}">' + "".join(buf) + "</span>")
+        for c in range(W):
+            ch = chars[r][c]
+            key = None if ch == " " else (colors[r][c], styles[r][c])
+            if key != cur:
+                flush(); buf = []; cur = key
+            buf.append({"&": "&amp;", "<": "&lt;", ">": "&gt;"}.get(ch, ch))
+        flush()
+        return "".join(spans).rstrip()
+
+    html = f"""<!doctype html>
 <meta charset="utf-8">
 <title>MonoDreams — logo</title>
 <style>
@@ -186,28 +317,51 @@ html = f"""<!doctype html>
 </style>
 <pre>{chr(10).join(row_html(r) for r in range(NROWS))}</pre>
 """
-open(f"{OUTDIR}/monodreams-logo.html", "w").write(html)
+    open(f"{stem}.html", "w").write(html)
 
-# ---- PNG with glow ----
-PX, PY, X0, YB0 = 17.62, 23.347, 7.01, 60.03
-Wpx = 1024
-Hpx = int(math.ceil(YB0 + (NROWS - 1) * PY + 66))
-img = Image.new("RGB", (Wpx, Hpx), (0, 0, 0))
-d = ImageDraw.Draw(img)
-fonts = {k: ImageFont.truetype("/System/Library/Fonts/Menlo.ttc", 19, index=i)
-         for k, i in {"r": 0, "b": 1, "i": 2, "x": 3}.items()}
-for r in range(NROWS):
-    for c in range(NCOLS):
-        ch = chars[r][c]
-        if ch == " ":
-            continue
-        hexc = colors[r][c] or "#888888"
-        rgbv = tuple(int(hexc[i:i + 2], 16) for i in (1, 3, 5))
-        f = fonts.get(styles[r][c], fonts["r"])
-        d.text((X0 + c * PX + PX / 2, YB0 + r * PY), ch, font=f, fill=rgbv, anchor="ms")
-glow = img.filter(ImageFilter.GaussianBlur(4)).point(lambda v: int(v * 0.9))
-ImageChops.screen(img, glow).save(f"{OUTDIR}/monodreams-logo.png")
+    # ---- PNG with glow ----
+    Wpx = 1024 + int(math.ceil((W - NCOLS) * PX))
+    Hpx = int(math.ceil(YB0 + (NROWS - 1) * PY + 66))
+    img = Image.new("RGB", (Wpx, Hpx), (0, 0, 0))
+    img.paste(art_layer(chars, colors, styles, pad, Wpx), (0, 0))
+    draw_cells(ImageDraw.Draw(img), chars, colors, styles, range(NART, NROWS))
+    glow = img.filter(ImageFilter.GaussianBlur(4)).point(lambda v: int(v * 0.9))
+    ImageChops.screen(img, glow).save(f"{stem}.png")
+
+
+if args.batch:
+    spec = json.load(open(args.batch))
+    os.makedirs(args.out, exist_ok=True)
+
+    def build(v):
+        grid, pad = lockup(v["word"], v.get("blue"), v.get("layout", "horizontal"),
+                           v.get("width", NCOLS), v.get("fit", "pad"))
+        export(os.path.join(args.out, v["name"]),
+               f"MonoDreams — logo lockup (waves & moon + {v['word']} wordmark)", grid, pad)
+        return (v["name"], *grid.shape)
+
+    # one unsupported character must not end the whole batch: report and skip its spec
+    skipped = []
+    for v in spec:
+        missing = sorted({ch for ch in v["word"] if letter_key(ch) is None})
+        if missing:
+            skipped.append(v)
+            print(f"{v['name']}: skipped, no block letterform for {', '.join(map(repr, missing))}",
+                  file=sys.stderr)
+    todo = [v for v in spec if v not in skipped]
+    with ThreadPoolExecutor(args.jobs) as pool:
+        for name, nrows, ncols in pool.map(build, todo):
+            print(f"{name}: {nrows} x {ncols}")
+    print(f"{len(todo)} lockups written to {args.out}" + (f", {len(skipped)} skipped" if skipped else ""))
+    raise SystemExit(1 if skipped else 0)
+
+# ---- combined document: art rows + 2 blank rows + wordmark ----
+grid, pad = lockup(WORD, BLUE_N)
+NROWS = grid.shape[0]
+print(f"combined grid: {NROWS} x {NCOLS}")
+export(f"{OUTDIR}/monodreams-logo",
+       "MonoDreams — logo lockup (waves & moon + MONODREAMS wordmark)", grid, pad)
 Image.open(f"{OUTDIR}/monodreams-logo.png").save(f"{SCRATCH}/logo_render.png")
 print("logo deliverables written")
-for r in chars[-8:]:
-    print("".join(r).rstrip())
+for r in grid.text_rows(strip=True)[-8:]:
+    print(r)
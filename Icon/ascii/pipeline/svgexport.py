@@ -0,0 +1,74 @@
+"""SVG export of a grid document: the resolution-independent deliverable
+(moon-waves.svg from step6, monodreams-logo.svg and lockups from step7).
+
+Each distinct (char, style) is defined once as a <symbol>; cells are <use>
+references, one <g> per row (its baseline as a translate) with runs of
+consecutive same-colour cells sharing a <g> of a palette CSS class. The glow
+is one filter on the whole drawing (GaussianBlur(4) at 90%, screened over the
+sharp glyphs, like the PNGs). Geometry is the PNGs' (Menlo 19px on the
+17.62 x 23.347 cell), so the SVG overlays them exactly.
+    python3 svgexport.py ../moon-waves.json [--out PATH]
+"""
+import argparse
+import json
+import os
+from xml.sax.saxutils import escape
+
+from poster import PX, PY, X0, YB0, canvas_size
+
+FONT = "Menlo, Consolas, 'DejaVu Sans Mono', monospace"
+STYLE_CSS = {"b": "font-weight:700", "i": "font-style:italic", "x": "font-weight:700;font-style:italic"}
+
+
+def to_svg(doc):
+    chars, colors, styles = doc["chars"], doc["colors"], doc["styles"]
+    w, h = canvas_size(doc["rows"], doc["cols"], 1)
+    glyphs, palette = {}, {}  # (char, style) -> symbol id; colour -> class
+    rows = []
+    for r, row in enumerate(chars):
+        sty = styles[r] if r < len(styles) else ""
+        runs = []  # [class, [uses]]
+        for c, ch in enumerate(row):
+            if ch == " ":
+                continue
+            s = sty[c] if c < len(sty) else "r"
+            g = glyphs.setdefault((ch, s), f"g{len(glyphs)}")
+            hexc = colors[r][c] if c < len(colors[r]) and colors[r][c] else "#888888"
+            k = palette.setdefault(hexc, f"c{len(palette)}")
+            use = f'<use href="#{g}" x="{X0 + c * PX + PX / 2:.2f}"/>'
+            if runs and runs[-1][0] == k:
+                runs[-1][1].append(use)
+            else:
+                runs.append([k, [use]])
+        if runs:
+            body = "".join(f'<g class="{k}">{"".join(uses)}</g>' for k, uses in runs)
+            rows.append(f'<g transform="translate(0 {YB0 + r * PY:.3f})">{body}</g>')
+    css = [f"text{{font-family:{FONT};font-size:19px;text-anchor:middle}}"]
+    css += [f".{k}{{fill:{hexc}}}" for hexc, k in palette.items()]
+    css += [f".s{s}{{{v}}}" for s, v in STYLE_CSS.items()]
+    symbols = []
+    for (ch, s), g in glyphs.items():
+        cls = f' class="s{s}"' if s in STYLE_CSS else ""
+        symbols.append(f'<symbol id="{g}" overflow="visible"><text{cls}>{escape(ch)}</text></symbol>')
+    glow = ('<filter id="glow" x="-5%" y="-5%" width="110%" height="110%">'
+            '<feGaussianBlur stdDeviation="4"/>'
+            '<feComponentTransfer><feFuncR type="linear" slope="0.9"/><feFuncG type="linear" slope="0.9"/>'
+            '<feFuncB type="linear" slope="0.9"/></feComponentTransfer>'
+            '<feBlend in="SourceGraphic" mode="screen"/></filter>')
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {w} {h}" width="{w}" height="{h}">\n'
+            f'<title>{escape(doc.get("title", ""))}</title>\n'
+            f'<style>{"".join(css)}</style>\n'
+            f'<defs>{glow}\n' + "\n".join(symbols) + '</defs>\n'
+            f'<rect width="100%" height="100%" fill="{doc.get("background", "#000000")}"/>\n'
+            '<g filter="url(#glow)">\n' + "\n".join(rows) + "\n</g>\n</svg>\n")
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("doc", help="grid document (moon-waves.json schema)")
+    ap.add_argument("--out", metavar="PATH", help="default: the document's path with .svg")
+    args = ap.parse_args()
+    out = args.out or os.path.splitext(args.doc)[0] + ".svg"
+    svg = to_svg(json.load(open(args.doc)))
+    open(out, "w").write(svg)
+    print(f"saved {out} ({len(svg.encode()) / 1e3:.0f} kB)")
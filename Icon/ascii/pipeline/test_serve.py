@@ -0,0 +1,64 @@
+"""serve.py: named documents stay inside the doc roots, and malformed
+Content-Length headers get a 400 instead of a 500.
+    python3 -m pytest test_serve.py
+"""
+import asyncio
+import os
+
+import pytest
+
+import serve
+
+
+def status_of(svc, target):
+    try:
+        return asyncio.run(svc.handle("GET", target, {}, b""))[0]
+    except serve.HTTPError as e:
+        return e.status
+
+
+@pytest.fixture
+def secret(tmp_path):
+    """A document outside both doc roots."""
+    path = tmp_path / "secret.json"
+    path.write_text('{"rows": 0, "cols": 0, "chars": [], "colors": [], "styles": []}')
+    return str(path)[:-len(".json")]
+
+
+def test_names_cannot_leave_the_doc_roots(secret):
+    svc = serve.Service(None, 1 << 20, 1 << 20)
+    up = "/".join([".."] * 16)
+    for name in (secret,                                 # absolute: /render//tmp/.../secret
+                 up + secret,                            # relative, via ..
+                 "%2e%2e/" * 16 + secret.lstrip("/"),    # .. percent-encoded
+                 "lockups\\..\\..\\secret"):             # backslash separators
+        assert status_of(svc, f"/render/{name}.txt") == 404, name
+    assert not svc.named
+
+
+def test_symlink_out_of_the_doc_root(secret):
+    svc = serve.Service(None, 1 << 20, 1 << 20)
+    link = os.path.join(serve.BUILD, "test_serve_link.json")
+    os.symlink(secret + ".json", link)
+    try:
+        assert status_of(svc, "/render/test_serve_link.txt") == 404
+    finally:
+        os.remove(link)
+
+
+async def exchange(request):
+    svc = serve.Service(None, 1 << 20, 1024)
+    server = await asyncio.start_server(svc.connection, "127.0.0.1", 0)
+    async with server:
+        reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+        writer.write(request)
+        reply = await asyncio.wait_for(reader.read(), 10)  # the server must close after an error
+        writer.close()
+    return reply
+
+
+@pytest.mark.parametrize("length, status", [("abc", b"400"), ("-5", b"400"), ("4096", b"413")])
+def test_bad_content_length(length, status):
+    reply = asyncio.run(exchange(f"POST /render.txt HTTP/1.1\r\nContent-Length: {length}\r\n\r\n".encode()))
+    assert reply.split(b" ")[1] == status
+    assert b"Connection: close" in reply
@@ -0,0 +1,46 @@
+"""step4 --frames: a later frame's glyphs must equal a full extraction of that
+frame, including where only the colour changed (same max channel, so the
+same lum and mask, but another hue and so another template set).
+    python3 -m pytest test_step4_frames.py
+"""
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+from PIL import Image
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SRC = os.path.join(os.path.dirname(HERE), "monodreams-ascii-draft.jpeg")
+
+
+def extract(frames_dir, stream):
+    """Per frame, every band's glyphs ({row: glyphs}) as step4 --frames streams them."""
+    subprocess.run([sys.executable, os.path.join(HERE, "step4_extract.py"), "--frames", str(frames_dir),
+                    "--stream", str(stream)], check=True, capture_output=True)
+    state, out = {}, []
+    for line in stream.read_text().splitlines()[1:]:
+        rec = json.loads(line)
+        if "row" in rec:
+            state[rec["row"]] = rec["glyphs"]
+        else:
+            out.append({k: v for k, v in state.items() if v})
+    return out
+
+
+def test_colour_only_change_matches_full_extraction(tmp_path):
+    first = np.asarray(Image.open(SRC).convert("RGB"))
+    second = first.copy()
+    second[120:330] = second[120:330, :, ::-1]  # swap R and B over the moon: same lum, other hue
+    seq, alone = tmp_path / "seq", tmp_path / "alone"
+    seq.mkdir()
+    alone.mkdir()
+    Image.fromarray(first).save(seq / "0.png")
+    Image.fromarray(second).save(seq / "1.png")
+    Image.fromarray(second).save(alone / "0.png")
+    incremental = extract(seq, tmp_path / "seq.ndjson")
+    full = extract(alone, tmp_path / "alone.ndjson")
+    assert len(incremental) == 2 and len(full) == 1
+    assert incremental[1] != incremental[0]
+    assert incremental[1] == full[0]
@@ -0,0 +1,79 @@
+"""step5 --stream: on animated input a band step4 never sent in frame 0 (no
+spans there) must lay out as a blank row, not break the frame document; on a
+still draft each band is laid out and written as soon as it arrives.
+    python3 -m pytest test_step5_layout.py
+"""
+import json
+import os
+import subprocess
+import sys
+import threading
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def glyph(row, cx, rgb):
+    return dict(row=row, cx=cx, rgb=rgb, ch="*", style="regular")
+
+
+def band_glyphs(row):
+    """Nine yellow and nine azure glyphs on a 17.62 pitch, three brightnesses each."""
+    out = []
+    for i in range(9):
+        v = 80 + 60 * (i % 3)
+        out.append(glyph(row, 9 + 17.62 * i, [v, v, v // 3]))
+        out.append(glyph(row, 9 + 17.62 * (i + 20), [v // 3, v // 2, v]))
+    return out
+
+
+def test_band_without_glyphs_in_frame0(tmp_path):
+    rows = 3
+    records = [dict(rows=rows, bands=[[0, 1]] * rows, baseline=[20.0, 44.0, 68.0], frames=True),
+               dict(frame=0, row=0, glyphs=band_glyphs(0)),
+               dict(frame=0, row=2, glyphs=band_glyphs(2)),  # row 1: nothing in frame 0
+               dict(frame=0, done=True),
+               dict(frame=1, row=1, glyphs=band_glyphs(1)),
+               dict(frame=1, done=True)]
+    stream = tmp_path / "stream.ndjson"
+    stream.write_text("".join(json.dumps(r) + "\n" for r in records))
+    frames = tmp_path / "frames.ndjson"
+    subprocess.run([sys.executable, os.path.join(HERE, "step5_layout.py"), "--stream", str(stream),
+                    "--out", str(tmp_path), "--frames-out", str(frames)],
+                   check=True, capture_output=True)
+    docs = [json.loads(line) for line in frames.read_text().splitlines()]
+    assert [d["frame"] for d in docs] == [0, 1]
+    first, second = docs
+    assert len(first["chars"]) == rows
+    assert first["chars"][1].strip() == "" and first["colors"][1].strip() == ""
+    assert first["chars"][0].strip() and first["chars"][2].strip()
+    assert second["changed"] == [1] and second["chars"][1].strip()
+
+
+def test_stream_lays_out_bands_before_eof(tmp_path):
+    rows = 3
+    bands = [band_glyphs(k) for k in range(rows)]
+    header = dict(rows=rows, bands=[[0, 1]] * rows, baseline=[20.0, 44.0, 68.0],
+                  ink=[[g["cx"]] + g["rgb"] for band in bands for g in band])
+    proc = subprocess.Popen([sys.executable, os.path.join(HERE, "step5_layout.py"), "--stream", "-",
+                             "--out", str(tmp_path), "--rows-out", "-"],
+                            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    watchdog = threading.Timer(60, proc.kill)  # a step5 that waits for EOF fails instead of hanging
+    watchdog.start()
+    try:
+        proc.stdin.write(json.dumps(header) + "\n" + json.dumps(dict(row=0, glyphs=bands[0])) + "\n")
+        proc.stdin.flush()
+        # input is still open: the grid header and row 0 must already be out
+        top = json.loads(proc.stdout.readline())
+        first = json.loads(proc.stdout.readline())
+        assert top["rows"] == rows and first["row"] == 0 and first["chars"].strip()
+        for k in (1, 2):
+            proc.stdin.write(json.dumps(dict(row=k, glyphs=bands[k])) + "\n")
+        proc.stdin.close()
+        rest = [json.loads(line) for line in proc.stdout]
+    finally:
+        watchdog.cancel()
+        proc.stdin.close()
+        assert proc.wait(timeout=60) == 0
+    assert [r["row"] for r in rest] == [1, 2]
+    doc = json.load(open(tmp_path / "moon_waves.json"))
+    assert [doc["chars"][k] for k in range(rows)] == [r["chars"] for r in [first] + rest]
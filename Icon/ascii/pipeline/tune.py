@@ -0,0 +1,148 @@
+"""Parameter sweep for step4's extraction thresholds, over a process pool.
+
+Each trial runs step4 (--set NAME=VALUE per swept tunable, streaming to its own
+directory under build/tune/) and step5 (--out that directory) in a pool worker,
+then scores the reconstruction against the source JPEG:
+  miss  - fraction of source ink with no reconstructed ink within 2px
+  extra - fraction of reconstructed ink with no source ink within 2px
+  l1    - mean |blurred source - blurred reconstruction| luminance (0..1)
+and reports every trial with the Pareto front over (miss, extra) starred.
+Workers decode the source once and hand it to every step4 trial (run_path
+init_globals, read as SOURCE), and keep glyphbank's template cache between
+trials, so only a SOFT change re-renders templates.
+    python3 tune.py --sweep "INK_T=40 45 50" --sweep "CASE_H=12.1 12.6 13.1" [--jobs N]
+Values go to step4 verbatim (SOFT=lo,width)."""
+import os
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)          # Icon/ascii — deliverables live here
+BUILD = os.path.join(HERE, "build")   # intermediates (gitignored)
+os.makedirs(BUILD, exist_ok=True)
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import runpy
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from PIL import Image
+import glyphbank
+
+SRC = os.path.join(ROOT, "monodreams-ascii-draft.jpeg")
+SOFT0 = glyphbank.SOFT
+INK = 45.0   # fixed ink threshold for scoring, whatever INK_T a trial uses
+REACH = 2    # px of slack before ink counts as missed / extra
+DEFAULT_SWEEP = ["INK_T=40 45 50", "CASE_H=12.1 12.6 13.1", "MERGE_W=13 15 17", "MIRROR_T=0.05 0.10 0.15"]
+
+ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+ap.add_argument("--sweep", metavar="NAME=V1 V2 ...", action="append",
+                help="tunable and its values (repeatable; the trials are their product)")
+ap.add_argument("--jobs", type=int, default=os.cpu_count(), help="worker processes")
+ap.add_argument("--out", metavar="PATH", default=f"{BUILD}/tune.json")
+
+
+def lum_of(im):
+    px = np.asarray(im)
+    return np.maximum(np.maximum(px[..., 0], px[..., 1]), px[..., 2]).astype(np.float64)
+
+
+def dilate(m, k):
+    """Binary dilation by a (2k+1)^2 square: shifted ORs along each axis."""
+    out = m.copy()
+    for d in range(1, k + 1):
+        out[d:] |= m[:-d]
+        out[:-d] |= m[d:]
+    m = out.copy()
+    for d in range(1, k + 1):
+        out[:, d:] |= m[:, :-d]
+        out[:, :-d] |= m[:, d:]
+    return out
+
+
+def box_blur(a, k=3):
+    """Mean over a (2k+1)^2 window (edge-padded), from cumulative sums."""
+    p = np.pad(a, k + 1, mode="edge").cumsum(axis=0).cumsum(axis=1)
+    n = 2 * k + 1
+    s = p[n:, n:] - p[:-n, n:] - p[n:, :-n] + p[:-n, :-n]
+    return s[:a.shape[0], :a.shape[1]] / (n * n)
+
+
+_image = None  # per worker: the decoded source, handed to every step4 trial
+_src = None  # per worker: (source ink, dilated source ink, blurred source lum)
+
+
+def source():
+    global _image
+    if _image is None:
+        _image = Image.open(SRC).convert("RGB")
+    return _image
+
+
+def score(rec_path):
+    global _src
+    if _src is None:
+        lum = lum_of(source())
+        _src = lum > INK, dilate(lum > INK, REACH), box_blur(lum)
+    ink, ink_near, blurred = _src
+    rec = lum_of(Image.open(rec_path).convert("RGB"))
+    rink = rec > INK
+    miss = float((ink & ~dilate(rink, REACH)).sum() / max(1, ink.sum()))
+    extra = float((rink & ~ink_near).sum() / max(1, rink.sum()))
+    l1 = float(np.abs(blurred - box_blur(rec)).mean() / 255.0)
+    return dict(miss=round(miss, 5), extra=round(extra, 5), l1=round(l1, 5))
+
+
+def trial(job):
+    i, params = job
+    glyphbank.SOFT = SOFT0  # the worker's glyphbank outlives the trial; undo a --set SOFT
+    tdir = os.path.join(BUILD, "tune", str(i))
+    os.makedirs(tdir, exist_ok=True)
+    stream = os.path.join(tdir, "glyphs.ndjson")
+    t0 = time.perf_counter()
+    argv = sys.argv
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            sys.argv = ["step4_extract.py", "--stream", stream] + [f"--set={k}={v}" for k, v in params.items()]
+            runpy.run_path(os.path.join(HERE, "step4_extract.py"), {"SOURCE": source()}, "__main__")
+            sys.argv = ["step5_layout.py", "--stream", stream, "--out", tdir]
+            runpy.run_path(os.path.join(HERE, "step5_layout.py"), run_name="__main__")
+    finally:
+        sys.argv = argv
+    return dict(trial=i, params=params, secs=round(time.perf_counter() - t0, 2),
+                **score(os.path.join(tdir, "reconstruction.png")))
+
+
+def pareto(results):
+    """Trials not dominated on (miss, extra): nothing else is <= on both and < on one."""
+    front = []
+    for r in results:
+        if not any(o["miss"] <= r["miss"] and o["extra"] <= r["extra"]
+                   and (o["miss"], o["extra"]) != (r["miss"], r["extra"]) for o in results):
+            front.append(r["trial"])
+    return front
+
+
+if __name__ == "__main__":
+    args = ap.parse_args()
+    axes = []
+    for spec in args.sweep or DEFAULT_SWEEP:
+        name, _, values = spec.partition("=")
+        axes.append([(name, v) for v in values.split()])
+    jobs = list(enumerate(dict(combo) for combo in itertools.product(*axes)))
+    print(f"{len(jobs)} trials on {args.jobs} workers")
+    t0 = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(args.jobs) as pool:
+        for r in pool.map(trial, jobs):
+            results.append(r)
+            print(f"  #{r['trial']:<3} miss={r['miss']:.4f} extra={r['extra']:.4f} l1={r['l1']:.4f} "
+                  f"{r['secs']:5.1f}s  {r['params']}")
+    front = pareto(results)
+    print(f"{len(results)} trials in {time.perf_counter() - t0:.1f}s; Pareto front over (miss, extra):")
+    for r in sorted(results, key=lambda r: (r["miss"] + r["extra"], r["l1"])):
+        if r["trial"] in front:
+            print(f"* #{r['trial']:<3} miss={r['miss']:.4f} extra={r['extra']:.4f} l1={r['l1']:.4f}  {r['params']}")
+    json.dump(dict(trials=results, pareto=front), open(args.out, "w"), indent=1)
+    print("saved", args.out)
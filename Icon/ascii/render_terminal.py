@@ -1,29 +1,164 @@
 #!/usr/bin/env python3
 """Render moon-waves.json as truecolor ANSI in a terminal.
 
-Usage: python3 render_terminal.py [path/to/moon-waves.json]
+Usage: python3 render_terminal.py [path/to/moon-waves.json] [--view]
+
+Printed to a terminal, rows are clipped to its width instead of wrapping.
+--view: interactive viewport for grids larger than the screen. Arrows/hjkl
+scroll and pan (HJKL by 8), PgUp/PgDn/space page, g/G top/bottom, q quits.
+Only visible cells are encoded; vertical scrolls shift the screen and draw
+just the rows scrolled in.
 """
-import json, os, sys
+import json, os, shutil, sys
 
-path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(__file__), "moon-waves.json")
+args = [a for a in sys.argv[1:] if a != "--view"]
+path = args[0] if args else os.path.join(os.path.dirname(__file__), "moon-waves.json")
 doc = json.load(open(path))
 SGR = {"b": "1;", "i": "3;", "x": "1;3;"}
-for r, row in enumerate(doc["chars"]):
-    out, cur = [], None
-    styles = doc["styles"][r] if r < len(doc["styles"]) else ""
-    colors = doc["colors"][r]
-    for c, ch in enumerate(row):
-        if ch == " ":
-            if cur is not None:
-                out.append("\x1b[0m"); cur = None
-            out.append(" ")
+rows = doc["chars"]
+ncols = max([len(r) for r in rows] + [1])
+_spans = {}
+
+
+def spans(r):
+    """Row r as runs [(c0, c1, sgr or None for blanks, text)], built on first use."""
+    if r not in _spans:
+        row = rows[r]
+        styles = doc["styles"][r] if r < len(doc["styles"]) else ""
+        colors = doc["colors"][r]
+        out, cur = [], False
+        for c, ch in enumerate(row):
+            if ch == " ":
+                key = None
+            else:
+                hexc = colors[c] if c < len(colors) and colors[c] else "#888888"
+                key = (hexc, styles[c] if c < len(styles) else "r")
+            if out and key == cur:
+                out[-1][1] = c + 1
+                out[-1][3] += ch
+                continue
+            sgr = None
+            if key is not None:
+                hexc, sty = key
+                rr, gg, bb = int(hexc[1:3], 16), int(hexc[3:5], 16), int(hexc[5:7], 16)
+                sgr = "\x1b[0;%s38;2;%d;%d;%dm" % (SGR.get(sty, ""), rr, gg, bb)
+            out.append([c, c + 1, sgr, ch])
+            cur = key
+        _spans[r] = out
+    return _spans[r]
+
+
+def encode(r, c0=0, width=None):
+    """ANSI for columns [c0, c0 + width) of row r."""
+    c1 = ncols if width is None else c0 + width
+    out, styled = [], False
+    for s0, s1, sgr, text in spans(r):
+        if s1 <= c0 or s0 >= c1:
             continue
-        hexc = colors[c] if c < len(colors) and colors[c] else "#888888"
-        sty = styles[c] if c < len(styles) else "r"
-        if (hexc, sty) != cur:
-            rr, gg, bb = int(hexc[1:3], 16), int(hexc[3:5], 16), int(hexc[5:7], 16)
-            out.append("\x1b[0;%s38;2;%d;%d;%dm" % (SGR.get(sty, ""), rr, gg, bb))
-            cur = (hexc, sty)
-        out.append(ch)
+        text = text[max(0, c0 - s0):min(s1, c1) - s0]
+        if sgr is None:
+            if styled:
+                out.append("\x1b[0m"); styled = False
+        else:
+            out.append(sgr); styled = True
+        out.append(text)
     out.append("\x1b[0m")
-    print("".join(out))
+    return "".join(out)
+
+
+def view():
+    import signal, termios, tty
+    top, left = 0, 0
+    size = [0, 0]
+    cache = {}  # (row, left, width) -> encoded line
+
+    def line(r, w):
+        key = (r, left, w)
+        if key not in cache:
+            if len(cache) > 4096:
+                cache.clear()
+            cache[key] = encode(r, left, w) if r < len(rows) else ""
+        return cache[key]
+
+    def status():
+        w, h = size
+        msg = " %s  rows %d-%d/%d  cols %d-%d/%d  (q quits) " % (
+            os.path.basename(path), top + 1, min(len(rows), top + h - 1), len(rows),
+            left + 1, min(ncols, left + w), ncols)
+        return "\x1b[%d;1H\x1b[7m%s\x1b[0m\x1b[K" % (h, msg[:w])
+
+    def draw(lines):
+        w, h = size
+        out = ["\x1b[%d;1H%s\x1b[K" % (i + 1, line(top + i, w)) for i in lines]
+        sys.stdout.write("".join(out) + status())
+        sys.stdout.flush()
+
+    def clamp():
+        nonlocal top, left
+        w, h = size
+        top = max(0, min(top, len(rows) - (h - 1)))
+        left = max(0, min(left, ncols - w))
+
+    def scroll(n):
+        nonlocal top
+        old = top
+        top += n
+        clamp()
+        d = top - old
+        w, h = size
+        if d == 0:
+            return
+        if abs(d) >= h - 1:
+            draw(range(h - 1))
+            return
+        # shift the rows already on screen inside a scroll region; draw the rest
+        sys.stdout.write("\x1b[1;%dr" % (h - 1) + ("\x1b[%dS" % d if d > 0 else "\x1b[%dT" % -d) + "\x1b[r")
+        draw(range(h - 1 - d, h - 1) if d > 0 else range(-d))
+
+    def pan(n):
+        nonlocal left
+        old = left
+        left += n
+        clamp()
+        if left != old:  # every visible row shifts sideways
+            draw(range(size[1] - 1))
+
+    keys = {"j": lambda: scroll(1), "k": lambda: scroll(-1), "J": lambda: scroll(8), "K": lambda: scroll(-8),
+            "l": lambda: pan(1), "h": lambda: pan(-1), "L": lambda: pan(8), "H": lambda: pan(-8),
+            "\x1b[B": lambda: scroll(1), "\x1b[A": lambda: scroll(-1),
+            "\x1b[C": lambda: pan(1), "\x1b[D": lambda: pan(-1),
+            " ": lambda: scroll(size[1] - 1), "\x1b[6~": lambda: scroll(size[1] - 1),
+            "\x1b[5~": lambda: scroll(1 - size[1]),
+            "g": lambda: scroll(-len(rows)), "G": lambda: scroll(len(rows))}
+    fd = sys.stdin.fileno()
+    saved = termios.tcgetattr(fd)
+
+    def full(*_):  # first draw, and on SIGWINCH
+        size[:] = shutil.get_terminal_size()
+        clamp()
+        sys.stdout.write("\x1b[r\x1b[2J")
+        draw(range(size[1] - 1))
+
+    signal.signal(signal.SIGWINCH, full)
+    try:
+        tty.setraw(fd)
+        sys.stdout.write("\x1b[?1049h\x1b[?25l")
+        full()
+        while True:
+            k = os.read(fd, 8).decode("utf-8", "ignore")
+            if k in ("q", "\x03", "\x1b"):
+                break
+            if k in keys:
+                keys[k]()
+    finally:
+        sys.stdout.write("\x1b[r\x1b[?25h\x1b[?1049l")
+        sys.stdout.flush()
+        termios.tcsetattr(fd, termios.TCSADRAIN, saved)
+
+
+if "--view" in sys.argv:
+    view()
+else:
+    width = shutil.get_terminal_size().columns if sys.stdout.isatty() else None
+    for r in range(len(rows)):
+        print(encode(r, 0, width))
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Golden-hash regression check + speed benchmark for generate_demo_sounds.py.
+
+Renders every asset in memory on each synthesis backend and reports samples/s
+and the real-time factor (seconds of audio per second of rendering). Exact-mode
+renders must hash to the committed click.wav / wind.wav / jukebox.wav (GOLDEN);
+fast-mode renders are compared against the exact ones in 16-bit LSBs instead.
+
+Run from this directory:
+
+    python3 bench_demo_sounds.py            # golden check + timing, all backends
+    python3 bench_demo_sounds.py --stress   # + minutes of wind, ~1000-note riff
+    python3 bench_demo_sounds.py --fast     # + wavetable mode (tolerance check)
+
+Exits non-zero if any exact render stops being byte-identical.
+"""
+
+import argparse
+import hashlib
+import io
+import sys
+import time
+from array import array
+
+import generate_demo_sounds as gen
+
+# SHA-256 of the committed assets; update only for a deliberate sound change.
+GOLDEN = {
+    "click.wav": "bbef25b6336dfe15709cf16adccaaaf004c1b2266c80d1460bf6b9474df69476",
+    "wind.wav": "fde065a486502453797277b2eba1341863a329d4452239248458f565736f07f0",
+    "jukebox.wav": "51f62f1b14187f798e8a21ce4341ed99225964447a69b9ef4e62f4413db1fee0",
+}
+# (label, asset, parameter overrides): long variants to track speed at scale
+STRESS = [
+    ("wind-3min", "wind.wav", {"duration": 180.0}),
+    ("jukebox-x20", "jukebox.wav", {"repeats": 20}),  # 1000 note events, 200s
+]
+
+
+def render(name: str, **overrides) -> tuple[bytes, int, float]:
+    """(wav bytes, frames, seconds) of one in-memory render."""
+    t0 = time.perf_counter()
+    f = io.BytesIO()
+    frames = gen.encode_wav(f, gen.stream(name, **overrides))
+    return f.getvalue(), frames, time.perf_counter() - t0
+
+
+def lsb_diff(a: bytes, b: bytes) -> int:
+    """Largest per-sample difference between two equal-format PCM .wav files."""
+    x, y = array("h", a[44:]), array("h", b[44:])  # past the 44-byte PCM header
+    if sys.byteorder == "big":
+        x.byteswap()
+        y.byteswap()
+    if len(x) != len(y):
+        return -1
+    return max((abs(p - q) for p, q in zip(x, y)), default=0)
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Golden-hash check + benchmark of the demo sound generators.")
+    ap.add_argument("--stress", action="store_true", help="also time the long stress variants")
+    ap.add_argument("--fast", action="store_true", help="also run the wavetable mode (tolerance check)")
+    args = ap.parse_args()
+
+    backends = (["numpy"] if gen.NUMPY is not None else []) + ["stdlib"]
+    jobs = [(name, name, {}) for name in gen.ASSETS] + (STRESS if args.stress else [])
+    failures = 0
+    print(f"{'backend':8} {'mode':5} {'asset':12} {'seconds':>8} {'samples/s':>11} {'x realtime':>10}  check")
+    for backend in backends:
+        for fast in ([False, True] if args.fast else [False]):
+            for label, name, overrides in jobs:
+                gen.configure(stdlib=backend == "stdlib", fast=fast)
+                data, frames, seconds = render(name, **overrides)
+                if fast:
+                    gen.configure(stdlib=backend == "stdlib")
+                    check = f"max {lsb_diff(data, render(name, **overrides)[0])} LSB vs exact"
+                elif name == label:
+                    ok = hashlib.sha256(data).hexdigest() == GOLDEN[name]
+                    failures += not ok
+                    check = "golden OK" if ok else "GOLDEN MISMATCH"
+                else:
+                    check = "-"
+                print(f"{backend:8} {'fast' if fast else 'exact':5} {label:12} {seconds:8.3f} "
+                      f"{frames / seconds:11.0f} {frames / gen.SAMPLE_RATE / seconds:10.1f}  {check}")
+    if failures:
+        print(f"{failures} exact render(s) no longer reproduce the committed assets")
+    sys.exit(1 if failures else 0)
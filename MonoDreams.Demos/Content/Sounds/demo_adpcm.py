@@ -0,0 +1,129 @@
+"""IMA-ADPCM .wav encoding for generate_demo_sounds.py (--adpcm DIR): 4 bits
+per sample instead of 16, for the web demos, which download every asset.
+
+The output is a standard WAVE_FORMAT_IMA_ADPCM (0x11) file: a 20-byte fmt
+chunk (block align, 4 bits/sample, cbSize 2, samples per block), a fact chunk
+with the true sample count, then fixed-size blocks. Each block opens with a
+4-byte header (the first sample verbatim, the step index) followed by the rest
+of its samples as nibbles, low nibble first; the last block is zero-padded.
+Block align follows the usual rate convention (256 bytes at 11 kHz, 512 at
+22 kHz, 1024 at 44 kHz), so a block is 1017 samples at our 22050 Hz.
+
+The encoder runs the decoder's own arithmetic to track its predictor, so the
+step-size state never drifts; the predictor restarts on every block's exact
+first sample and the step index carries over. The recurrence is inherently
+serial, so this is a plain integer loop (stdlib only), one block at a time.
+"""
+
+import math
+import struct
+import sys
+import wave
+from array import array
+from pathlib import Path
+
+STEPS = (
+    7, 8, 9, 10, 11, 12, 13, 14, 16, 17, 19, 21, 23, 25, 28, 31, 34, 37, 41, 45,
+    50, 55, 60, 66, 73, 80, 88, 97, 107, 118, 130, 143, 157, 173, 190, 209, 230,
+    253, 279, 307, 337, 371, 408, 449, 494, 544, 598, 658, 724, 796, 876, 963,
+    1060, 1166, 1282, 1411, 1552, 1707, 1878, 2066, 2272, 2499, 2749, 3024, 3327,
+    3660, 4026, 4428, 4871, 5358, 5894, 6484, 7132, 7845, 8630, 9493, 10442,
+    11487, 12635, 13899, 15289, 16818, 18500, 20350, 22385, 24623, 27086, 29794,
+    32767,
+)
+INDEX_SHIFT = (-1, -1, -1, -1, 2, 4, 6, 8)
+
+
+def block_align(rate: int) -> int:
+    """256 bytes per block at 11 kHz and below, doubling with the rate."""
+    return 256 * max(1, rate // 11025)
+
+
+def samples_per_block(align: int) -> int:
+    return (align - 4) * 2 + 1
+
+
+def encode_block(samples, index: int, align: int) -> tuple[bytes, int]:
+    """One mono block from up to samples_per_block(align) 16-bit samples
+    (zero-padded); returns (block bytes, step index to carry on)."""
+    pred = samples[0]
+    out = bytearray(struct.pack("<hBB", pred, index, 0))
+    nibbles = []
+    for s in samples[1:]:
+        step = STEPS[index]
+        diff = s - pred
+        code = 0
+        if diff < 0:
+            code, diff = 8, -diff
+        vpdiff = step >> 3
+        if diff >= step:
+            code |= 4
+            diff -= step
+            vpdiff += step
+        step >>= 1
+        if diff >= step:
+            code |= 2
+            diff -= step
+            vpdiff += step
+        step >>= 1
+        if diff >= step:
+            code |= 1
+            vpdiff += step
+        pred = max(-32768, pred - vpdiff) if code & 8 else min(32767, pred + vpdiff)
+        index = min(88, max(0, index + INDEX_SHIFT[code & 7]))
+        nibbles.append(code)
+    nibbles += [0] * (2 * (align - 4) - len(nibbles))
+    out += bytes(lo | hi << 4 for lo, hi in zip(nibbles[0::2], nibbles[1::2]))
+    return bytes(out), index
+
+
+def decode_block(block: bytes, count: int) -> array:
+    """The first `count` samples of a mono block (the encoder's reconstruction)."""
+    pred, index = struct.unpack_from("<hB", block)
+    out = array("h", [pred])
+    for i in range(count - 1):
+        code = block[4 + i // 2] >> (4 * (i & 1)) & 15
+        step = STEPS[index]
+        vpdiff = step >> 3
+        if code & 4:
+            vpdiff += step
+        if code & 2:
+            vpdiff += step >> 1
+        if code & 1:
+            vpdiff += step >> 2
+        pred = max(-32768, pred - vpdiff) if code & 8 else min(32767, pred + vpdiff)
+        index = min(88, max(0, index + INDEX_SHIFT[code & 7]))
+        out.append(pred)
+    return out
+
+
+def write_ima_wav(wav_path: Path, out_path: Path) -> dict:
+    """Encodes a mono 16-bit PCM .wav as IMA-ADPCM; returns the sizes and the
+    SNR of the decoded result against the PCM master."""
+    with wave.open(str(wav_path), "rb") as w, open(out_path, "wb") as f:
+        if w.getnchannels() != 1 or w.getsampwidth() != 2:
+            raise ValueError(f"{wav_path}: expected mono 16-bit PCM")
+        rate, frames = w.getframerate(), w.getnframes()
+        align = block_align(rate)
+        spb = samples_per_block(align)
+        nblocks = -(-frames // spb)
+        fmt = struct.pack("<HHIIHHHH", 0x11, 1, rate, rate * align // spb, align, 4, 2, spb)
+        data_size = nblocks * align
+        f.write(b"RIFF" + struct.pack("<I", 4 + 8 + len(fmt) + 12 + 8 + data_size) + b"WAVE"
+                + b"fmt " + struct.pack("<I", len(fmt)) + fmt
+                + b"fact" + struct.pack("<II", 4, frames)
+                + b"data" + struct.pack("<I", data_size))
+        index = signal = noise = 0
+        while raw := w.readframes(spb):
+            pcm = array("h", raw)
+            if sys.byteorder == "big":
+                pcm.byteswap()
+            block, index = encode_block(pcm, index, align)
+            f.write(block)
+            for s, d in zip(pcm, decode_block(block, len(pcm))):
+                signal += s * s
+                noise += (s - d) * (s - d)
+        size = f.tell()
+    master = Path(wav_path).stat().st_size
+    snr = math.inf if noise == 0 else 10 * math.log10(signal / noise)
+    return dict(bytes=size, pcm_bytes=master, ratio=master / size, snr_db=snr)
@@ -0,0 +1,220 @@
+"""Small synthesis engine for generate_demo_sounds.py: harmonic oscillators with
+band-limited wavetables, precomputed attack/decay envelopes, voices that render
+whole notes (or any sample range of one) into buffers, and a sequencer that
+mixes cues of note events from a bounded cache of rendered notes.
+
+Two modes, switched by the module-level EXACT flag:
+
+- exact (default): oscillators evaluate sin() per sample with the very float
+  operations the original generators used, so committed assets stay
+  byte-identical;
+- fast (EXACT = False): a phase accumulator indexes a precomputed table per
+  timbre with linear interpolation — within ~1e-6 of exact, i.e. at most one
+  16-bit LSB — and drops harmonics at or above Nyquist (band-limited).
+
+Envelopes only depend on the sample index, so they are precomputed and reused
+in both modes. NumPy is optional here as in the generator: without it the same
+formulas run as scalar loops over array('d').
+"""
+
+import math
+from array import array
+from collections import OrderedDict
+
+import demo_dsp
+
+try:
+    import numpy as np
+except ImportError:  # stdlib-only fallback
+    np = None
+
+EXACT = True
+NOTE_CACHE_SAMPLES = 1 << 22  # default NoteCache budget (~32 MB of float64)
+TABLE_SIZE = 4096  # samples per wavetable period
+_TABLES = {}  # (partials, rate, size, numpy?) -> (values, slopes), shared by all oscillators
+
+
+def note_freq(semitones_from_a4: int) -> float:
+    return 440.0 * (2.0 ** (semitones_from_a4 / 12.0))
+
+
+class Oscillator:
+    """A harmonic timbre, `partials` = ((harmonic, amplitude), ...), starting at
+    phase 0 on sample 0."""
+
+    def __init__(self, partials, rate: int):
+        self.partials = tuple(partials)
+        self.rate = rate
+
+    def _table(self, freq: float):
+        """(values, slopes) of one period, without the harmonics that would alias.
+        Built once per process for each timbre: every voice and render shares it."""
+        keep = tuple((h, a) for h, a in self.partials if h * freq < self.rate / 2)
+        key = (keep, self.rate, TABLE_SIZE, np is not None)
+        if key not in _TABLES:
+            x = [k / TABLE_SIZE for k in range(TABLE_SIZE + 1)]
+            tab = [sum(a * math.sin(2 * math.pi * h * p) for h, a in keep) for p in x]
+            slope = [tab[k + 1] - tab[k] for k in range(TABLE_SIZE)]
+            if np is not None:
+                _TABLES[key] = np.array(tab[:-1]), np.array(slope)
+            else:
+                _TABLES[key] = array("d", tab[:-1]), array("d", slope)
+        return _TABLES[key]
+
+    def render(self, freq: float, i0: int, i1: int):
+        """Samples i0..i1 of the waveform at `freq` Hz."""
+        if not EXACT:
+            return self._render_table(freq, i0, i1)
+        if np is None:
+            out = array("d")
+            for i in range(i0, i1):
+                t = i / self.rate
+                s = 0.0
+                for k, (h, a) in enumerate(self.partials):
+                    v = a * math.sin(2 * math.pi * h * freq * t)
+                    s = v if k == 0 else s + v
+                out.append(s)
+            return out
+        t = np.arange(i0, i1) / self.rate
+        out = None
+        for h, a in self.partials:
+            v = a * np.sin(2 * math.pi * h * freq * t)
+            out = v if out is None else out + v
+        return out
+
+    def _render_table(self, freq: float, i0: int, i1: int):
+        tab, slope = self._table(freq)
+        step = freq / self.rate
+        if np is None:
+            out = array("d")
+            for i in range(i0, i1):
+                ph = (i * step) % 1.0 * TABLE_SIZE
+                k = int(ph)
+                out.append(tab[k] + slope[k] * (ph - k))
+            return out
+        ph = np.arange(i0, i1, dtype=np.float64)
+        ph *= step
+        ph -= np.floor(ph)
+        ph *= TABLE_SIZE
+        k = ph.astype(np.intp)
+        ph -= k
+        out = slope.take(k)
+        out *= ph
+        out += tab.take(k)
+        return out
+
+
+class Envelope:
+    """Linear attack over `attack` samples times an exponential decay
+    exp(-t * decay), precomputed once and sliced per render."""
+
+    def __init__(self, attack: int, decay: float, rate: int):
+        self.attack, self.decay, self.rate = attack, decay, rate
+        self._curve = np.zeros(0) if np is not None else array("d")
+
+    def curve(self, i0: int, i1: int):
+        if len(self._curve) < i1:  # grow: every point depends only on its index
+            n, attack = i1, self.attack
+            if np is not None:
+                i = np.arange(n)
+                t = i / self.rate
+                self._curve = np.exp(-t * self.decay) * (np.minimum(i, attack) / attack if attack else 1.0)
+            else:
+                self._curve = array("d", [math.exp(-(i / self.rate) * self.decay)
+                                          * (min(i, attack) / attack if attack else 1.0) for i in range(n)])
+        return self._curve[i0:i1]
+
+
+class Voice:
+    """An oscillator under an envelope at a default gain: one instrument."""
+
+    def __init__(self, partials, attack: int, decay: float, gain: float, rate: int):
+        self.osc = Oscillator(partials, rate)
+        self.env = Envelope(attack, decay, rate)
+        self.gain = gain
+
+    def render(self, freq: float, i0: int, i1: int, gain: float = None):
+        """Samples i0..i1 of one note at `freq` Hz (the note starts at sample 0)."""
+        gain = self.gain if gain is None else gain
+        env, osc = self.env.curve(i0, i1), self.osc.render(freq, i0, i1)
+        if np is not None:
+            return gain * env * osc
+        return array("d", [gain * e * o for e, o in zip(env, osc)])
+
+
+class NoteCache:
+    """Rendered notes keyed by (voice, freq, length, gain), least recently used
+    evicted first once more than `max_samples` samples are held."""
+
+    def __init__(self, max_samples: int = NOTE_CACHE_SAMPLES):
+        self.max_samples = max_samples
+        self.held = self.hits = self.misses = 0
+        self._notes = OrderedDict()
+
+    def get(self, voice: Voice, freq: float, count: int, gain: float):
+        key = (voice, freq, count, gain, EXACT)
+        note = self._notes.get(key)
+        if note is not None:
+            self._notes.move_to_end(key)
+            self.hits += 1
+            return note
+        self.misses += 1
+        note = voice.render(freq, 0, count, gain)
+        if count <= self.max_samples:
+            self._notes[key] = note
+            self.held += count
+            while self.held > self.max_samples:
+                _, old = self._notes.popitem(last=False)
+                self.held -= len(old)
+        return note
+
+
+class Sequencer:
+    """A cue: `events` as (time, voice, pitch, duration, gain) — seconds,
+    semitones from A4, seconds, linear gain — over `length` seconds, with a
+    linear fade-out over the last `fade` seconds. Each distinct note renders
+    once (via `cache`) and is block-added at its sample offset; overlapping
+    notes mix in event order. `mix` expects ascending blocks."""
+
+    def __init__(self, events, length: float, rate: int, fade: float = 0.0, cache: NoteCache = None):
+        self.rate = rate
+        self.n = int(length * rate)
+        self.fade_n = int(rate * fade)
+        self._fade = demo_dsp.GainRamp(self.fade_n, falling=True)
+        self.cache = cache if cache is not None else NoteCache()
+        self.events = []  # (start, count, voice, freq, gain) in event order
+        for time, voice, pitch, duration, gain in events:
+            start = int(time * rate)
+            count = min(int(duration * rate), self.n - start)
+            if count > 0:
+                self.events.append((start, count, voice, note_freq(pitch), gain))
+        self._order = sorted(range(len(self.events)), key=lambda e: self.events[e][0])
+        self._next, self._active, self._pos = 0, [], 0
+
+    def mix(self, b0: int, b1: int):
+        """Samples b0..b1 of the cue."""
+        if b0 < self._pos:  # rewound: start the sweep over
+            self._next, self._active = 0, []
+            self._fade = demo_dsp.GainRamp(self.fade_n, falling=True)
+        self._pos = b0
+        events, order = self.events, self._order
+        while self._next < len(order) and events[order[self._next]][0] < b1:
+            self._active.append(order[self._next])
+            self._next += 1
+        self._active = sorted(e for e in self._active if sum(events[e][:2]) > b0)
+        out = np.zeros(b1 - b0) if np is not None else array("d", bytes(8 * (b1 - b0)))
+        for e in self._active:
+            start, count, voice, freq, gain = events[e]
+            lo, hi = max(b0, start), min(b1, start + count)
+            if lo >= hi:
+                continue
+            note = self.cache.get(voice, freq, count, gain)
+            if np is not None:
+                out[lo - b0:hi - b0] += note[lo - start:hi - start]
+                continue
+            for j in range(lo, hi):
+                out[j - b0] += note[j - start]
+        lo = max(b0, self.n - self.fade_n)
+        if lo < b1:
+            out[lo - b0:] = self._fade.process(out[lo - b0:])
+        return out
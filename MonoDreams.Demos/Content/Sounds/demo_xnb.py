@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""Compiled SoundEffect .xnb files for generate_demo_sounds.py (--xnb DIR),
+so the content build can ship the generated sounds as-is instead of
+re-importing every .wav through WavImporter + SoundEffectProcessor.
+
+The layout is what MGCB's SoundEffectWriter emits for 16-bit PCM (XNB format 5,
+uncompressed):
+
+    "XNB", platform letter, version 5, flags (0x01 = HiDef), uint32 file size
+    7-bit reader count (1), reader type name, int32 reader version (0)
+    7-bit shared resource count (0), 7-bit type id of the asset (1)
+    uint32 format size, WAVEFORMATEX (18 bytes: tag 1 = PCM, channels, rate,
+        bytes/s, block align, bits/sample, cbSize 0)
+    uint32 data size, PCM data
+    int32 loop start (0), int32 loop length (frames), int32 duration (ms)
+
+All sizes are known from the .wav header, so the PCM is copied across in
+blocks and memory stays flat, like the generator's own writer.
+
+Run as a script to check emitted files against MGCB's output for the same
+.wav input (field by field; exits non-zero on any mismatch):
+
+    python3 demo_xnb.py GENERATED_DIR MGCB_DIR   # e.g. ../bin/DesktopGL/Content/Sounds
+"""
+
+import struct
+import sys
+import wave
+from pathlib import Path
+
+READER = "Microsoft.Xna.Framework.Content.SoundEffectReader"
+# MGCB /platform -> the XNB platform letter
+PLATFORMS = {"Windows": "w", "WindowsDX": "w", "DesktopGL": "d", "MacOSX": "X", "Android": "a", "iOS": "i"}
+BLOCK = 8192  # frames per copy
+
+
+def _uleb(n: int) -> bytes:
+    """.NET BinaryWriter 7-bit encoded int."""
+    out = bytearray()
+    while True:
+        b, n = n & 0x7F, n >> 7
+        out.append(b | (0x80 if n else 0))
+        if not n:
+            return bytes(out)
+
+
+def _string(s: str) -> bytes:
+    b = s.encode("utf-8")
+    return _uleb(len(b)) + b
+
+
+def wave_format(channels: int, rate: int, sampwidth: int) -> bytes:
+    """WAVEFORMATEX for integer PCM, cbSize 0."""
+    align = channels * sampwidth
+    return struct.pack("<HHIIHHH", 1, channels, rate, rate * align, align, 8 * sampwidth, 0)
+
+
+def sound_effect_parts(channels: int, rate: int, sampwidth: int, frames: int,
+                       platform: str = "d", hidef: bool = True) -> tuple[bytes, bytes]:
+    """(everything before the PCM data, everything after it) of a SoundEffect
+    .xnb holding `frames` frames; the file size in the header counts the data."""
+    fmt = wave_format(channels, rate, sampwidth)
+    nbytes = frames * channels * sampwidth
+    body = (_uleb(1) + _string(READER) + struct.pack("<i", 0) + _uleb(0) + _uleb(1)
+            + struct.pack("<I", len(fmt)) + fmt + struct.pack("<I", nbytes))
+    tail = struct.pack("<iii", 0, frames, frames * 1000 // rate)
+    size = 10 + len(body) + nbytes + len(tail)
+    head = b"XNB" + platform.encode("ascii") + bytes([5, 0x01 if hidef else 0x00]) + struct.pack("<I", size)
+    return head + body, tail
+
+
+def write_sound_effect(wav_path: Path, xnb_path: Path, platform: str = "d", hidef: bool = True) -> int:
+    """Writes wav_path's PCM as a SoundEffect .xnb; returns its size in bytes."""
+    with wave.open(str(wav_path), "rb") as w, open(xnb_path, "wb") as f:
+        head, tail = sound_effect_parts(w.getnchannels(), w.getframerate(), w.getsampwidth(),
+                                        w.getnframes(), platform, hidef)
+        f.write(head)
+        while data := w.readframes(BLOCK):
+            f.write(data)
+        f.write(tail)
+        return f.tell()
+
+
+def read_sound_effect(path: Path) -> dict:
+    """The fields of a SoundEffect .xnb (uncompressed, one reader, no shared resources)."""
+    b = Path(path).read_bytes()
+    pos = 0
+
+    def uleb():
+        nonlocal pos
+        n = shift = 0
+        while True:
+            c = b[pos]
+            pos += 1
+            n |= (c & 0x7F) << shift
+            shift += 7
+            if not c & 0x80:
+                return n
+
+    def take(n):
+        nonlocal pos
+        pos += n
+        return b[pos - n:pos]
+
+    magic, platform, version, flags, size = struct.unpack("<3scBBI", take(10))
+    if magic != b"XNB" or flags & 0xC0:
+        raise ValueError(f"{path}: not an uncompressed XNB")
+    readers = []
+    for _ in range(uleb()):
+        name = take(uleb()).decode("utf-8")
+        readers.append((name, struct.unpack("<i", take(4))[0]))
+    shared, type_id = uleb(), uleb()
+    fmt = take(struct.unpack("<I", take(4))[0])
+    data = take(struct.unpack("<I", take(4))[0])
+    loop_start, loop_length, duration = struct.unpack("<iii", take(12))
+    return dict(platform=platform.decode(), version=version, flags=flags, size=size, file_size=len(b),
+                # MGCB writes the assembly-qualified name; the runtime resolves either
+                readers=[(name.split(",")[0], v) for name, v in readers], shared=shared, type_id=type_id,
+                format=fmt.hex(), data=data, loop_start=loop_start, loop_length=loop_length,
+                duration_ms=duration)
+
+
+def compare(ours: Path, theirs: Path) -> list[str]:
+    """Fields on which two SoundEffect .xnb files differ (empty if they agree)."""
+    a, b = read_sound_effect(ours), read_sound_effect(theirs)
+    diffs = []
+    for k in a:
+        if k in ("size", "file_size"):  # follow from the reader name's length
+            continue
+        if a[k] != b[k]:
+            diffs.append(k if k == "data" else f"{k}: {a[k]!r} != {b[k]!r}")
+    return diffs
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit(__doc__.rsplit("\n\n", 1)[-1])
+    ours, theirs = Path(sys.argv[1]), Path(sys.argv[2])
+    bad = 0
+    for path in sorted(ours.glob("*.xnb")):
+        ref = theirs / path.name
+        if not ref.exists():
+            print(f"{path.name}: no MGCB output to compare")
+            bad += 1
+            continue
+        diffs = compare(path, ref)
+        print(f"{path.name}: " + ("matches MGCB" if not diffs else "DIFFERS - " + "; ".join(diffs)))
+        bad += bool(diffs)
+    sys.exit(1 if bad else 0)
@@ -5,7 +5,36 @@ so re-running writes byte-identical files.
 
 Run from this directory:
 
-    python3 generate_demo_sounds.py
+    python3 generate_demo_sounds.py            # NumPy block path when available
+    python3 generate_demo_sounds.py --stdlib   # force the stdlib-only scalar path
+    python3 generate_demo_sounds.py --force    # re-render even up-to-date assets
+    python3 generate_demo_sounds.py --fast     # wavetable oscillators (<= 1 LSB off)
+    python3 generate_demo_sounds.py --xnb DIR  # + compiled SoundEffect .xnb files
+    python3 generate_demo_sounds.py --adpcm DIR  # + IMA-ADPCM copies for the web demos
+
+NumPy is optional: with it, every generator synthesizes whole blocks at once
+(same float operations in the same order, so the output stays byte-identical);
+without it, the original per-sample loops run block by block. Either way the
+writer converts and clamps each block in bulk.
+
+Tones come from demo_synth.py (oscillators, envelopes, voices), filters and
+fades from demo_dsp.py: exact mode reproduces the original arithmetic bit for
+bit; fast mode swaps in band-limited wavetables and block state-space filters
+for dense cues and long ambiences where a 1-LSB difference is fine.
+
+Generators stream: each yields fixed-size `(position, samples)` blocks that are
+written to the .wav as they arrive, and peak normalization is a second pass over
+the (deterministic) generator, so memory stays flat however long an asset is.
+
+The build is manifest-driven: every entry in ASSETS is keyed by a hash of its
+generator's source, the synth engine's source and mode, its parameters (RNG
+seed included) and SAMPLE_RATE, and
+generate_demo_sounds.manifest.json records that key plus the SHA-256 of the file
+it produced. Assets whose key and file hash still match are skipped; the stale
+ones render concurrently in a process pool, with per-asset timing reported.
+
+bench_demo_sounds.py re-renders every asset in memory on each backend, checks
+it against the committed files' golden hashes and reports synthesis speed.
 
 Outputs (22050 Hz, 16-bit PCM, mono — small files, ample quality for a demo):
 
@@ -17,89 +46,189 @@ Outputs (22050 Hz, 16-bit PCM, mono — small files, ample quality for a demo):
                  any headless-speed cut — always lands mid-play).
 
 These are consumed by ../Content.mgcb via WavImporter + SoundEffectProcessor
-(built-in importers in both the MonoGame and KNI MGCB toolchains).
+(built-in importers in both the MonoGame and KNI MGCB toolchains). --xnb DIR
+also writes each one as the compiled SoundEffect .xnb that pipeline produces
+(demo_xnb.py, for ../Content.mgcb's /platform and /profile), ready to ship
+without the import step; `python3 demo_xnb.py DIR MGCB_OUTPUT_DIR` checks them
+against MGCB's own output. That comparison has not been run yet (it needs the
+dotnet-mgcb tool restored from NuGet); until it passes, keep building the .wav
+files through Content.mgcb. Platforms without an XNB letter in demo_xnb.py
+stop --xnb with an error. --adpcm DIR writes IMA-ADPCM copies of the .wav
+files (demo_adpcm.py; ~4x smaller, for the web demos' downloads) and reports
+each one's compression ratio and SNR against the PCM master.
 """
 
-import math
+import argparse
+import hashlib
+import inspect
+import json
 import random
-import struct
+import sys
+import time
 import wave
+from array import array
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
+import demo_dsp as dsp
+import demo_synth as synth
+import demo_adpcm as adpcm
+import demo_xnb as xnb
+
+try:
+    import numpy as np
+except ImportError:  # stdlib-only fallback: the scalar generators below
+    np = None
+NUMPY = np  # what configure() restores
+
 SAMPLE_RATE = 22050
+BLOCK = 8192  # samples per synthesis block: bounds memory regardless of asset length
 OUT_DIR = Path(__file__).resolve().parent
+MANIFEST = OUT_DIR / "generate_demo_sounds.manifest.json"
+MGCB = OUT_DIR.parent / "Content.mgcb"
+
+# Timbres as ((harmonic, amplitude), ...)
+SINE = ((1, 1.0),)
+PING = ((1, 1.0), (2, 0.4))                     # a tone plus a quieter octave
+SOFT_SQUARE = ((1, 1.0), (3, 0.33), (5, 0.2))   # fundamental + odd harmonics
+
+
+def configure(stdlib: bool = False, fast: bool = False) -> None:
+    """Applies the CLI's engine switches (pool workers start fresh, so they call
+    this too)."""
+    global np
+    np = synth.np = dsp.np = None if stdlib else NUMPY
+    synth.EXACT = dsp.EXACT = not fast
 
 
-def write_wav(name: str, samples: list[float]) -> None:
-    """Writes mono 16-bit PCM, clamping to [-1, 1]."""
+def pcm16(samples) -> bytes:
+    """Mono float samples -> little-endian 16-bit PCM bytes, clamped to [-1, 1].
+    int() truncates toward zero, exactly like NumPy's float -> int16 cast."""
+    if np is not None:
+        return (np.clip(np.asarray(samples, dtype=np.float64), -1.0, 1.0) * 32767).astype("<i2").tobytes()
+    frames = array("h", [int(max(-1.0, min(1.0, s)) * 32767) for s in samples])
+    if sys.byteorder == "big":
+        frames.byteswap()
+    return frames.tobytes()
+
+
+def encode_wav(f, stream) -> int:
+    """Encodes mono 16-bit PCM, clamping to [-1, 1], from `(position, samples)`
+    blocks into the seekable binary file `f`; returns the frame count. Blocks
+    normally arrive in order; one that lands before the write head (a held-back
+    head block) is written in place over its placeholder."""
+    w = wave.open(f, "wb")
+    w.setnchannels(1)
+    w.setsampwidth(2)
+    w.setframerate(SAMPLE_RATE)
+    w.writeframesraw(b"")  # emits the header, so the data chunk starts here
+    data_start, frames = f.tell(), 0
+    for pos, samples in stream:
+        if pos < frames:
+            assert pos + len(samples) <= frames, "a held-back block must fit its placeholder"
+            f.seek(data_start + 2 * pos)
+            f.write(pcm16(samples))
+            f.seek(0, 2)
+            continue
+        if pos > frames:
+            w.writeframesraw(bytes(2 * (pos - frames)))  # placeholder, filled in later
+        w.writeframesraw(pcm16(samples))
+        frames = pos + len(samples)
+    w.close()  # patches the RIFF/data sizes
+    return frames
+
+
+def write_wav(name: str, stream) -> None:
+    """Writes a `(position, samples)` stream to OUT_DIR/name (see encode_wav)."""
     path = OUT_DIR / name
-    frames = bytearray()
-    for s in samples:
-        s = max(-1.0, min(1.0, s))
-        frames += struct.pack("<h", int(s * 32767))
-    with wave.open(str(path), "wb") as w:
-        w.setnchannels(1)
-        w.setsampwidth(2)
-        w.setframerate(SAMPLE_RATE)
-        w.writeframes(bytes(frames))
-    print(f"wrote {path.name}: {len(samples) / SAMPLE_RATE:.2f}s, {path.stat().st_size} bytes")
+    with open(path, "w+b") as f:
+        frames = encode_wav(f, stream)
+    print(f"wrote {path.name}: {frames / SAMPLE_RATE:.2f}s, {path.stat().st_size} bytes")
+
 
+def normalized(make, level: float, **params):
+    """Peak-normalizes a generator to `level` in two passes: the first only
+    measures the peak, the second re-runs the (deterministic) generator scaled."""
+    peak = 0.0
+    for _, samples in make(**params):
+        if len(samples):
+            peak = max(peak, float(np.abs(samples).max()) if np is not None else max(map(abs, samples)))
+    for pos, samples in make(**params):
+        if np is not None:
+            yield pos, level * samples / peak
+        else:
+            yield pos, array("d", [level * s / peak for s in samples])
 
-def note_freq(semitones_from_a4: int) -> float:
-    return 440.0 * (2.0 ** (semitones_from_a4 / 12.0))
 
+def spans(b0: int, n: int):
+    """[start, end) block spans covering samples b0..n."""
+    for s in range(b0, n, BLOCK):
+        yield s, min(n, s + BLOCK)
 
-def make_click() -> list[float]:
+
+def uniform_block(rng: random.Random, count: int, a: float, b: float):
+    """`count` draws of rng.uniform(a, b) as one array, bit-identical to the scalar
+    calls: getrandbits hands out the same 32-bit Mersenne words random() consumes
+    (two per draw, low word first), combined with random()'s own 53-bit formula."""
+    words = np.frombuffer(rng.getrandbits(64 * count).to_bytes(8 * count, "little"), dtype="<u4")
+    hi = (words[0::2] >> 5).astype(np.float64)
+    lo = (words[1::2] >> 6).astype(np.float64)
+    return a + (b - a) * ((hi * 67108864.0 + lo) * (1.0 / 9007199254740992.0))
+
+
+def make_click():
     """0.15s ping: 880 Hz + a quieter 1760 Hz partial, fast exponential decay.
     A 2 ms linear attack avoids a start pop."""
     duration = 0.15
     n = int(SAMPLE_RATE * duration)
-    attack = int(SAMPLE_RATE * 0.002)
-    out = []
-    for i in range(n):
-        t = i / SAMPLE_RATE
-        env = math.exp(-t * 40.0) * (min(i, attack) / attack if attack else 1.0)
-        s = math.sin(2 * math.pi * 880.0 * t) + 0.4 * math.sin(2 * math.pi * 1760.0 * t)
-        out.append(0.6 * env * s)
-    return out
+    ping = synth.Voice(PING, int(SAMPLE_RATE * 0.002), 40.0, 0.6, SAMPLE_RATE)
+    for b0, b1 in spans(0, n):
+        yield b0, ping.render(880.0, b0, b1)
 
 
-def make_wind() -> list[float]:
+def make_wind(duration: float = 4.0, seed: int = 42):
     """4s loopable wind: white noise -> one-pole low-pass, gust-modulated by an LFO
     with whole cycles over the loop (envelope is loop-continuous), then the noise
-    itself is made seamless by crossfading an extra generated tail onto the head."""
-    duration = 4.0
+    itself is made seamless by crossfading an extra generated tail onto the head.
+
+    Streams: only the head block is held back until the tail that fades into it
+    has been generated; it is then yielded last, at position 0.
+    (Un-normalized — see `normalized`.)"""
     fade = 0.25  # crossfade seconds (loop seam)
     n = int(SAMPLE_RATE * duration)
     fade_n = int(SAMPLE_RATE * fade)
-    rng = random.Random(42)
-
-    # Generate n + fade_n filtered samples; the extra tail is folded onto the head.
-    raw = []
-    lp = 0.0
-    alpha = 0.08  # one-pole low-pass coefficient (~300 Hz): rumble, not hiss
-    for _ in range(n + fade_n):
-        lp += alpha * (rng.uniform(-1.0, 1.0) - lp)
-        raw.append(lp)
-
-    out = []
-    gust_hz = 0.5  # 2 whole cycles over the 4s loop -> envelope continuous at the seam
-    for i in range(n):
-        s = raw[i]
-        if i < fade_n:  # crossfade: the tail flows into the head, so end -> start is seamless
-            w = i / fade_n
-            s = s * w + raw[n + i] * (1.0 - w)
-        t = i / SAMPLE_RATE
-        env = 0.6 + 0.4 * math.sin(2 * math.pi * gust_hz * t)
-        out.append(2.2 * env * s)  # filtered noise is quiet; scale toward full range
-    peak = max(abs(s) for s in out)
-    return [0.8 * s / peak for s in out]
-
-
-def make_jukebox() -> list[float]:
+    rng = random.Random(seed)
+    gust_hz = 0.5  # whole cycles over the loop -> envelope continuous at the seam
+    lfo = synth.Oscillator(SINE, SAMPLE_RATE)
+    lowpass = dsp.OnePole(0.08)  # one-pole low-pass (~300 Hz): rumble, not hiss
+
+    def filtered(count: int):
+        if np is None:
+            return lowpass.process([rng.uniform(-1.0, 1.0) for _ in range(count)])
+        return lowpass.process(uniform_block(rng, count, -1.0, 1.0))
+
+    def shaped(b0: int, raw):
+        # filtered noise is quiet; scale toward full range under the gust envelope
+        gust = lfo.render(gust_hz, b0, b0 + len(raw))
+        if np is None:
+            return array("d", [2.2 * (0.6 + 0.4 * g) * s for g, s in zip(gust, raw)])
+        return 2.2 * (0.6 + 0.4 * gust) * raw
+
+    head = filtered(fade_n)  # held back: the tail that fades into it comes last
+    for b0, b1 in spans(fade_n, n):
+        yield b0, shaped(b0, filtered(b1 - b0))
+    # crossfade: the tail flows into the head, so end -> start is seamless
+    yield 0, shaped(0, dsp.Crossfade(fade_n).process(filtered(fade_n), head))
+
+
+def make_jukebox(repeats: int = 1):
     """~10s chiptune-ish riff: Am F C G Am, arpeggiated in eighth notes at 120 BPM
     (0.25s per note) over a half-note bass root. Soft-square voices (odd harmonics),
-    per-note decay envelopes, normalized with headroom, 10 ms final fade-out."""
+    per-note decay envelopes, 10 ms final fade-out. (Un-normalized — see `normalized`.)
+
+    Sequenced: the riff is a cue of note events, so each distinct note (the Am
+    chord's, the repeating pattern's) is synthesized once and then mixed.
+    `repeats` plays the riff back to back that many times (stress renders)."""
     # Chords as semitone offsets from A4: (bass root, arpeggio triad)
     chords = [
         (-24, (-12, -9, -5)),   # Am: A3 C4 E4, bass A2
@@ -111,45 +240,129 @@ def make_jukebox() -> list[float]:
     note_len = 0.25            # eighth note at 120 BPM
     notes_per_chord = 8        # 2s per chord -> 10s total
     pattern = (0, 1, 2, 1, 0, 1, 2, 1)
-    n = int(SAMPLE_RATE * note_len * notes_per_chord * len(chords))
-    out = [0.0] * n
-
-    def voice(freq: float, t: float) -> float:
-        # Soft square: fundamental + odd harmonics.
-        return (math.sin(2 * math.pi * freq * t)
-                + 0.33 * math.sin(2 * math.pi * 3 * freq * t)
-                + 0.2 * math.sin(2 * math.pi * 5 * freq * t))
-
+    chords = chords * repeats
+    length = note_len * notes_per_chord * len(chords)
     attack_n = int(SAMPLE_RATE * 0.005)
+    bass_voice = synth.Voice(SOFT_SQUARE, attack_n, 1.2, 0.5, SAMPLE_RATE)
+    arp_voice = synth.Voice(SOFT_SQUARE, attack_n, 4.0, 0.35, SAMPLE_RATE)
+
+    cue = []  # (time, voice, pitch, duration, gain), in the order they are mixed
     for c, (bass, triad) in enumerate(chords):
-        chord_start = int(c * notes_per_chord * note_len * SAMPLE_RATE)
+        chord_time = c * notes_per_chord * note_len
         # Bass: two half notes per chord.
-        bass_freq = note_freq(bass)
-        bass_len = int(SAMPLE_RATE * note_len * notes_per_chord / 2)
+        half = note_len * notes_per_chord / 2
         for h in range(2):
-            start = chord_start + h * bass_len
-            for i in range(bass_len):
-                t = i / SAMPLE_RATE
-                env = math.exp(-t * 1.2) * (min(i, attack_n) / attack_n if attack_n else 1.0)
-                out[start + i] += 0.5 * env * voice(bass_freq, t)
+            cue.append((chord_time + h * half, bass_voice, bass, half, 0.5))
         # Arpeggio: eighth notes following the pattern.
         for k in range(notes_per_chord):
-            freq = note_freq(triad[pattern[k]])
-            start = chord_start + int(k * note_len * SAMPLE_RATE)
-            count = int(note_len * SAMPLE_RATE)
-            for i in range(min(count, n - start)):
-                t = i / SAMPLE_RATE
-                env = math.exp(-t * 4.0) * (min(i, attack_n) / attack_n if attack_n else 1.0)
-                out[start + i] += 0.35 * env * voice(freq, t)
+            cue.append((chord_time + k * note_len, arp_voice, triad[pattern[k]], note_len, 0.35))
+    seq = synth.Sequencer(cue, length, SAMPLE_RATE, fade=0.01)  # end fade avoids a cutoff pop
+    for b0, b1 in spans(0, seq.n):
+        yield b0, seq.mix(b0, b1)
+
+
+# name -> (generator, its parameters, normalization peak or None)
+ASSETS = {
+    "click.wav": (make_click, {}, None),
+    "wind.wav": (make_wind, {"duration": 4.0, "seed": 42}, 0.8),
+    "jukebox.wav": (make_jukebox, {}, 0.8),
+}
 
-    fade_n = int(SAMPLE_RATE * 0.01)  # end fade avoids a cutoff pop
-    for i in range(fade_n):
-        out[n - 1 - i] *= i / fade_n
-    peak = max(abs(s) for s in out)
-    return [0.8 * s / peak for s in out]
+
+def asset_key(name: str) -> str:
+    """Hash of everything that determines an asset's bytes: its generator and
+    parameters, the engine modules, and the block, normalization and PCM/WAV
+    encoding helpers every asset goes through."""
+    make, params, level = ASSETS[name]
+    helpers = "".join(inspect.getsource(f) for f in (spans, uniform_block, normalized, stream, pcm16, encode_wav))
+    blob = json.dumps(dict(source=inspect.getsource(make), helpers=helpers,
+                           engine=inspect.getsource(synth) + inspect.getsource(dsp),
+                           exact=synth.EXACT, params=params, level=level,
+                           sample_rate=SAMPLE_RATE), sort_keys=True)
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+def file_sha256(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def stream(name: str, **overrides):
+    """The `(position, samples)` stream of an asset, normalized if it asks to be;
+    `overrides` replace entries of its parameters (e.g. a longer duration)."""
+    make, params, level = ASSETS[name]
+    params = {**params, **overrides}
+    return make(**params) if level is None else normalized(make, level, **params)
+
+
+def mgcb_target() -> tuple[str, bool]:
+    """(XNB platform letter, HiDef?) from Content.mgcb's global properties."""
+    text = MGCB.read_text() if MGCB.exists() else ""
+    props = dict(line[1:].split(":", 1) for line in text.splitlines()
+                 if line.startswith("/") and ":" in line)
+    platform = props.get("platform", "DesktopGL")
+    if platform not in xnb.PLATFORMS:
+        raise SystemExit(f"--xnb: {MGCB.name} targets /platform:{platform}, which demo_xnb.py has no "
+                         f"XNB platform letter for (supported: {', '.join(xnb.PLATFORMS)})")
+    return xnb.PLATFORMS[platform], props.get("profile", "HiDef") == "HiDef"
+
+
+def render(name: str, stdlib: bool = False, fast: bool = False) -> tuple[str, str, float]:
+    """Renders one asset (in a pool worker); returns (name, file hash, seconds)."""
+    configure(stdlib, fast)
+    t0 = time.perf_counter()
+    write_wav(name, stream(name))
+    return name, file_sha256(OUT_DIR / name), time.perf_counter() - t0
 
 
 if __name__ == "__main__":
-    write_wav("click.wav", make_click())
-    write_wav("wind.wav", make_wind())
-    write_wav("jukebox.wav", make_jukebox())
+    ap = argparse.ArgumentParser(description="Regenerate the audio demo's .wav assets.")
+    ap.add_argument("--stdlib", action="store_true",
+                    help="ignore NumPy and run the scalar stdlib-only generators")
+    ap.add_argument("--fast", action="store_true",
+                    help="wavetable oscillators instead of exact sin() (may differ by 1 LSB)")
+    ap.add_argument("--force", action="store_true", help="re-render assets the manifest says are current")
+    ap.add_argument("--jobs", type=int, default=None, help="worker processes (default: one per CPU)")
+    ap.add_argument("--xnb", metavar="DIR", type=Path,
+                    help="also write compiled SoundEffect .xnb files (Content.mgcb's platform) to DIR")
+    ap.add_argument("--adpcm", metavar="DIR", type=Path,
+                    help="also write IMA-ADPCM .wav copies to DIR (not this directory: the masters live here)")
+    args = ap.parse_args()
+    configure(args.stdlib, args.fast)
+    if args.adpcm and args.adpcm.resolve() == OUT_DIR:
+        ap.error("--adpcm DIR would overwrite the PCM masters")
+
+    manifest = json.loads(MANIFEST.read_text()) if MANIFEST.exists() else {}
+    stale = {}
+    for name in ASSETS:
+        key, entry, path = asset_key(name), manifest.get(name, {}), OUT_DIR / name
+        if (not args.force and entry.get("key") == key and path.exists()
+                and file_sha256(path) == entry.get("sha256")):
+            print(f"{name}: up to date")
+            continue
+        stale[name] = key
+    if stale:
+        t0 = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+            for done in as_completed([pool.submit(render, name, args.stdlib, args.fast) for name in stale]):
+                name, digest, seconds = done.result()
+                manifest[name] = dict(key=stale[name], sha256=digest)
+                print(f"{name}: rendered in {seconds:.2f}s")
+        MANIFEST.write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n")
+        print(f"{len(stale)} of {len(ASSETS)} assets rendered in {time.perf_counter() - t0:.2f}s")
+    if args.xnb:
+        platform, hidef = mgcb_target()
+        args.xnb.mkdir(parents=True, exist_ok=True)
+        for name in ASSETS:
+            wav, out = OUT_DIR / name, args.xnb / Path(name).with_suffix(".xnb").name
+            if name not in stale and out.exists() and out.stat().st_mtime_ns >= wav.stat().st_mtime_ns:
+                continue
+            print(f"wrote {out.name}: {xnb.write_sound_effect(wav, out, platform, hidef)} bytes")
+    if args.adpcm:
+        args.adpcm.mkdir(parents=True, exist_ok=True)
+        for name in ASSETS:
+            wav, out = OUT_DIR / name, args.adpcm / name
+            if name not in stale and out.exists() and out.stat().st_mtime_ns >= wav.stat().st_mtime_ns:
+                continue
+            r = adpcm.write_ima_wav(wav, out)
+            print(f"wrote {out.name} (IMA-ADPCM): {r['bytes']} bytes, "
+                  f"{r['ratio']:.2f}x smaller, SNR {r['snr_db']:.1f} dB")